@@ -3,9 +3,6 @@ import os
 
 # Add the parent directory to sys.path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from tools.web_search import WebSearchTool
-from tools.web_scraper import WebScraperTool
-from tools.content_analyzer import ContentAnalyzerTool
 from tools.information_synthesis import InformationSynthesisTool
 
 class WebResearchAgent:
@@ -16,10 +13,10 @@ class WebResearchAgent:
     
     def __init__(self):
         """Initialize the Web Research Agent with all required tools."""
-        self.search_tool = WebSearchTool()
-        self.scraper_tool = WebScraperTool()
-        self.analyzer_tool = ContentAnalyzerTool()
         self.synthesis_tool = InformationSynthesisTool()
+        self.search_tool = self.synthesis_tool.search_tool
+        self.scraper_tool = self.synthesis_tool.scraper_tool
+        self.analyzer_tool = self.synthesis_tool.analyzer_tool
     
     def process_query(self, query: str) -> dict:
         """
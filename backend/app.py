@@ -1,6 +1,6 @@
 import os
 import sys
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 import json
 
@@ -8,21 +8,130 @@ import json
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from config import Config
 from tools.information_synthesis import InformationSynthesisTool
+from tools.metrics import metrics
+from jobs import ResearchJobManager, JobQueueFullError
+from profiling import RequestProfiler, profiling_requested, load_profile_summary
+from compression import compress_response
 
 app = Flask(__name__)
 CORS(app, resources={r"/api/*": {"origins": "*"}})  # Enable CORS for all routes
 
-# Initialize the research agent
-synthesis_tool = InformationSynthesisTool()
+# Initialize the research agent. Analysis pool workers started by `python app.py`
+# re-import this script as __mp_main__; they only need tools.content_analyzer,
+# so the tools, caches and job store are not set up again there
+if __name__ != '__mp_main__':
+    synthesis_tool = InformationSynthesisTool()
+    job_manager = ResearchJobManager(synthesis_tool)
+
+# Report fields a client can select with the `fields` parameter
+REPORT_FIELDS = (
+    'query', 'summary', 'topics', 'conclusions', 'sources', 'search_results',
+    'stopped_early', 'partial', 'skipped_sources', 'duplicate_sources', 'fetches_saved',
+    'mock_results', 'transient_failures', 'elapsed'
+)
+
+@app.after_request
+def compress(response):
+    """Compress large JSON responses with gzip or brotli when the client accepts it"""
+    return compress_response(response, request.accept_encodings)
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
+    page_cache = synthesis_tool.scraper_tool.page_cache
+    search_cache = synthesis_tool.search_tool.cache
+    report_cache = synthesis_tool.report_cache
+    host_health = synthesis_tool.scraper_tool.host_health
+    
     return jsonify({
         'status': 'ok',
-        'message': 'Web Research Agent API is running'
+        'message': 'Web Research Agent API is running',
+        'caches': {
+            'pages': page_cache.stats() if page_cache else None,
+            'searches': search_cache.stats() if search_cache else None,
+            'reports': report_cache.stats() if report_cache else None
+        },
+        'hosts': host_health.stats() if host_health else None
     })
 
+def parse_fields(data: dict):
+    """
+    Read the optional report field selection from the request
+    
+    Accepts a comma-separated string or a list, e.g. `fields=summary,sources`.
+    Returns a (fields, error) tuple; fields is None when the full report is wanted.
+    """
+    value = request.args.get('fields', data.get('fields'))
+    
+    if value is None:
+        return None, None
+    
+    fields = value.split(',') if isinstance(value, str) else value
+    if not isinstance(fields, list) or not all(isinstance(field, str) for field in fields):
+        return None, 'Fields must be a comma-separated string or a list of strings'
+    
+    fields = [field.strip() for field in fields if field.strip()]
+    unknown = [field for field in fields if field not in REPORT_FIELDS]
+    if unknown:
+        return None, f"Unknown fields: {', '.join(unknown)} (available: {', '.join(REPORT_FIELDS)})"
+    
+    return fields, None
+
+def project_report(result: dict, fields, hold: bool = True) -> dict:
+    """
+    Keep only the selected fields of the report in a research result
+    
+    Dropped fields are listed in `omitted_fields`. With `hold`, the full result
+    is also kept for Config.REPORT_HOLD_TTL seconds and its `report_id` added,
+    so the client can fetch the other fields from /api/research/reports/<report_id>
+    instead of running the research again. This needs the report cache; without
+    it only `omitted_fields` is returned.
+    """
+    if fields is None or not result.get('report'):
+        return result
+    
+    report = result['report']
+    projected = {**result, 'report': {field: report[field] for field in fields if field in report}}
+    
+    omitted = [field for field in REPORT_FIELDS if field in report and field not in fields]
+    if omitted:
+        projected['omitted_fields'] = omitted
+        if hold and synthesis_tool.report_cache:
+            projected['report_id'] = synthesis_tool.report_cache.hold(result)
+    
+    return projected
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus metrics aggregated across all worker processes"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# Marks a parse_deadline() default that was not given (None means no limit)
+_UNSET = object()
+
+def parse_deadline(data: dict, default=_UNSET, maximum=None):
+    """
+    Read the optional research time budget from the request
+    
+    Returns a (deadline, error) tuple; the deadline defaults to `default`
+    (Config.RESEARCH_DEADLINE if not given; None means no limit) and is
+    capped at `maximum` (Config.RESEARCH_MAX_DEADLINE if not given).
+    """
+    value = request.args.get('deadline', data.get('deadline'))
+    
+    if value is None:
+        return (Config.RESEARCH_DEADLINE if default is _UNSET else default), None
+    
+    try:
+        deadline = float(value)
+    except (TypeError, ValueError):
+        return None, 'Deadline must be a number of seconds'
+    
+    if deadline <= 0:
+        return None, 'Deadline must be positive'
+    
+    return min(deadline, maximum or Config.RESEARCH_MAX_DEADLINE), None
+
 @app.route('/api/research', methods=['POST'])
 def research():
     """
@@ -30,8 +139,16 @@ def research():
     
     Request body:
     {
-        "query": "Research query string"
+        "query": "Research query string",
+        "deadline": 20,  # Optional time budget in seconds
+        "fields": ["summary", "sources"]  # Optional subset of the report fields
     }
+    
+    The `deadline` and `fields` parameters may also be given in the URL.
+    When `fields` drops part of the report, the response lists the
+    `omitted_fields` and a `report_id` to fetch them (see project_report).
+    Sending Config.PROFILING_SECRET in the X-Profile header or the `profile`
+    URL parameter adds a `profile` summary of the call to the response.
     """
     data = request.json
     
@@ -49,11 +166,27 @@ def research():
             'error': 'Query cannot be empty'
         }), 400
     
+    deadline, error = parse_deadline(data)
+    if not error:
+        fields, error = parse_fields(data)
+    if error:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 400
+    
     try:
-        # Generate research report
-        result = synthesis_tool.generate_research_report(query)
+        if profiling_requested(request.headers.get('X-Profile'), request.args.get('profile')):
+            # Profile this single call and attach the hottest functions to the response
+            with RequestProfiler() as profiler:
+                result = synthesis_tool.generate_research_report(query, deadline)
+            
+            result['profile'] = profiler.summary()
+        else:
+            # Generate research report
+            result = synthesis_tool.generate_research_report(query, deadline)
         
-        return jsonify(result)
+        return jsonify(project_report(result, fields))
     
     except Exception as e:
         return jsonify({
@@ -61,6 +194,279 @@ def research():
             'error': str(e)
         }), 500
 
+@app.route('/api/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """Endpoint to fetch a stored profile summary (requires the profiling secret)"""
+    if not profiling_requested(request.headers.get('X-Profile'), request.args.get('profile')):
+        return jsonify({
+            'success': False,
+            'error': 'Not found'
+        }), 404
+    
+    summary = load_profile_summary(profile_id)
+    
+    if summary is None:
+        return jsonify({
+            'success': False,
+            'error': 'Unknown profile'
+        }), 404
+    
+    summary['success'] = True
+    return jsonify(summary)
+
+@app.route('/api/research/reports/<report_id>', methods=['GET'])
+def get_held_report(report_id):
+    """Endpoint to fetch the full result behind a response whose `fields` projection dropped fields"""
+    fields, error = parse_fields({})
+    if error:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 400
+    
+    report_cache = synthesis_tool.report_cache
+    result = report_cache.held(report_id) if report_cache else None
+    
+    if result is None:
+        return jsonify({
+            'success': False,
+            'error': 'Unknown or expired report'
+        }), 404
+    
+    return jsonify(project_report(result, fields, hold=False))
+
+@app.route('/api/research/cache', methods=['DELETE'])
+def purge_report_cache():
+    """
+    Endpoint to purge cached research reports
+    
+    Deletes the report for the `query` URL parameter (or JSON body field),
+    or every cached report if no query is given.
+    """
+    report_cache = synthesis_tool.report_cache
+    
+    if report_cache is None:
+        return jsonify({
+            'success': False,
+            'error': 'Report cache is disabled'
+        }), 404
+    
+    data = request.get_json(silent=True) or {}
+    query = request.args.get('query', data.get('query'))
+    
+    return jsonify({
+        'success': True,
+        'purged': report_cache.purge(query)
+    })
+
+@app.route('/api/research/jobs', methods=['POST'])
+def create_research_job():
+    """
+    Endpoint to start research in the background
+    
+    Request body:
+    {
+        "query": "Research query string",
+        "deadline": 20  # Optional time budget in seconds
+    }
+    
+    Returns the job id immediately; poll /api/research/<job_id> for progress.
+    """
+    data = request.json
+    
+    if not data or 'query' not in data:
+        return jsonify({
+            'success': False,
+            'error': 'Missing query parameter'
+        }), 400
+    
+    query = data['query']
+    
+    if not query or len(query.strip()) == 0:
+        return jsonify({
+            'success': False,
+            'error': 'Query cannot be empty'
+        }), 400
+    
+    deadline, error = parse_deadline(data)
+    if error:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 400
+    
+    try:
+        job_id = job_manager.submit(query, deadline)
+    
+    except JobQueueFullError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 503
+    
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': f'/api/research/{job_id}'
+    }), 202
+
+@app.route('/api/research/<job_id>', methods=['GET'])
+def get_research_job(job_id):
+    """Endpoint to get the status, partial results and report of a research job"""
+    fields, error = parse_fields({})
+    if error:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 400
+    
+    job = job_manager.get(job_id)
+    
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Unknown or expired job'
+        }), 404
+    
+    if job['result']:
+        # The job keeps the full result, so there is nothing to hold
+        job['result'] = project_report(job['result'], fields, hold=False)
+    
+    job['success'] = True
+    return jsonify(job)
+
+@app.route('/api/research/stream', methods=['GET', 'POST'])
+def research_stream():
+    """
+    Endpoint to perform research and stream progress as Server-Sent Events
+    
+    The query and optional deadline are read from the URL parameters (for
+    EventSource clients) or from the JSON request body. Emits `search`, `source` and
+    `report` events, or an `error` event if the research fails.
+    """
+    data = request.get_json(silent=True) or {}
+    query = request.args.get('query', data.get('query'))
+    
+    if query is None:
+        return jsonify({
+            'success': False,
+            'error': 'Missing query parameter'
+        }), 400
+    
+    if len(query.strip()) == 0:
+        return jsonify({
+            'success': False,
+            'error': 'Query cannot be empty'
+        }), 400
+    
+    deadline, error = parse_deadline(data)
+    if error:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 400
+    
+    def generate():
+        try:
+            for event, payload in synthesis_tool.iter_research_events(query, deadline):
+                yield format_sse(event, payload)
+        except Exception as e:
+            yield format_sse('error', {
+                'success': False,
+                'error': str(e)
+            })
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # Disable proxy buffering so events arrive immediately
+        }
+    )
+
+@app.route('/api/research/batch', methods=['POST'])
+def research_batch():
+    """
+    Endpoint to research many queries at once and stream the reports as Server-Sent Events
+    
+    Request body:
+    {
+        "queries": ["First query", "Second query"],
+        "deadline": 60,  # Optional time budget for the whole batch in seconds
+        "fields": ["summary", "sources"]  # Optional subset of the report fields
+    }
+    
+    The searches run concurrently and a page found by several queries is
+    fetched once. Emits one `report` event per query as soon as its report
+    is ready (`index`, `query` and `result`, in completion order), then a
+    `done` event, or an `error` event if the batch fails.
+    """
+    data = request.get_json(silent=True) or {}
+    queries = data.get('queries')
+    
+    if not isinstance(queries, list) or not queries:
+        return jsonify({
+            'success': False,
+            'error': 'Missing queries parameter'
+        }), 400
+    
+    if len(queries) > Config.BATCH_MAX_QUERIES:
+        return jsonify({
+            'success': False,
+            'error': f'At most {Config.BATCH_MAX_QUERIES} queries are allowed per batch'
+        }), 400
+    
+    if any(not isinstance(query, str) or len(query.strip()) == 0 for query in queries):
+        return jsonify({
+            'success': False,
+            'error': 'Queries cannot be empty'
+        }), 400
+    
+    deadline, error = parse_deadline(data, Config.BATCH_RESEARCH_DEADLINE, Config.BATCH_MAX_DEADLINE)
+    if not error:
+        fields, error = parse_fields(data)
+    if error:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 400
+    
+    def generate():
+        completed = 0
+        try:
+            for index, result in synthesis_tool.iter_batch_reports(queries, deadline):
+                completed += 1
+                yield format_sse('report', {
+                    'index': index,
+                    'query': queries[index],
+                    'result': project_report(result, fields)
+                })
+            
+            yield format_sse('done', {
+                'success': True,
+                'completed': completed
+            })
+        except Exception as e:
+            yield format_sse('error', {
+                'success': False,
+                'error': str(e)
+            })
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # Disable proxy buffering so events arrive immediately
+        }
+    )
+
+def format_sse(event: str, payload: dict) -> str:
+    """Format a single Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
 @app.route('/api/search', methods=['POST'])
 def search():
     """
@@ -90,15 +496,12 @@ def search():
         }), 400
     
     try:
-        from tools.web_search import WebSearchTool
-        search_tool = WebSearchTool()
-        
-        # Perform search
-        results = search_tool.search(query, num_results=num_results)
+        # Perform search with the shared search tool
+        results = synthesis_tool.search_tool.search(query, num_results=num_results)
         
         return jsonify({
             'success': True,
-            'results': results
+            'results': [result.to_dict() for result in results]
         })
     
     except Exception as e:
@@ -108,4 +511,5 @@ def search():
         }), 500
 
 if __name__ == '__main__':
+    metrics.clear()
     app.run(host=Config.API_HOST, port=Config.API_PORT, debug=True)
@@ -0,0 +1,134 @@
+"""
+Micro-benchmark for ContentAnalyzerTool.analyze_content.
+
+Times per-document analysis as the document length and the number of
+query terms grow. The previous implementation, which re-scanned the text
+in every helper, is included as a reference.
+
+Usage (from the backend directory):
+    python benchmarks/analyze_benchmark.py [--repeat 5] [--words 1000 10000 100000] [--terms 1 4 16]
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import os
+import time
+
+# Add the backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.content_analyzer import ContentAnalyzerTool, _POSITIVE_WORDS, _NEGATIVE_WORDS
+from tools.records import ScrapedPage, PageContent
+
+VOCABULARY = (
+    'climate energy policy research market growth risk data model system '
+    'science report water carbon solar battery network health economy city '
+    'good bad problem success improve concern better worst analysis impact'
+).split()
+
+def build_document(words: int, seed: int = 0) -> str:
+    """
+    Build a pseudo-random document of roughly the given number of words.
+    
+    Args:
+        words: Number of words in the document
+        seed: Random seed, for repeatable documents
+        
+    Returns:
+        The document text
+    """
+    rng = random.Random(seed)
+    sentences = []
+    remaining = words
+    while remaining > 0:
+        length = min(remaining, rng.randint(8, 25))
+        sentence = ' '.join(rng.choice(VOCABULARY) for _ in range(length))
+        sentences.append(sentence.capitalize() + '.')
+        remaining -= length
+    return ' '.join(sentences)
+
+def legacy_analyze(text: str, query: str) -> None:
+    """
+    Reference implementation of the previous per-helper text scans.
+    
+    Args:
+        text: The document text
+        query: The query
+    """
+    query_terms = query.lower().split()
+    text_lower = text.lower()
+    for term in query_terms:
+        len(re.findall(r'\b' + re.escape(term) + r'\b', text_lower))
+    
+    sentences = re.split(r'(?<=[.!?])\s+', text)
+    for sentence in sentences:
+        sentence_lower = sentence.lower()
+        sum(1 for term in query_terms if term in sentence_lower)
+    
+    text_lower = text.lower()
+    sum(text_lower.count(' ' + word + ' ') for word in _POSITIVE_WORDS)
+    sum(text_lower.count(' ' + word + ' ') for word in _NEGATIVE_WORDS)
+
+def time_call(func, repeat: int) -> float:
+    """
+    Return the best wall-clock time of `repeat` calls, in milliseconds.
+    
+    Args:
+        func: Zero-argument callable to time
+        repeat: Number of timed calls
+        
+    Returns:
+        Best time in milliseconds
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-document content analysis time')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per measurement')
+    parser.add_argument('--words', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='Document lengths, in words')
+    parser.add_argument('--terms', type=int, nargs='+', default=[1, 4, 16],
+                        help='Query lengths, in terms')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+    
+    analyzer = ContentAnalyzerTool()
+    results = []
+    
+    for words in args.words:
+        text = build_document(words)
+        content = ScrapedPage(
+            'https://bench.example/doc',
+            content=PageContent.build([text], text),
+            metadata={'url': 'https://bench.example/doc', 'site_name': 'bench.example'}
+        )
+        
+        for terms in args.terms:
+            query = ' '.join(VOCABULARY[i % len(VOCABULARY)] for i in range(terms))
+            current = time_call(lambda: analyzer.analyze_content(content, query), args.repeat)
+            legacy = time_call(lambda: legacy_analyze(text, query), args.repeat)
+            results.append({
+                'words': words,
+                'query_terms': terms,
+                'analyze_ms': round(current, 2),
+                'legacy_ms': round(legacy, 2)
+            })
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"{'words':>8} {'terms':>6} {'analyze ms':>11} {'legacy ms':>10} {'speedup':>8}")
+    for row in results:
+        speedup = row['legacy_ms'] / row['analyze_ms'] if row['analyze_ms'] else 0
+        print(f"{row['words']:>8} {row['query_terms']:>6} {row['analyze_ms']:>11} "
+              f"{row['legacy_ms']:>10} {speedup:>7.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Micro-benchmark for WebScraperTool HTML parsing and extraction.
+
+Times parse + extract per page for synthetic pages of growing size, for
+every installed BeautifulSoup parser backend, and reports how much of that
+is parsing versus extraction. The previous multi-pass
+extraction is included as a reference so the single-pass walk can be
+compared against it.
+
+Usage (from the backend directory):
+    python benchmarks/extract_benchmark.py [--repeat 5] [--sections 50 500 2000]
+"""
+import argparse
+import json
+import sys
+import os
+import time
+
+from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+
+# Add the backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import Config
+from tools.web_scraper import WebScraperTool
+
+PARSERS = ['html.parser', 'lxml', 'html5lib']
+
+def build_page(sections: int) -> str:
+    """
+    Build a synthetic article page with the given number of sections.
+    
+    Args:
+        sections: Number of heading/paragraph/link/image sections
+        
+    Returns:
+        HTML source of the page
+    """
+    parts = [
+        '<html><head><title>Benchmark page</title>',
+        '<meta name="description" content="Synthetic page">',
+        '<meta name="author" content="Benchmark">',
+        '<meta property="og:site_name" content="bench.example">',
+        '<script type="application/ld+json">{"@type": "NewsArticle", "headline": "Benchmark"}</script>',
+        '<style>body { font-family: sans-serif; }</style>',
+        '</head><body><nav>',
+    ]
+    parts.extend(f'<a href="/nav/{i}">Nav {i}</a>' for i in range(20))
+    parts.append('</nav><article>')
+    
+    for i in range(sections):
+        parts.append(f'<h{i % 6 + 1}>Section {i}</h{i % 6 + 1}>')
+        parts.append(
+            f'<p>Paragraph {i} discusses the research topic in some detail. '
+            f'It contains <a href="/ref/{i}">a reference</a> and enough text to be realistic. '
+            'Further sentences describe benefits, risks and open questions.</p>'
+        )
+        parts.append(f'<img src="/img/{i}.png" alt="Figure {i}">')
+        parts.append(f'<script>window.track({i});</script>')
+    
+    parts.append('</article></body></html>')
+    return ''.join(parts)
+
+def legacy_extract(html: str, parser: str) -> None:
+    """
+    Reference implementation of the previous multi-pass extraction.
+    
+    Args:
+        html: HTML source of the page
+        parser: BeautifulSoup parser name
+    """
+    soup = BeautifulSoup(html, parser)
+    soup.find('title')
+    for tag in soup.find_all('meta'):
+        tag.get('name'), tag.get('property')
+    for script in soup(['script', 'style']):
+        script.extract()
+    for i in range(1, 7):
+        [h.get_text().strip() for h in soup.find_all(f'h{i}')]
+    paragraphs = [p.get_text().strip() for p in soup.find_all('p')]
+    [a.get_text().strip() for a in soup.find_all('a', href=True)]
+    [img['src'] for img in soup.find_all('img', alt=True) if img.get('src')]
+    '\n\n'.join(paragraphs)
+    article = soup.find('article')
+    if article:
+        article.get_text().strip()
+    soup.find_all('script', type='application/ld+json')
+
+def time_call(func, repeat: int) -> float:
+    """
+    Return the best wall-clock time of `repeat` calls, in milliseconds.
+    
+    Args:
+        func: Zero-argument callable to time
+        repeat: Number of timed calls
+        
+    Returns:
+        Best time in milliseconds
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark HTML parse + extract time per page')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per measurement')
+    parser.add_argument('--sections', type=int, nargs='+', default=[50, 500, 2000],
+                        help='Page sizes, in article sections')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+    
+    # Benchmark extraction only, never the page cache
+    Config.PAGE_CACHE_ENABLED = False
+    scraper = WebScraperTool()
+    results = []
+    
+    for parser_name in PARSERS:
+        if builder_registry.lookup(parser_name) is None:
+            continue
+        scraper.parser = parser_name
+        
+        for sections in args.sections:
+            html = build_page(sections)
+            parse_only = time_call(lambda: BeautifulSoup(html, parser_name), args.repeat)
+            single_pass = time_call(lambda: scraper._parse_and_extract(html, 'https://bench.example/page'), args.repeat)
+            multi_pass = time_call(lambda: legacy_extract(html, parser_name), args.repeat)
+            results.append({
+                'parser': parser_name,
+                'sections': sections,
+                'page_kb': round(len(html) / 1024, 1),
+                'parse_ms': round(parse_only, 2),
+                'single_pass_ms': round(single_pass, 2),
+                'legacy_multi_pass_ms': round(multi_pass, 2)
+            })
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    # Extraction time is the total minus the time BeautifulSoup spends parsing
+    print(f"{'parser':<12} {'page KB':>9} {'parse ms':>9} {'single-pass extract ms':>23} "
+          f"{'multi-pass extract ms':>22} {'speedup':>8}")
+    for row in results:
+        single_extract = max(row['single_pass_ms'] - row['parse_ms'], 0.01)
+        multi_extract = max(row['legacy_multi_pass_ms'] - row['parse_ms'], 0.01)
+        print(f"{row['parser']:<12} {row['page_kb']:>9} {row['parse_ms']:>9} {single_extract:>23.2f} "
+              f"{multi_extract:>22.2f} {multi_extract / single_extract:>7.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+"""
+Local HTTP fixtures for the offline benchmark suite.
+
+PageServer serves the checked-in HTML corpus with injectable latency, so a
+single instance stands in for one website (fast, slow or timing out).
+SearchServer stands in for SerpAPI and answers /search with organic results
+that point at the page servers.
+"""
+import json
+import os
+import random
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Callable, Tuple
+from urllib.parse import urlparse, parse_qs
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+
+REPEAT_START = '<!-- REPEAT -->'
+REPEAT_END = '<!-- /REPEAT -->'
+
+def load_corpus(directory: str = CORPUS_DIR) -> Dict[str, bytes]:
+    """
+    Load the HTML corpus described by manifest.json.
+    
+    Pages with a `repeat` count have the block between the REPEAT markers
+    duplicated that many times, which keeps very large pages out of the
+    repository.
+    
+    Args:
+        directory: Corpus directory
+        
+    Returns:
+        Dictionary mapping page names to HTML bytes
+    """
+    with open(os.path.join(directory, 'manifest.json')) as f:
+        manifest = json.load(f)
+    
+    corpus = {}
+    for page in manifest['pages']:
+        with open(os.path.join(directory, page['file']), encoding='utf-8') as f:
+            html = f.read()
+        
+        repeat = page.get('repeat')
+        if repeat:
+            head, rest = html.split(REPEAT_START, 1)
+            block, tail = rest.split(REPEAT_END, 1)
+            html = head + block * repeat + tail
+        
+        corpus[page['name']] = html.encode('utf-8')
+    
+    return corpus
+
+class _FixtureServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server on a free local port with injectable latency.
+    
+    `script` holds (latency, status) pairs answered by the next requests in
+    order, before the configured latency and normal responses apply again.
+    """
+    
+    daemon_threads = True
+    
+    def __init__(self, handler, latency: float = 0.0, jitter: float = 0.0):
+        super().__init__(('127.0.0.1', 0), handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+        self.script: List[Tuple[float, int]] = []
+        self._lock = threading.Lock()
+        self._thread = None
+    
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}'
+    
+    def delay(self) -> int:
+        """
+        Sleep for the next scripted latency, or the configured latency plus
+        random jitter.
+        
+        Returns:
+            The status to answer with (200 unless scripted otherwise)
+        """
+        with self._lock:
+            self.requests += 1
+            scripted = self.script.pop(0) if self.script else None
+        
+        if scripted:
+            pause, status = scripted
+        else:
+            pause, status = self.latency + random.uniform(0, self.jitter), 200
+        if pause > 0:
+            time.sleep(pause)
+        return status
+    
+    def handle_error(self, request, client_address):
+        # Clients hang up on timing-out hosts by design; only report real errors
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+    
+    def start(self) -> '_FixtureServer':
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+class _PageHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    
+    def do_GET(self):
+        status = self.server.delay()
+        if status != 200:
+            self.send_error(status)
+            return
+        
+        path = urlparse(self.path).path
+        name = path.rsplit('/', 1)[-1]
+        body = self.server.corpus.get(name)
+        
+        if not path.startswith('/pages/') or body is None:
+            self.send_error(404)
+            return
+        
+        etag = '"%08x"' % zlib.crc32(body)
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+class PageServer(_FixtureServer):
+    """Serves corpus pages at /pages/<name>, standing in for one website."""
+    
+    def __init__(self, corpus: Dict[str, bytes], latency: float = 0.0, jitter: float = 0.0):
+        super().__init__(_PageHandler, latency, jitter)
+        self.corpus = corpus
+    
+    def page_url(self, name: str, variant: str = '') -> str:
+        """
+        Return the URL of a corpus page on this server.
+        
+        Args:
+            name: Corpus page name
+            variant: Optional path prefix making the URL unique per query
+            
+        Returns:
+            Absolute URL of the page
+        """
+        prefix = f'/pages/{variant}' if variant else '/pages'
+        return f'{self.url}{prefix}/{name}'
+
+class _SearchHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    
+    def do_GET(self):
+        status = self.server.delay()
+        if status != 200:
+            self.send_error(status)
+            return
+        
+        params = parse_qs(urlparse(self.path).query)
+        query = params.get('q', [''])[0]
+        num = int(params.get('num', ['10'])[0])
+        
+        body = json.dumps({
+            'search_metadata': {'status': 'Success'},
+            'organic_results': self.server.results_for(query, num)
+        }).encode('utf-8')
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+class SearchServer(_FixtureServer):
+    """Stands in for SerpAPI, answering /search with links to the page servers."""
+    
+    def __init__(self, results_for: Callable[[str, int], List[Dict[str, str]]], latency: float = 0.0,
+                 jitter: float = 0.0):
+        super().__init__(_SearchHandler, latency, jitter)
+        self.results_for = results_for
+    
+    @property
+    def search_url(self) -> str:
+        return f'{self.url}/search'
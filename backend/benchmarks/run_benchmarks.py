@@ -0,0 +1,309 @@
+"""
+Offline end-to-end benchmark for the research pipeline.
+
+Starts local stand-ins for SerpAPI and for several websites (fast, slow and
+timing-out hosts) serving the checked-in HTML corpus, runs research reports
+against them and reports per-stage timing, throughput and peak memory.
+Results can be saved as JSON and compared with an earlier run.
+
+Usage (from the backend directory):
+    python benchmarks/run_benchmarks.py --output before.json
+    python benchmarks/run_benchmarks.py --output after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from typing import Dict, Any, List
+
+# Add the backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import Config
+from tools.web_search import WebSearchTool
+from tools.web_scraper import WebScraperTool
+from tools.content_analyzer import ContentAnalyzerTool
+from tools.information_synthesis import InformationSynthesisTool
+from fixture_server import load_corpus, PageServer, SearchServer
+
+# (stage name, class, method) pairs whose calls are timed
+STAGES = [
+    ('search', WebSearchTool, 'search'),
+    ('scrape_url', WebScraperTool, 'scrape_url'),
+    ('parse_and_extract', WebScraperTool, '_parse_and_extract'),
+    ('_extract_content', WebScraperTool, '_extract_content'),
+    ('analyze_content', ContentAnalyzerTool, 'analyze_content'),
+    ('synthesize_information', InformationSynthesisTool, 'synthesize_information'),
+    ('generate_research_report', InformationSynthesisTool, 'generate_research_report'),
+]
+
+class StageTimer:
+    """Collects wall-clock durations of the instrumented methods."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {name: [] for name, _, _ in STAGES}
+        self._originals = []
+    
+    def install(self) -> None:
+        """Wrap every stage method with a timing wrapper."""
+        for name, cls, method in STAGES:
+            original = getattr(cls, method)
+            self._originals.append((cls, method, original))
+            setattr(cls, method, self._wrap(name, original))
+    
+    def uninstall(self) -> None:
+        """Restore the original methods."""
+        for cls, method, original in reversed(self._originals):
+            setattr(cls, method, original)
+        self._originals = []
+    
+    def _wrap(self, name: str, func):
+        @wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self.samples[name].append(elapsed)
+        return timed
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize the collected samples per stage.
+        
+        Returns:
+            Dictionary mapping stage names to count, total and latency percentiles
+        """
+        result = {}
+        for name, samples in self.samples.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            result[name] = {
+                'count': len(ordered),
+                'total_s': round(sum(ordered), 4),
+                'mean_ms': round(sum(ordered) / len(ordered) * 1000, 3),
+                'p50_ms': round(percentile(ordered, 50) * 1000, 3),
+                'p95_ms': round(percentile(ordered, 95) * 1000, 3),
+                'max_ms': round(ordered[-1] * 1000, 3)
+            }
+        return result
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """
+    Return the given percentile of an already sorted list (nearest rank).
+    
+    Args:
+        ordered: Sorted samples
+        pct: Percentile between 0 and 100
+        
+    Returns:
+        The percentile value
+    """
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def start_fixtures(args) -> Dict[str, Any]:
+    """
+    Start the page servers and the SerpAPI stand-in.
+    
+    Args:
+        args: Parsed command line arguments
+        
+    Returns:
+        Dictionary with the running servers
+    """
+    corpus = load_corpus()
+    names = sorted(corpus)
+    
+    hosts = []
+    for _ in range(args.fast_hosts):
+        hosts.append(PageServer(corpus, latency=args.fast_latency, jitter=args.fast_latency).start())
+    for _ in range(args.slow_hosts):
+        hosts.append(PageServer(corpus, latency=args.slow_latency, jitter=args.slow_latency / 2).start())
+    for _ in range(args.timeout_hosts):
+        hosts.append(PageServer(corpus, latency=args.request_timeout * 3).start())
+    
+    def results_for(query: str, num: int) -> List[Dict[str, str]]:
+        # Deterministic mix of hosts and pages; URLs are unique per query
+        # unless --shared-urls is set, in which case queries reuse pages
+        seed = sum(map(ord, query))
+        variant = '' if args.shared_urls else f'q{seed}'
+        results = []
+        for k in range(num):
+            host = hosts[(seed + k) % len(hosts)]
+            name = names[(seed + k) % len(names)]
+            results.append({
+                'title': f'{name} page {k}',
+                'link': host.page_url(name, variant),
+                'snippet': f'Benchmark result {k} for {query}'
+            })
+        return results
+    
+    search = SearchServer(results_for, latency=args.search_latency).start()
+    return {'hosts': hosts, 'search': search}
+
+def configure(args, search_url: str, cache_dir: str) -> Dict[str, Any]:
+    """
+    Point the pipeline at the fixtures and apply benchmark settings.
+    
+    Args:
+        args: Parsed command line arguments
+        search_url: URL of the SerpAPI stand-in
+        cache_dir: Temporary directory for cache databases
+        
+    Returns:
+        The settings that were applied, for the result file
+    """
+    settings = {
+        'SERPAPI_URL': search_url,
+        'REQUEST_TIMEOUT': args.request_timeout,
+        'SCRAPE_HOST_DELAY': args.host_delay,
+        'SEARCH_RESULT_COUNT': args.results,
+        'PAGE_CACHE_ENABLED': args.with_cache,
+        'PAGE_CACHE_PATH': os.path.join(cache_dir, 'pages.sqlite3'),
+        'SEARCH_CACHE_ENABLED': args.with_cache,
+        'REPORT_CACHE_ENABLED': args.with_cache,
+        'REPORT_CACHE_PATH': os.path.join(cache_dir, 'reports.sqlite3'),
+        'HOST_HEALTH_PATH': os.path.join(cache_dir, 'hosts.sqlite3'),
+        'RESEARCH_DEADLINE': args.deadline,
+    }
+    for key, value in settings.items():
+        setattr(Config, key, value)
+    return settings
+
+def run(args) -> Dict[str, Any]:
+    """
+    Run the benchmark and collect its results.
+    
+    Args:
+        args: Parsed command line arguments
+        
+    Returns:
+        Dictionary of benchmark results
+    """
+    fixtures = start_fixtures(args)
+    cache_dir = tempfile.mkdtemp(prefix='research-bench-')
+    settings = configure(args, fixtures['search'].search_url, cache_dir)
+    
+    synthesis_tool = InformationSynthesisTool()
+    queries = [f'solar energy climate {i}' for i in range(args.queries)]
+    timer = StageTimer()
+    timer.install()
+    
+    if args.tracemalloc:
+        tracemalloc.start()
+    
+    reports = []
+    started = time.perf_counter()
+    try:
+        for _ in range(args.rounds):
+            with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+                reports.extend(executor.map(synthesis_tool.generate_research_report, queries))
+    finally:
+        wall = time.perf_counter() - started
+        timer.uninstall()
+        for server in fixtures['hosts'] + [fixtures['search']]:
+            server.stop()
+    
+    tracemalloc_peak = None
+    if args.tracemalloc:
+        tracemalloc_peak = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+    
+    pages = len(timer.samples['scrape_url'])
+    partial = sum(1 for r in reports if r.get('report') and r['report'].get('partial'))
+    
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'settings': {**vars(args), **{k: v for k, v in settings.items() if not k.endswith('_PATH')}},
+        'stages': timer.summary(),
+        'reports': {
+            'total': len(reports),
+            'successful': sum(1 for r in reports if r.get('success')),
+            'partial': partial
+        },
+        'throughput': {
+            'wall_s': round(wall, 3),
+            'reports_per_s': round(len(reports) / wall, 3) if wall else None,
+            'pages_per_s': round(pages / wall, 3) if wall else None
+        },
+        'memory': {
+            'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            'tracemalloc_peak_kb': tracemalloc_peak
+        }
+    }
+
+def print_results(results: Dict[str, Any], baseline: Dict[str, Any] = None) -> None:
+    """
+    Print a results table, with changes relative to a baseline if given.
+    
+    Args:
+        results: Results of this run
+        baseline: Results of an earlier run, or None
+    """
+    base_stages = baseline['stages'] if baseline else {}
+    
+    print(f"{'stage':<26} {'count':>6} {'mean ms':>10} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10} {'vs base p95':>12}")
+    for name, stats in results['stages'].items():
+        change = ''
+        base = base_stages.get(name)
+        if base and base['p95_ms']:
+            change = f"{(stats['p95_ms'] - base['p95_ms']) / base['p95_ms'] * 100:+.1f}%"
+        print(f"{name:<26} {stats['count']:>6} {stats['mean_ms']:>10} {stats['p50_ms']:>10} "
+              f"{stats['p95_ms']:>10} {stats['max_ms']:>10} {change:>12}")
+    
+    print()
+    for section in ('reports', 'throughput', 'memory'):
+        line = ', '.join(f'{k}={v}' for k, v in results[section].items())
+        if baseline:
+            line += '  (baseline: ' + ', '.join(f'{k}={v}' for k, v in baseline[section].items()) + ')'
+        print(f'{section}: {line}')
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmark of the research pipeline')
+    parser.add_argument('--queries', type=int, default=5, help='Distinct queries per round')
+    parser.add_argument('--rounds', type=int, default=1, help='Times the query set is run')
+    parser.add_argument('--concurrency', type=int, default=1, help='Reports run in parallel')
+    parser.add_argument('--results', type=int, default=Config.SEARCH_RESULT_COUNT, help='Search results per query')
+    parser.add_argument('--fast-hosts', type=int, default=4)
+    parser.add_argument('--slow-hosts', type=int, default=1)
+    parser.add_argument('--timeout-hosts', type=int, default=1)
+    parser.add_argument('--fast-latency', type=float, default=0.01, help='Seconds added by fast hosts')
+    parser.add_argument('--slow-latency', type=float, default=0.5, help='Seconds added by slow hosts')
+    parser.add_argument('--search-latency', type=float, default=0.05, help='Seconds added by the SerpAPI stand-in')
+    parser.add_argument('--request-timeout', type=float, default=2.0, help='Config.REQUEST_TIMEOUT for the run')
+    parser.add_argument('--host-delay', type=float, default=Config.SCRAPE_HOST_DELAY, help='Config.SCRAPE_HOST_DELAY for the run')
+    parser.add_argument('--deadline', type=float, default=Config.RESEARCH_DEADLINE, help='Config.RESEARCH_DEADLINE for the run')
+    parser.add_argument('--with-cache', action='store_true', help='Enable the page, search and report caches')
+    parser.add_argument('--shared-urls', action='store_true', help='Let different queries return the same page URLs')
+    parser.add_argument('--tracemalloc', action='store_true', help='Also measure peak Python heap (slower)')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--compare', help='Compare against results saved by an earlier run')
+    args = parser.parse_args()
+    
+    results = run(args)
+    
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    
+    print_results(results, baseline)
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f'\nResults written to {args.output}')
+
+if __name__ == '__main__':
+    main()
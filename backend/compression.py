@@ -0,0 +1,69 @@
+import gzip
+import sys
+import os
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # Optional dependency; responses fall back to gzip
+    brotli = None
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from config import Config
+
+def choose_encoding(accept_encodings) -> Optional[str]:
+    """
+    Pick the response encoding preferred by the client.
+    
+    Args:
+        accept_encodings: The request's parsed Accept-Encoding header
+    
+    Returns:
+        'br', 'gzip', or None if the client accepts neither
+    """
+    gzip_quality = accept_encodings.quality('gzip')
+    brotli_quality = accept_encodings.quality('br') if brotli else 0
+    
+    if brotli_quality and brotli_quality >= gzip_quality:
+        return 'br'
+    if gzip_quality:
+        return 'gzip'
+    return None
+
+def compress_response(response, accept_encodings):
+    """
+    Compress a JSON response body if the client supports it and it is large enough.
+    
+    Streamed responses (such as Server-Sent Events) and responses that
+    already carry a Content-Encoding are left untouched.
+    
+    Args:
+        response: The Flask response
+        accept_encodings: The request's parsed Accept-Encoding header
+    
+    Returns:
+        The (possibly compressed) response
+    """
+    if (not Config.COMPRESSION_ENABLED
+            or response.mimetype != 'application/json'
+            or response.is_streamed
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    
+    encoding = choose_encoding(accept_encodings)
+    data = response.get_data()
+    if encoding is None or len(data) < Config.COMPRESSION_MIN_BYTES:
+        return response
+    
+    if encoding == 'br':
+        compressed = brotli.compress(data, quality=Config.BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(data, compresslevel=Config.GZIP_LEVEL)
+    
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    return response
@@ -11,14 +11,125 @@ class Config:
     SERPAPI_KEY = os.getenv('SERPAPI_KEY', 'your-serpapi-key')
     
     # Search engine settings
+    SERPAPI_URL = os.getenv('SERPAPI_URL', 'https://serpapi.com/search')
     SEARCH_RESULT_COUNT = 10
+    SEARCH_CACHE_ENABLED = True
+    SEARCH_CACHE_TTL = 900  # Seconds a cached result list stays valid
+    SEARCH_CACHE_MAX_ENTRIES = 1000
+    SEARCH_CACHE_SHARED_PATH = os.getenv('SEARCH_CACHE_SHARED_PATH')  # Optional SQLite file shared by all workers
     
     # Web scraping settings
     REQUEST_TIMEOUT = 10
     USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    SCRAPE_MAX_WORKERS = 8
+    SCRAPE_HOST_DELAY = 1.0  # Seconds between requests to the same host
+    MAX_DOWNLOAD_BYTES = 1024 * 1024  # Stop reading a page body after this many bytes
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
+    SCRAPE_HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+    HTML_PARSER = 'html.parser'  # BeautifulSoup backend: 'html.parser', 'lxml' (faster, needs lxml) or 'html5lib'
+    URL_CANONICALIZATION_ENABLED = True  # Fetch each document once per report, and cache pages by canonical URL
+    URL_TRACKING_PREFIXES = ('utm_', 'pk_', 'mtm_')  # Query parameters dropped from canonical URLs
+    URL_TRACKING_PARAMS = (
+        'gclid', 'dclid', 'gbraid', 'wbraid', 'fbclid', 'msclkid', 'yclid', 'igshid', 'twclid',
+        'mc_cid', 'mc_eid', '_ga', '_gl', '_hsenc', '_hsmi', 'ref_src', 'ref_url', 'cmpid', 'ncid', 'spm'
+    )
+    
+    # Persistent page cache settings
+    PAGE_CACHE_ENABLED = True
+    PAGE_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'pages.sqlite3')
+    PAGE_CACHE_TTL = 3600  # Seconds before a cached page is revalidated
+    PAGE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+    PAGE_EXTRACTOR_VERSION = 1  # Bump when page extraction changes; older cache entries become misses
+    SQLITE_BUSY_TIMEOUT = 5  # Seconds to wait for a locked cache database
+    
+    # Host health settings (shared by all workers)
+    HOST_HEALTH_ENABLED = True
+    HOST_HEALTH_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'hosts.sqlite3')
+    HOST_HEALTH_ALPHA = 0.3            # Weight of the newest request in a host's moving averages
+    ADAPTIVE_TIMEOUT_MIN = 2.0         # Shortest adaptive timeout in seconds (REQUEST_TIMEOUT is the longest)
+    ADAPTIVE_TIMEOUT_MIN_SAMPLES = 3   # Requests to a host before its timeout adapts
+    CIRCUIT_FAILURE_RATE = 0.5         # Failure rate (moving average) at which a host's circuit opens
+    CIRCUIT_MIN_REQUESTS = 3           # Requests to a host before its circuit can open
+    CIRCUIT_COOLDOWN = 60              # Seconds a host is skipped once its circuit opens
+    NEGATIVE_CACHE_TTL = 600           # Seconds a URL that answered 4xx, or a host that did not resolve, is skipped
+    NEGATIVE_CACHE_SERVER_ERROR_TTL = 60  # Seconds a URL that answered 5xx is skipped
+    
+    # Tail latency settings (hedged requests and retries of page fetches)
+    HEDGE_ENABLED = True
+    HEDGE_PERCENTILE = 95         # Send a second request once a fetch is slower than this share of recent fetches
+    HEDGE_MIN_DELAY = 0.1         # Never hedge sooner than this many seconds
+    HEDGE_MIN_SAMPLES = 20        # Recent fetches needed before hedging starts
+    HEDGE_WINDOW = 500            # Recent fetches the percentile is computed over
+    RETRY_ATTEMPTS = 2            # Retries after a connection error or a RETRY_STATUSES response
+    RETRY_STATUSES = (502, 503, 504)
+    RETRY_BACKOFF = 0.25          # Base delay in seconds, doubled per attempt, with full jitter
+    EXTRA_REQUEST_BUDGET = 0.1    # Hedges plus retries allowed per regular request
+    EXTRA_REQUEST_BURST = 10      # Extra requests that may be sent at once
+    
+    # HTTP connection pool settings (shared by all tools)
+    HTTP_POOL_CONNECTIONS = 20  # Number of per-host pools kept alive
+    HTTP_POOL_MAXSIZE = 10      # Maximum open connections per host
+    HTTP_POOL_BLOCK = False     # Open extra connections instead of waiting when a host pool is full
     
     # Content analysis settings
     MAX_CONTENT_LENGTH = 10000
+    RELEVANCE_SCORING = 'bm25'  # 'bm25' scores across the result batch, 'term_frequency' scores each page alone
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+    ANALYSIS_PROCESS_WORKERS = min(4, os.cpu_count() or 1)  # 1 disables the process pool
+    ANALYSIS_PROCESS_THRESHOLD = 50  # Smaller batches are analyzed in-process to avoid IPC overhead
+    
+    # Research pipeline settings
+    RESEARCH_DEADLINE = 30           # Default time budget of a research request in seconds (None disables)
+    RESEARCH_MAX_DEADLINE = 120      # Largest budget a client may request
+    RESEARCH_SEARCH_SHARE = 0.25     # Share of the budget the search request may use
+    RESEARCH_SYNTHESIS_RESERVE = 1.0 # Seconds kept free at the end for ranking and synthesis
+    EARLY_STOP_SOURCES = 0  # Stop scraping once this many strong sources are analyzed (0 disables)
+    EARLY_STOP_MIN_RELEVANCE = 0.5
+    EARLY_STOP_MIN_RELIABILITY = 0.7
+    
+    # Near-duplicate detection settings
+    DEDUP_ENABLED = True
+    SIMHASH_PAGE_DISTANCE = 8       # Largest Hamming distance between the fingerprints of duplicate pages
+    SIMHASH_SENTENCE_DISTANCE = 6   # Same for key points
+    SIMHASH_SENTENCE_SHINGLE = 2    # Words per feature when fingerprinting key points
+    
+    # Batch research settings
+    BATCH_MAX_QUERIES = 50          # Queries accepted per batch request
+    BATCH_SEARCH_WORKERS = 8        # Searches of a batch run concurrently
+    BATCH_RESEARCH_DEADLINE = 120   # Default time budget of a whole batch in seconds (None disables)
+    BATCH_MAX_DEADLINE = 600        # Largest batch budget a client may request
+    
+    # Research report cache settings
+    REPORT_CACHE_ENABLED = True
+    REPORT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'reports.sqlite3')
+    REPORT_CACHE_TTL = 600            # Seconds a report is served as fresh
+    REPORT_CACHE_GRACE = 3600         # Further seconds a stale report is served while it is refreshed
+    REPORT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    REPORT_CACHE_VERSION = 1          # Bump to invalidate all cached reports
+    REPORT_HOLD_TTL = 120             # Seconds the full report stays retrievable after a `fields` projection
+    REPORT_REFRESH_WORKERS = 2        # Background refreshes run concurrently per process
+    
+    # Background research job settings
+    RESEARCH_JOB_WORKERS = 4        # Research reports run concurrently per process
+    RESEARCH_JOB_MAX_PENDING = 32   # Queued plus running jobs accepted per process
+    RESEARCH_JOB_TTL = 3600         # Seconds a job is kept after its last update
+    RESEARCH_JOB_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'jobs.sqlite3')
+    
+    # Metrics settings
+    METRICS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'metrics')  # Shared by all worker processes
+    METRICS_FLUSH_INTERVAL = 5  # Seconds between writes of a process's metrics to METRICS_DIR
+    
+    # Profiling settings
+    PROFILING_SECRET = os.getenv('PROFILING_SECRET')  # Send as X-Profile header or ?profile= to profile a request (unset disables)
+    PROFILING_TOP_N = 25  # Functions listed in a profile summary
+    PROFILING_DIR = os.getenv('PROFILING_DIR')  # Optional directory for full .prof files and stored summaries
+    
+    # Response compression settings
+    COMPRESSION_ENABLED = True
+    COMPRESSION_MIN_BYTES = 1024  # Smaller JSON responses are sent uncompressed
+    GZIP_LEVEL = 6
+    BROTLI_QUALITY = 5  # Used when the optional brotli package is installed
     
     # API settings
     API_HOST = '0.0.0.0'
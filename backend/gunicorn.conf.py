@@ -0,0 +1,6 @@
+# Gunicorn settings, loaded automatically when gunicorn is started from this directory
+
+def on_starting(server):
+    """Wipe the metrics files of the previous server run before workers start."""
+    from tools.metrics import metrics
+    metrics.clear()
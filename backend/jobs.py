@@ -0,0 +1,190 @@
+import json
+import sys
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from config import Config
+from tools.sqlite_store import SQLiteStore
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    status TEXT NOT NULL,
+    partial TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_expires_at ON jobs (expires_at);
+"""
+
+class JobQueueFullError(Exception):
+    """Raised when the research worker pool has no room for another job."""
+
+class ResearchJobManager:
+    """
+    Runs research reports in a bounded background worker pool.
+    
+    Job state is kept in an SQLite file so that any gunicorn worker can
+    answer status requests for a job started by another worker. Finished
+    jobs are kept until RESEARCH_JOB_TTL seconds after their last update.
+    """
+    
+    def __init__(self, synthesis_tool, path: str = None):
+        """
+        Initialize the job manager.
+        
+        Args:
+            synthesis_tool: InformationSynthesisTool used to run the research
+            path: Path of the job database (defaults to Config.RESEARCH_JOB_DB_PATH)
+        """
+        self.synthesis_tool = synthesis_tool
+        self.store = SQLiteStore(path or Config.RESEARCH_JOB_DB_PATH, _SCHEMA)
+        self.max_workers = Config.RESEARCH_JOB_WORKERS
+        self.max_pending = Config.RESEARCH_JOB_MAX_PENDING
+        self.ttl = Config.RESEARCH_JOB_TTL
+        
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+        self._pending = 0
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the worker pool for this process, creating it after a fork."""
+        pid = os.getpid()
+        if self._executor is None or self._executor_pid != pid:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='research-job')
+            self._executor_pid = pid
+            self._pending = 0
+        return self._executor
+    
+    def submit(self, query: str, deadline: Optional[float] = None) -> str:
+        """
+        Queue a research job.
+        
+        Args:
+            query: The research query
+            deadline: Optional time budget of the research in seconds
+            
+        Returns:
+            The id of the new job
+            
+        Raises:
+            JobQueueFullError: If too many jobs are already queued or running
+        """
+        self._purge_expired()
+        
+        with self._lock:
+            executor = self._get_executor()
+            if self._pending >= self.max_pending:
+                raise JobQueueFullError('Too many research jobs in progress, please retry later')
+            self._pending += 1
+        
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self.store.connection().execute(
+            'INSERT INTO jobs (id, query, status, partial, created_at, updated_at, expires_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (job_id, query, 'queued', json.dumps({'search_results': None, 'sources': []}),
+             now, now, now + self.ttl)
+        )
+        
+        executor.submit(self._run, job_id, query, deadline)
+        return job_id
+    
+    def _run(self, job_id: str, query: str, deadline: Optional[float]) -> None:
+        """
+        Run a job to completion, recording progress after every event.
+        
+        Args:
+            job_id: The job id
+            query: The research query
+            deadline: Optional time budget of the research in seconds
+        """
+        partial = {'search_results': None, 'sources': []}
+        
+        try:
+            self._update(job_id, 'running', partial)
+            
+            for event, payload in self.synthesis_tool.iter_research_events(query, deadline):
+                if event == 'search':
+                    partial['search_results'] = payload['results']
+                    self._update(job_id, 'running', partial)
+                elif event == 'source':
+                    partial['sources'].append(payload)
+                    self._update(job_id, 'running', partial)
+                elif event == 'report':
+                    self._update(job_id, 'completed', partial, result=payload)
+                elif event == 'error':
+                    self._update(job_id, 'failed', partial, result=payload, error=payload.get('error'))
+        
+        except Exception as e:
+            self._update(job_id, 'failed', partial, error=str(e))
+        
+        finally:
+            with self._lock:
+                self._pending -= 1
+    
+    def _update(self, job_id: str, status: str, partial: Dict[str, Any],
+                result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        """
+        Persist the current state of a job and extend its expiry.
+        
+        Args:
+            job_id: The job id
+            status: One of queued, running, completed or failed
+            partial: Partial results gathered so far
+            result: Final research result, if finished
+            error: Error message, if failed
+        """
+        now = time.time()
+        self.store.connection().execute(
+            'UPDATE jobs SET status = ?, partial = ?, result = ?, error = ?, updated_at = ?, expires_at = ? '
+            'WHERE id = ?',
+            (status, json.dumps(partial), json.dumps(result) if result is not None else None,
+             error, now, now + self.ttl, job_id)
+        )
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a job.
+        
+        Args:
+            job_id: The job id
+            
+        Returns:
+            Dictionary describing the job, or None if it is unknown or expired
+        """
+        row = self.store.connection().execute(
+            'SELECT query, status, partial, result, error, created_at, updated_at FROM jobs '
+            'WHERE id = ? AND expires_at > ?',
+            (job_id, time.time())
+        ).fetchone()
+        
+        if row is None:
+            return None
+        
+        query, status, partial, result, error, created_at, updated_at = row
+        return {
+            'job_id': job_id,
+            'query': query,
+            'status': status,
+            'partial': json.loads(partial),
+            'result': json.loads(result) if result else None,
+            'error': error,
+            'created_at': created_at,
+            'updated_at': updated_at
+        }
+    
+    def _purge_expired(self) -> None:
+        """Delete jobs whose results have expired."""
+        self.store.connection().execute('DELETE FROM jobs WHERE expires_at <= ?', (time.time(),))
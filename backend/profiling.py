@@ -0,0 +1,223 @@
+import cProfile
+import hmac
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, Any, Optional, Callable
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from config import Config
+
+_PROFILE_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+# Profiler of the request running in the current thread, if any
+_local = threading.local()
+
+# From Python 3.12 cProfile is built on sys.monitoring: one profiler sees every
+# thread of the process, and only one can be enabled at a time
+_SINGLE_PROFILER = sys.version_info >= (3, 12)
+
+def current_profiler() -> Optional['RequestProfiler']:
+    """Return the profiler of the request running in this thread, or None."""
+    return getattr(_local, 'profiler', None)
+
+def profiling_requested(header_value: Optional[str], query_value: Optional[str]) -> bool:
+    """
+    Check whether a request asked to be profiled.
+
+    Profiling is enabled per request by sending Config.PROFILING_SECRET in the
+    X-Profile header or the `profile` URL parameter. It is always off when no
+    secret is configured.
+    """
+    secret = Config.PROFILING_SECRET
+    if not secret:
+        return False
+
+    value = header_value or query_value
+    if not value:
+        return False
+
+    return hmac.compare_digest(value.encode('utf-8'), secret.encode('utf-8'))
+
+class RequestProfiler:
+    """
+    cProfile wrapper for a single request.
+
+    The request thread is profiled directly. Work it hands to other threads
+    (such as page fetches and parsing in the scraper's workers) is profiled
+    when the task is wrapped with wrap(), and merged into the summary; the
+    cumulative times of such functions add up across threads and can
+    exceed the wall time.
+
+    From Python 3.12 the request's profiler already sees all threads, so
+    wrap() leaves tasks alone; the profile then also includes whatever
+    other requests run at the same time. Only one request can be profiled
+    at once there: if another profiler is active, the request runs
+    unprofiled and the summary says so. Profiling never fails a request.
+    """
+
+    def __init__(self, top_n: int = None, directory: str = None):
+        """
+        Initialize the profiler.
+
+        Args:
+            top_n: Number of functions in the summary (defaults to Config.PROFILING_TOP_N)
+            directory: Where to write full profiles (defaults to Config.PROFILING_DIR, None disables)
+        """
+        self.id = uuid.uuid4().hex
+        self.top_n = top_n or Config.PROFILING_TOP_N
+        self.directory = directory if directory is not None else Config.PROFILING_DIR
+        self._profile = cProfile.Profile()
+        self._started = None
+        self._elapsed = None
+        self._lock = threading.Lock()
+        self._task_profiles = []
+        self._task_time = 0.0
+        self._active = False
+        self._error = None
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        try:
+            self._profile.enable()
+        except ValueError as e:
+            # Another profiler is already active (Python 3.12+)
+            self._error = str(e)
+            return self
+
+        self._active = True
+        _local.profiler = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._active:
+            self._profile.disable()
+            _local.profiler = None
+            with self._lock:
+                self._active = False
+        self._elapsed = time.perf_counter() - self._started
+        return False
+
+    def wrap(self, fn: Callable) -> Callable:
+        """
+        Wrap a task handed to another thread so that it is profiled too.
+
+        Tasks that finish after the profiled call has returned are not counted.
+
+        Args:
+            fn: The task
+
+        Returns:
+            A callable with the same arguments and result
+        """
+        if _SINGLE_PROFILER:
+            return fn
+
+        def profiled(*args, **kwargs):
+            profile = cProfile.Profile()
+            started = time.perf_counter()
+            try:
+                profile.enable()
+            except ValueError:
+                return fn(*args, **kwargs)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profile.disable()
+                with self._lock:
+                    if self._active:
+                        self._task_profiles.append(profile)
+                        self._task_time += time.perf_counter() - started
+
+        return profiled
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the hottest functions of the profiled call.
+
+        Writes the full profile (loadable with pstats or snakeviz) and the
+        summary to the profile directory when one is configured.
+
+        Returns:
+            Dictionary with the profile id, wall time, time spent in tasks
+            on other threads and top functions by cumulative time (or the
+            reason the call could not be profiled, in `error`)
+        """
+        if self._error:
+            return {
+                'id': self.id,
+                'wall_time': round(self._elapsed, 6),
+                'error': f'Not profiled: {self._error}',
+                'top_functions': [],
+                'file': None
+            }
+
+        stats = pstats.Stats(self._profile, stream=io.StringIO())
+        with self._lock:
+            task_profiles = list(self._task_profiles)
+            task_time = self._task_time
+        for profile in task_profiles:
+            stats.add(profile)
+
+        functions = []
+        for (filename, line, name), (_, calls, total_time, cumulative_time, _) in stats.stats.items():
+            functions.append({
+                'function': name,
+                'file': filename,
+                'line': line,
+                'calls': calls,
+                'total_time': round(total_time, 6),
+                'cumulative_time': round(cumulative_time, 6)
+            })
+
+        functions.sort(key=lambda f: f['cumulative_time'], reverse=True)
+
+        summary = {
+            'id': self.id,
+            'wall_time': round(self._elapsed, 6),
+            'thread_tasks': len(task_profiles),
+            'thread_task_time': round(task_time, 6),
+            'total_calls': stats.total_calls,
+            'top_functions': functions[:self.top_n],
+            'file': None
+        }
+
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            profile_path = os.path.join(self.directory, f'{self.id}.prof')
+            stats.dump_stats(profile_path)
+            summary['file'] = profile_path
+
+            with open(os.path.join(self.directory, f'{self.id}.json'), 'w') as f:
+                json.dump(summary, f)
+
+        return summary
+
+def load_profile_summary(profile_id: str, directory: str = None) -> Optional[Dict[str, Any]]:
+    """
+    Load a stored profile summary by id.
+
+    Args:
+        profile_id: Id returned in the profile summary
+        directory: Profile directory (defaults to Config.PROFILING_DIR)
+
+    Returns:
+        The stored summary, or None if it does not exist
+    """
+    directory = directory if directory is not None else Config.PROFILING_DIR
+
+    if not directory or not _PROFILE_ID_PATTERN.match(profile_id):
+        return None
+
+    try:
+        with open(os.path.join(directory, f'{profile_id}.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
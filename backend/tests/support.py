@@ -0,0 +1,118 @@
+"""
+Shared helpers for the backend tests.
+
+The pipeline tests run offline against the benchmark fixture servers: a
+SearchServer stands in for SerpAPI and PageServers for the scraped sites.
+"""
+import os
+import shutil
+import sys
+import tempfile
+from typing import Dict, List, Callable, Optional
+
+# Add the backend and benchmark directories to sys.path
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+sys.path.append(os.path.join(BACKEND_DIR, 'benchmarks'))
+from config import Config
+from fixture_server import load_corpus, PageServer, SearchServer
+
+_corpus = None
+
+def corpus() -> Dict[str, bytes]:
+    """Return the benchmark HTML corpus, loaded once per test run."""
+    global _corpus
+    if _corpus is None:
+        _corpus = load_corpus()
+    return _corpus
+
+def override_config(test, **values) -> None:
+    """
+    Set Config attributes for the duration of a test.
+
+    Args:
+        test: The running unittest.TestCase; the old values are restored on cleanup
+        values: Attribute names and values
+    """
+    for name, value in values.items():
+        test.addCleanup(setattr, Config, name, getattr(Config, name))
+        setattr(Config, name, value)
+
+def isolate_config(test, **values) -> str:
+    """
+    Point every cache and database at a fresh temporary directory.
+
+    Politeness delays are turned off so tests do not wait between requests
+    to the same fixture host; `values` overrides any other setting.
+
+    Args:
+        test: The running unittest.TestCase
+        values: Further Config overrides
+
+    Returns:
+        The temporary directory
+    """
+    directory = tempfile.mkdtemp(prefix='research-test-')
+    test.addCleanup(shutil.rmtree, directory, True)
+
+    settings = {
+        'PAGE_CACHE_PATH': os.path.join(directory, 'pages.sqlite3'),
+        'HOST_HEALTH_PATH': os.path.join(directory, 'hosts.sqlite3'),
+        'REPORT_CACHE_PATH': os.path.join(directory, 'reports.sqlite3'),
+        'RESEARCH_JOB_DB_PATH': os.path.join(directory, 'jobs.sqlite3'),
+        'SEARCH_CACHE_SHARED_PATH': None,
+        'SCRAPE_HOST_DELAY': 0,
+    }
+    settings.update(values)
+    override_config(test, **settings)
+    return directory
+
+def start_page_server(test, latency: float = 0.0) -> PageServer:
+    """Start a PageServer serving the corpus; it is stopped on cleanup."""
+    server = PageServer(corpus(), latency=latency).start()
+    test.addCleanup(server.stop)
+    return server
+
+def start_search_server(test, results_for: Callable[[str, int], List[Dict[str, str]]]) -> SearchServer:
+    """
+    Start a SerpAPI stand-in and point Config.SERPAPI_URL at it.
+
+    Args:
+        test: The running unittest.TestCase
+        results_for: Function of (query, count) returning organic results
+
+    Returns:
+        The running SearchServer
+    """
+    server = SearchServer(results_for).start()
+    test.addCleanup(server.stop)
+    override_config(test, SERPAPI_URL=server.search_url)
+    return server
+
+def page_results(servers: List[PageServer], names: Optional[List[str]] = None,
+                 variant: Callable[[str], str] = lambda query: '') -> Callable[[str, int], List[Dict[str, str]]]:
+    """
+    Build a results_for function linking to corpus pages on the given servers.
+
+    Args:
+        servers: Page servers the results point at, used in turn
+        names: Corpus pages to link, used in turn (defaults to the small pages)
+        variant: Function of the query returning a path prefix, to make URLs unique per query
+
+    Returns:
+        A function for SearchServer
+    """
+    names = names or ['small', 'article', 'jsonld_heavy', 'link_heavy']
+
+    def results_for(query: str, num: int) -> List[Dict[str, str]]:
+        results = []
+        for k in range(num):
+            name = names[k % len(names)]
+            results.append({
+                'title': f'{name} page {k}',
+                'link': servers[k % len(servers)].page_url(name, variant(query) + (f'r{k}' if k >= len(names) else '')),
+                'snippet': f'Result {k} for {query}'
+            })
+        return results
+
+    return results_for
@@ -0,0 +1,121 @@
+import os
+import sys
+import unittest
+
+# Add the backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.support import isolate_config, override_config, start_page_server, start_search_server, page_results
+from tools.information_synthesis import InformationSynthesisTool
+import app as app_module
+
+class BatchDeadlineTest(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        
+        def iter_batch_reports(queries, deadline=None):
+            self.calls.append(deadline)
+            return iter(())
+        
+        tool = app_module.synthesis_tool
+        self.addCleanup(setattr, tool, 'iter_batch_reports', tool.iter_batch_reports)
+        tool.iter_batch_reports = iter_batch_reports
+        self.client = app_module.app.test_client()
+    
+    def _deadline(self, body, url='/api/research/batch'):
+        response = self.client.post(url, json={'queries': ['a', 'b'], **body})
+        response.get_data()
+        self.assertEqual(response.status_code, 200)
+        return self.calls[-1]
+    
+    def test_default_is_the_batch_deadline(self):
+        override_config(self, BATCH_RESEARCH_DEADLINE=90)
+        self.assertEqual(self._deadline({}), 90)
+    
+    def test_disabled_batch_deadline_stays_disabled(self):
+        override_config(self, BATCH_RESEARCH_DEADLINE=None, RESEARCH_DEADLINE=30)
+        self.assertIsNone(self._deadline({}))
+    
+    def test_client_deadline_is_capped_by_the_batch_maximum(self):
+        override_config(self, BATCH_MAX_DEADLINE=300, RESEARCH_MAX_DEADLINE=120)
+        self.assertEqual(self._deadline({'deadline': 200}), 200)
+        self.assertEqual(self._deadline({'deadline': 1000}), 300)
+        self.assertEqual(self._deadline({}, '/api/research/batch?deadline=250'), 250)
+
+class BatchFetchSharingTest(unittest.TestCase):
+    QUERIES = ['solar energy', 'wind power', 'heat pumps']
+    
+    def setUp(self):
+        isolate_config(
+            self,
+            PAGE_CACHE_ENABLED=False,
+            SEARCH_CACHE_ENABLED=False,
+            REPORT_CACHE_ENABLED=False,
+            SEARCH_RESULT_COUNT=4
+        )
+        self.pages = start_page_server(self)
+    
+    def _batch(self, results_for, queries=QUERIES):
+        start_search_server(self, results_for)
+        tool = InformationSynthesisTool()
+        reports = dict(tool.iter_batch_reports(queries, deadline=0))
+        self.assertEqual(sorted(reports), list(range(len(queries))))
+        return [reports[index] for index in range(len(queries))]
+    
+    def _check_reports(self, results, queries=QUERIES):
+        for query, result in zip(queries, results):
+            self.assertTrue(result['success'])
+            self.assertEqual(result['report']['query'], query)
+            self.assertFalse(result['report']['partial'])
+            self.assertTrue(result['report']['sources'])
+    
+    def test_pages_found_by_several_queries_are_fetched_once(self):
+        results = self._batch(page_results([self.pages]))
+        
+        self._check_reports(results)
+        self.assertEqual(self.pages.requests, 4)
+    
+    def test_pages_are_shared_across_url_spellings(self):
+        same_pages = page_results([self.pages])
+        
+        def results_for(query, num):
+            # Each query links the same documents with its own tracking parameter
+            return [
+                {**result, 'link': f"{result['link']}?utm_source={query.replace(' ', '+')}"}
+                for result in same_pages(query, num)
+            ]
+        
+        results = self._batch(results_for)
+        
+        self._check_reports(results)
+        self.assertEqual(self.pages.requests, 4)
+        for query, result in zip(self.QUERIES, results):
+            for source in result['report']['sources']:
+                self.assertTrue(source['url'].endswith(query.replace(' ', '+')))
+    
+    def test_only_overlapping_pages_are_shared(self):
+        # 'wind power' has its own copy of every page, the other queries share theirs
+        results = self._batch(page_results([self.pages], variant=lambda query: 'wind/' if query == 'wind power' else ''))
+        
+        self._check_reports(results)
+        self.assertEqual(self.pages.requests, 8)
+    
+    def test_shared_pages_are_analyzed_in_the_process_pool(self):
+        override_config(self, ANALYSIS_PROCESS_WORKERS=2, ANALYSIS_PROCESS_THRESHOLD=1)
+        
+        results = self._batch(page_results([self.pages]))
+        
+        self._check_reports(results)
+        self.assertEqual(self.pages.requests, 4)
+    
+    def test_cached_reports_are_not_fetched_again(self):
+        override_config(self, REPORT_CACHE_ENABLED=True)
+        
+        self._check_reports(self._batch(page_results([self.pages])))
+        results = self._batch(page_results([self.pages]))
+        
+        self.assertEqual([result['cached'] for result in results], [True, True, True])
+        self._check_reports(results)
+        self.assertEqual(self.pages.requests, 4)
+
+if __name__ == '__main__':
+    unittest.main()
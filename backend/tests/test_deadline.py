@@ -0,0 +1,102 @@
+import os
+import sys
+import time
+import unittest
+
+# Add the backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.support import isolate_config, override_config, start_page_server, start_search_server, page_results
+from tools.information_synthesis import InformationSynthesisTool
+import app as app_module
+
+class ResearchDeadlineTest(unittest.TestCase):
+    def setUp(self):
+        isolate_config(
+            self,
+            PAGE_CACHE_ENABLED=False,
+            SEARCH_CACHE_ENABLED=False,
+            REPORT_CACHE_ENABLED=False,
+            HEDGE_ENABLED=False,
+            SEARCH_RESULT_COUNT=4,
+            RESEARCH_SYNTHESIS_RESERVE=0.5
+        )
+        self.fast = start_page_server(self)
+        self.slow = start_page_server(self, latency=3)
+        
+        # Results alternate between the two servers: 0 and 2 are fast, 1 and 3 slow
+        self.search = start_search_server(self, page_results([self.fast, self.slow]))
+        self.tool = InformationSynthesisTool()
+    
+    def _research(self, deadline):
+        started = time.monotonic()
+        result = self.tool.generate_research_report('solar energy', deadline)
+        return result, time.monotonic() - started
+    
+    def test_deadline_returns_a_partial_report(self):
+        result, elapsed = self._research(1.5)
+        
+        self.assertLess(elapsed, 2.5)
+        self.assertTrue(result['success'])
+        report = result['report']
+        self.assertTrue(report['partial'])
+        self.assertFalse(report['stopped_early'])
+        
+        slow_urls = [r['link'] for r in self.search.results_for('solar energy', 4)[1::2]]
+        self.assertEqual(
+            report['skipped_sources'],
+            [{'title': title, 'url': url, 'reason': 'deadline'}
+             for title, url in zip(['article page 1', 'link_heavy page 3'], slow_urls)]
+        )
+    
+    def test_no_deadline_waits_for_every_source(self):
+        self.slow.latency = 0.3
+        
+        result, _ = self._research(0)
+        
+        report = result['report']
+        self.assertFalse(report['partial'])
+        self.assertEqual(report['skipped_sources'], [])
+        self.assertEqual(self.slow.requests, 2)
+    
+    def test_partial_reports_are_not_cached(self):
+        override_config(self, REPORT_CACHE_ENABLED=True)
+        self.tool = InformationSynthesisTool()
+        
+        self.assertTrue(self._research(1.5)[0]['report']['partial'])
+        self.assertIsNone(self.tool.report_cache.get('solar energy'))
+
+class DeadlineParameterTest(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        
+        def generate_research_report(query, deadline=None):
+            self.calls.append(deadline)
+            return {'success': True, 'report': {'query': query}}
+        
+        tool = app_module.synthesis_tool
+        self.addCleanup(setattr, tool, 'generate_research_report', tool.generate_research_report)
+        tool.generate_research_report = generate_research_report
+        self.client = app_module.app.test_client()
+    
+    def _post(self, body, url='/api/research'):
+        return self.client.post(url, json={'query': 'solar energy', **body})
+    
+    def test_deadline_is_capped(self):
+        isolate_config(self, RESEARCH_DEADLINE=30, RESEARCH_MAX_DEADLINE=120)
+        
+        self._post({})
+        self._post({'deadline': 5})
+        self._post({'deadline': 500})
+        self._post({}, '/api/research?deadline=7.5')
+        self.assertEqual(self.calls, [30, 5, 120, 7.5])
+    
+    def test_invalid_deadlines_are_rejected(self):
+        for value in (0, -1, 'soon'):
+            with self.subTest(value=value):
+                response = self._post({'deadline': value})
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.get_json()['success'])
+        self.assertEqual(self.calls, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import sys
+import unittest
+
+# Add the backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.support import isolate_config
+from tools.report_cache import ReportCache
+import app as app_module
+
+PARTIAL_RESULT = {
+    'success': True,
+    'report': {
+        'query': 'solar power',
+        'summary': 'Partial summary',
+        'sources': [{'title': 'A', 'url': 'http://a.test/'}],
+        'partial': True
+    }
+}
+
+class FieldProjectionTest(unittest.TestCase):
+    def setUp(self):
+        directory = isolate_config(self)
+        tool = app_module.synthesis_tool
+        
+        self.runs = 0
+        
+        def generate_research_report(query, deadline=None):
+            self.runs += 1
+            return {**PARTIAL_RESULT, 'report': dict(PARTIAL_RESULT['report'])}
+        
+        self.addCleanup(setattr, tool, 'generate_research_report', tool.generate_research_report)
+        self.addCleanup(setattr, tool, 'report_cache', tool.report_cache)
+        tool.generate_research_report = generate_research_report
+        tool.report_cache = ReportCache(os.path.join(directory, 'reports.sqlite3'))
+        self.client = app_module.app.test_client()
+    
+    def test_dropped_fields_are_held_for_a_follow_up(self):
+        body = self.client.post('/api/research?fields=summary', json={'query': 'solar power'}).get_json()
+        self.assertEqual(body['report'], {'summary': 'Partial summary'})
+        self.assertEqual(body['omitted_fields'], ['query', 'sources', 'partial'])
+        
+        held = self.client.get(f"/api/research/reports/{body['report_id']}?fields=sources").get_json()
+        self.assertTrue(held['success'])
+        self.assertEqual(held['report'], {'sources': PARTIAL_RESULT['report']['sources']})
+        self.assertEqual(self.runs, 1)
+    
+    def test_full_report_is_not_held(self):
+        body = self.client.post('/api/research', json={'query': 'solar power'}).get_json()
+        self.assertNotIn('report_id', body)
+        self.assertNotIn('omitted_fields', body)
+    
+    def test_unknown_report_id(self):
+        self.assertEqual(self.client.get('/api/research/reports/missing').status_code, 404)
+    
+    def test_without_report_cache_only_the_hint_is_returned(self):
+        app_module.synthesis_tool.report_cache = None
+        body = self.client.post('/api/research', json={'query': 'solar power', 'fields': ['summary']}).get_json()
+        self.assertEqual(body['omitted_fields'], ['query', 'sources', 'partial'])
+        self.assertNotIn('report_id', body)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import sys
+import time
+import unittest
+from urllib.parse import urlparse
+
+# Add the backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.support import isolate_config, start_page_server
+from tools.hedging import LatencyWindow, RequestBudget
+from tools.web_scraper import WebScraperTool
+
+class RequestBudgetTest(unittest.TestCase):
+    def test_burst_then_ratio(self):
+        budget = RequestBudget(ratio=0.5, burst=2)
+        self.assertTrue(budget.withdraw())
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+        
+        budget.deposit()
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+    
+    def test_deposits_are_capped_at_the_burst(self):
+        budget = RequestBudget(ratio=1, burst=1)
+        for _ in range(5):
+            budget.deposit()
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+
+class LatencyWindowTest(unittest.TestCase):
+    def test_percentile(self):
+        window = LatencyWindow(size=10)
+        self.assertIsNone(window.percentile(95))
+        
+        for k in range(1, 21):
+            window.add(k / 10)
+        self.assertEqual(window.percentile(50), 1.5)
+        self.assertEqual(window.percentile(100), 2.0)
+        self.assertIsNone(window.percentile(95, min_samples=11))
+
+class ScraperGetTest(unittest.TestCase):
+    def setUp(self):
+        isolate_config(self, RETRY_BACKOFF=0, HEDGE_MIN_DELAY=0.05, HOST_HEALTH_ENABLED=False, PAGE_CACHE_ENABLED=False)
+        self.server = start_page_server(self)
+        self.scraper = WebScraperTool()
+        self.url = self.server.page_url('small')
+    
+    def _get(self, timeout=5):
+        response, _ = self.scraper._get(self.url, urlparse(self.url).netloc, dict(self.scraper.headers), timeout, None)
+        response.close()
+        return response.status_code
+    
+    def test_transient_status_is_retried(self):
+        self.server.script = [(0, 503)]
+        self.assertEqual(self._get(), 200)
+        self.assertEqual(self.server.requests, 2)
+    
+    def test_retries_stop_after_the_configured_attempts(self):
+        self.server.script = [(0, 503)] * 5
+        self.assertEqual(self._get(), 503)
+        self.assertEqual(self.server.requests, 3)
+    
+    def test_other_errors_are_not_retried(self):
+        self.server.script = [(0, 500)]
+        self.assertEqual(self._get(), 500)
+        self.assertEqual(self.server.requests, 1)
+    
+    def test_retry_needs_budget(self):
+        self.scraper._extra_requests = RequestBudget(ratio=0, burst=0)
+        self.server.script = [(0, 503)]
+        self.assertEqual(self._get(), 503)
+        self.assertEqual(self.server.requests, 1)
+    
+    def _learn_fast_fetches(self):
+        for _ in range(20):
+            self.scraper._latencies.add(0.01)
+    
+    def test_slow_fetch_is_hedged(self):
+        self._learn_fast_fetches()
+        self.server.script = [(2, 200)]
+        
+        started = time.monotonic()
+        self.assertEqual(self._get(), 200)
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(self.server.requests, 2)
+    
+    def test_hedge_needs_budget(self):
+        self._learn_fast_fetches()
+        self.scraper._extra_requests = RequestBudget(ratio=0, burst=0)
+        self.server.script = [(0.3, 200)]
+        
+        self.assertEqual(self._get(), 200)
+        self.assertEqual(self.server.requests, 1)
+    
+    def test_no_hedging_without_enough_samples(self):
+        self.server.script = [(0.3, 200)]
+        self.assertEqual(self._get(), 200)
+        self.assertEqual(self.server.requests, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import sys
+import time
+import unittest
+
+# Add the backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.support import isolate_config, override_config, start_page_server
+from config import Config
+from tools.host_health import HostHealth
+from tools.web_scraper import WebScraperTool
+
+HOST = 'example.test'
+
+class HostHealthTest(unittest.TestCase):
+    def setUp(self):
+        isolate_config(
+            self,
+            CIRCUIT_MIN_REQUESTS=3,
+            CIRCUIT_FAILURE_RATE=0.5,
+            CIRCUIT_COOLDOWN=60,
+            HOST_HEALTH_ALPHA=0.5,
+            REQUEST_TIMEOUT=10,
+            ADAPTIVE_TIMEOUT_MIN=2.0,
+            ADAPTIVE_TIMEOUT_MIN_SAMPLES=3
+        )
+        self.health = HostHealth()
+    
+    def _fail(self, times):
+        for _ in range(times):
+            self.health.record(HOST, 0.1, failed=True)
+    
+    def test_unknown_host_gets_the_full_timeout(self):
+        self.assertEqual(self.health.admit(HOST), 10)
+    
+    def test_timeout_adapts_to_the_host(self):
+        for latency in (0.1, 3.0, 3.0, 3.0):
+            self.health.record(HOST, latency, failed=False)
+        
+        # Average plus four deviations, between ADAPTIVE_TIMEOUT_MIN and REQUEST_TIMEOUT
+        timeout = self.health.admit(HOST)
+        self.assertGreater(timeout, Config.ADAPTIVE_TIMEOUT_MIN)
+        self.assertLessEqual(timeout, Config.REQUEST_TIMEOUT)
+        
+        for _ in range(20):
+            self.health.record(HOST, 0.05, failed=False)
+        self.assertEqual(self.health.admit(HOST), Config.ADAPTIVE_TIMEOUT_MIN)
+    
+    def test_circuit_opens_after_enough_failures(self):
+        self._fail(2)
+        self.assertIsNotNone(self.health.admit(HOST))
+        
+        self._fail(1)
+        self.assertIsNone(self.health.admit(HOST))
+        self.assertEqual(self.health.stats()['open_circuits'], 1)
+        self.assertEqual(self.health.stats()['circuit_opened'], 1)
+        
+        # Other hosts are not affected
+        self.assertEqual(self.health.admit('other.test'), 10)
+    
+    def test_one_trial_request_after_the_cooldown(self):
+        override_config(self, CIRCUIT_COOLDOWN=0.1)
+        self._fail(3)
+        self.assertIsNone(self.health.admit(HOST))
+        
+        time.sleep(0.15)
+        self.assertIsNotNone(self.health.admit(HOST))
+        # Only one caller gets the trial
+        self.assertIsNone(self.health.admit(HOST))
+        
+        # A successful trial closes the circuit
+        self.health.record(HOST, 0.1, failed=False)
+        self.assertIsNotNone(self.health.admit(HOST))
+        self.assertIsNotNone(self.health.admit(HOST))
+    
+    def test_failed_trial_keeps_the_circuit_open(self):
+        override_config(self, CIRCUIT_COOLDOWN=0.1)
+        self._fail(3)
+        
+        time.sleep(0.15)
+        self.assertIsNotNone(self.health.admit(HOST))
+        self._fail(1)
+        self.assertIsNone(self.health.admit(HOST))
+    
+    def test_negative_cache_expires(self):
+        self.health.remember_failure('http://example.test/a', 'HTTP 404', 0.1)
+        
+        self.assertEqual(self.health.recent_failure('http://example.test/a', f'dns:{HOST}'), 'HTTP 404')
+        self.assertIsNone(self.health.recent_failure('http://example.test/b'))
+        
+        time.sleep(0.15)
+        self.assertIsNone(self.health.recent_failure('http://example.test/a'))
+
+class ScraperHostHealthTest(unittest.TestCase):
+    def setUp(self):
+        isolate_config(self, PAGE_CACHE_ENABLED=False, RETRY_ATTEMPTS=0, CIRCUIT_MIN_REQUESTS=2)
+        self.server = start_page_server(self)
+        self.scraper = WebScraperTool()
+    
+    def test_client_error_is_negatively_cached(self):
+        url = self.server.page_url('missing')
+        
+        first = self.scraper.scrape_url(url)
+        second = self.scraper.scrape_url(url)
+        
+        self.assertFalse(first.success)
+        self.assertFalse(first.transient)
+        self.assertIn('Skipped after a recent failure: HTTP 404', second.error)
+        self.assertFalse(second.transient)
+        self.assertEqual(self.server.requests, 1)
+    
+    def test_failing_host_is_skipped(self):
+        self.server.script = [(0, 503)] * 2
+        
+        for variant in ('a', 'b'):
+            self.assertTrue(self.scraper.scrape_url(self.server.page_url('small', variant)).transient)
+        skipped = self.scraper.scrape_url(self.server.page_url('small', 'c'))
+        
+        self.assertIn('circuit open', skipped.error)
+        self.assertTrue(skipped.transient)
+        self.assertEqual(self.server.requests, 2)
+        self.assertEqual(self.scraper.host_health.stats()['open_circuits'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+# Add the backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import Config
+from tools.metrics import MetricsRegistry
+
+class MetricsRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.flush_interval = Config.METRICS_FLUSH_INTERVAL
+        Config.METRICS_FLUSH_INTERVAL = 0
+    
+    def tearDown(self):
+        Config.METRICS_FLUSH_INTERVAL = self.flush_interval
+        shutil.rmtree(self.directory, ignore_errors=True)
+    
+    def _value(self, registry, line_prefix):
+        for line in registry.render().splitlines():
+            if line.startswith(line_prefix + ' '):
+                return float(line.split()[-1])
+        return None
+    
+    def test_concurrent_flushes(self):
+        registry = MetricsRegistry(self.directory)
+        errors = []
+        
+        def record():
+            try:
+                for _ in range(300):
+                    registry.increment('duplicates_total', {'kind': 'page'})
+                    with registry.timer('analysis_seconds'):
+                        pass
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(errors, [])
+        self.assertEqual(self._value(registry, 'duplicates_total{kind="page"}'), 2400)
+        self.assertEqual(self._value(registry, 'analysis_seconds_count'), 2400)
+        self.assertEqual([name for name in os.listdir(self.directory) if name.endswith('.tmp')], [])
+    
+    def test_flush_errors_do_not_reach_callers(self):
+        registry = MetricsRegistry(self.directory)
+        shutil.rmtree(self.directory)
+        
+        registry.increment('duplicates_total')
+        registry.observe('analysis_seconds', 0.1)
+    
+    def test_processes_are_summed_and_cleared(self):
+        first = MetricsRegistry(self.directory)
+        second = MetricsRegistry(self.directory)
+        first.increment('retries_total', {'reason': '503'}, 2)
+        second.increment('retries_total', {'reason': '503'}, 3)
+        
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+        self.assertEqual(self._value(first, 'retries_total{reason="503"}'), 5)
+        
+        first.clear()
+        
+        self.assertEqual(os.listdir(self.directory), [])
+        self.assertIsNone(self._value(first, 'retries_total{reason="503"}'))
+
+if __name__ == '__main__':
+    unittest.main()
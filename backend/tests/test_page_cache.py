@@ -0,0 +1,69 @@
+import os
+import sqlite3
+import sys
+import unittest
+
+# Add the backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.support import isolate_config, override_config
+from config import Config
+from tools.page_cache import PageCache
+
+EXTRACTED = {'content': None, 'metadata': {'title': 'A page'}, 'structured_data': [], 'simhash': 1}
+
+class PageCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = isolate_config(self)
+        self.path = os.path.join(self.directory, 'pages.sqlite3')
+    
+    def test_round_trip(self):
+        cache = PageCache(self.path)
+        cache.put('https://example.com/a', '"e1"', 'Mon, 01 Jan 2024 00:00:00 GMT', EXTRACTED)
+        
+        entry = cache.get('https://example.com/a')
+        
+        self.assertTrue(entry['fresh'])
+        self.assertEqual(entry['extracted'], EXTRACTED)
+        self.assertEqual(cache.conditional_headers(entry), {
+            'If-None-Match': '"e1"',
+            'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'
+        })
+    
+    def test_other_extractor_version_is_a_miss(self):
+        cache = PageCache(self.path)
+        cache.put('https://example.com/a', '"e1"', None, EXTRACTED)
+        
+        override_config(self, PAGE_EXTRACTOR_VERSION=Config.PAGE_EXTRACTOR_VERSION + 1)
+        self.assertIsNone(cache.get('https://example.com/a'))
+        
+        cache.put('https://example.com/a', '"e2"', None, EXTRACTED)
+        self.assertEqual(cache.get('https://example.com/a')['etag'], '"e2"')
+    
+    def test_files_without_extractor_column_are_upgraded(self):
+        conn = sqlite3.connect(self.path)
+        conn.executescript(
+            'CREATE TABLE pages (url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB, '
+            'extracted BLOB, size INTEGER NOT NULL, fetched_at REAL NOT NULL, last_access REAL NOT NULL);'
+            "INSERT INTO pages VALUES ('https://example.com/old', NULL, NULL, NULL, x'00', 1, 0, 0);"
+        )
+        conn.close()
+        
+        cache = PageCache(self.path)
+        
+        self.assertIsNone(cache.get('https://example.com/old'))
+        cache.put('https://example.com/new', None, None, EXTRACTED)
+        self.assertIsNotNone(cache.get('https://example.com/new'))
+    
+    def test_evicts_least_recently_used(self):
+        cache = PageCache(self.path, max_bytes=2000)
+        for i in range(200):
+            cache.put(f'https://example.com/{i}', None, None, dict(EXTRACTED, metadata={'title': f'Page {i}' * 20}))
+        
+        total = cache.store.connection().execute('SELECT SUM(size) FROM pages').fetchone()[0]
+        
+        self.assertLessEqual(total, 2000)
+        self.assertIsNotNone(cache.get('https://example.com/199'))
+        self.assertIsNone(cache.get('https://example.com/0'))
+
+if __name__ == '__main__':
+    unittest.main()
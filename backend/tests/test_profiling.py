@@ -0,0 +1,81 @@
+import os
+import sys
+import threading
+import unittest
+
+# Add the backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.support import isolate_config, override_config, start_page_server, start_search_server, page_results
+from tools.information_synthesis import InformationSynthesisTool
+from profiling import RequestProfiler
+import app as app_module
+
+class ProfiledResearchTest(unittest.TestCase):
+    def setUp(self):
+        isolate_config(
+            self,
+            PROFILING_SECRET='test-secret',
+            PROFILING_DIR=None,
+            PAGE_CACHE_ENABLED=False,
+            SEARCH_CACHE_ENABLED=False,
+            REPORT_CACHE_ENABLED=False,
+            SEARCH_RESULT_COUNT=4
+        )
+        pages = start_page_server(self)
+        start_search_server(self, page_results([pages]))
+        
+        self.addCleanup(setattr, app_module, 'synthesis_tool', app_module.synthesis_tool)
+        app_module.synthesis_tool = InformationSynthesisTool()
+        self.client = app_module.app.test_client()
+    
+    def _research(self, query):
+        return self.client.post('/api/research', json={'query': query}, headers={'X-Profile': 'test-secret'})
+    
+    def test_profiled_request_returns_report_and_profile(self):
+        response = self._research('solar energy')
+        
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertTrue(data['success'])
+        self.assertTrue(data['report']['sources'])
+        
+        functions = {f['function'] for f in data['profile']['top_functions']}
+        self.assertIn('generate_research_report', functions)
+    
+    def test_profiles_scraper_threads(self):
+        override_config(self, PROFILING_TOP_N=10000)
+        
+        data = self._research('wind power').get_json()
+        
+        functions = {f['function'] for f in data['profile']['top_functions']}
+        self.assertIn('_parse_and_extract', functions)
+    
+    def test_concurrent_profiled_requests(self):
+        statuses = []
+        
+        def research(query):
+            statuses.append(self._research(query).status_code)
+        
+        threads = [threading.Thread(target=research, args=(f'query {i}',)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(statuses, [200, 200, 200])
+    
+    def test_profiler_never_fails_the_call(self):
+        with RequestProfiler() as outer:
+            with RequestProfiler() as inner:
+                task = inner.wrap(lambda x: x * 2)
+                result = threading.Thread(target=lambda: task(1))
+                result.start()
+                result.join()
+                value = sum(range(10))
+        
+        self.assertEqual(value, 45)
+        self.assertIn('top_functions', inner.summary())
+        self.assertIn('top_functions', outer.summary())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import unittest
+
+# Add the backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.records import PageContent, ScrapedPage
+
+PARAGRAPHS = ['First paragraph.', 'Second one, with\n\nan inner break.', '', 'Last...']
+TEXT = '\n\n'.join(PARAGRAPHS)
+
+# (description, paragraphs, main text, field expected to hold the main text)
+BUILD_CASES = [
+    ('same as paragraphs', PARAGRAPHS, TEXT, None),
+    ('truncated paragraphs', PARAGRAPHS, TEXT[:20] + '...', 'main_text_cut'),
+    ('truncated to nothing', PARAGRAPHS, '...', 'main_text_cut'),
+    ('paragraphs plus marker', PARAGRAPHS, TEXT + '...', 'main_text_cut'),
+    ('from an article element', PARAGRAPHS, 'Article text that is not a paragraph.', 'main_text_override'),
+    ('marker but not a prefix', PARAGRAPHS, 'Other text...', 'main_text_override'),
+    ('shorter than the marker', PARAGRAPHS, 'ab', 'main_text_override'),
+    ('no paragraphs', [], 'Only main text', 'main_text_override'),
+    ('nothing at all', [], '', None),
+    ('one empty paragraph', [''], '', None),
+]
+
+class PageContentTest(unittest.TestCase):
+    def test_build_round_trips(self):
+        for description, paragraphs, main_text, stored_in in BUILD_CASES:
+            with self.subTest(description):
+                content = PageContent.build(paragraphs, main_text, [(1, 'Title')], [('link', '/a')], [('/i.png', 'alt')])
+                
+                self.assertEqual(content.main_text, main_text)
+                self.assertEqual(content.paragraphs, paragraphs)
+                self.assertEqual(content.main_text_cut is not None, stored_in == 'main_text_cut')
+                self.assertEqual(content.main_text_override is not None, stored_in == 'main_text_override')
+    
+    def test_dict_round_trips(self):
+        for description, paragraphs, main_text, _ in BUILD_CASES:
+            with self.subTest(description):
+                content = PageContent.build(paragraphs, main_text, [(2, 'Heading')], [('link', '/a')], [('/i.png', 'alt')])
+                
+                self.assertEqual(PageContent.from_dict(content.to_dict()), content)
+
+class ScrapedPageTest(unittest.TestCase):
+    def test_extracted_round_trips(self):
+        page = ScrapedPage(
+            'https://example.com/a',
+            content=PageContent.build(PARAGRAPHS, TEXT[:10] + '...'),
+            metadata={'title': 'A page'},
+            structured_data=[{'@type': 'Article'}],
+            simhash=12345
+        )
+        
+        restored = ScrapedPage.from_extracted(page.url, page.extracted(), from_cache=True)
+        
+        self.assertEqual(restored.main_text, page.main_text)
+        self.assertEqual(restored.content, page.content)
+        self.assertEqual(restored.metadata, page.metadata)
+        self.assertEqual(restored.structured_data, page.structured_data)
+        self.assertEqual(restored.simhash, page.simhash)
+        self.assertTrue(restored.from_cache)
+    
+    def test_without_content_keeps_failure_details(self):
+        page = ScrapedPage.failure('https://example.com/a', 'HTTP 503', transient=True)
+        
+        slim = page.without_content()
+        
+        self.assertFalse(slim.success)
+        self.assertEqual(slim.error, 'HTTP 503')
+        self.assertTrue(slim.transient)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import random
+import sys
+import unittest
+
+# Add the backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.simhash import SimHashIndex, simhash, hamming_distance, FINGERPRINT_BITS
+
+class SimHashTest(unittest.TestCase):
+    def test_near_duplicate_texts_are_close(self):
+        text = ' '.join(f'word{i}' for i in range(300))
+        edited = text.replace('word150', 'changed')
+        other = ' '.join(f'other{i}' for i in range(300))
+        
+        self.assertLessEqual(hamming_distance(simhash(text), simhash(edited)), 8)
+        self.assertGreater(hamming_distance(simhash(text), simhash(other)), 8)
+    
+    def test_fingerprint_is_stable(self):
+        self.assertEqual(simhash('the quick brown fox'), simhash('The quick, brown fox!'))
+
+class SimHashIndexTest(unittest.TestCase):
+    def test_bands_cover_all_bits(self):
+        for max_distance in range(0, 16):
+            index = SimHashIndex(max_distance)
+            widths = [mask.bit_length() for _, mask in index._band_masks]
+            
+            self.assertEqual(sum(widths), FINGERPRINT_BITS)
+            self.assertLessEqual(max(widths) - min(widths), 1)
+            self.assertGreater(min(widths), 0)
+    
+    def test_finds_fingerprints_within_distance(self):
+        rng = random.Random(0)
+        index = SimHashIndex(8)
+        stored = [rng.getrandbits(64) for _ in range(200)]
+        for i, fingerprint in enumerate(stored):
+            index.add(fingerprint, i)
+        
+        for i, fingerprint in enumerate(stored):
+            flipped = fingerprint
+            for bit in rng.sample(range(64), 8):
+                flipped ^= 1 << bit
+            self.assertEqual(index.find(flipped), i)
+        
+        far = stored[0] ^ ((1 << 20) - 1)
+        self.assertNotEqual(index.find(far), 0)
+    
+    def test_lookup_compares_few_candidates(self):
+        rng = random.Random(1)
+        for max_distance in (6, 8):
+            index = SimHashIndex(max_distance)
+            for i in range(20000):
+                index.add(rng.getrandbits(64), i)
+            
+            queries = [rng.getrandbits(64) for _ in range(200)]
+            average = sum(len(index._candidates(q)) for q in queries) / len(queries)
+            largest_bucket = max(len(bucket) for table in index._tables for bucket in table.values())
+            
+            # Random fingerprints spread over 2**7 or more keys per band
+            self.assertLess(average, 20000 * len(index._tables) / 2 ** 6)
+            self.assertLess(largest_bucket, 20000 / 2 ** 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Add the backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.support import isolate_config, start_page_server, start_search_server, page_results
+from tools.single_flight import SingleFlight
+from tools.information_synthesis import InformationSynthesisTool
+
+class SingleFlightTest(unittest.TestCase):
+    def setUp(self):
+        self.flight = SingleFlight('test')
+        self.release = threading.Event()
+        self.calls = 0
+    
+    def _blocking(self, result=None, error=None):
+        """Return a function that blocks until released, then returns or raises."""
+        def fn():
+            self.calls += 1
+            self.release.wait(5)
+            if error is not None:
+                raise error
+            return result
+        return fn
+    
+    def _start(self, key, fn, followers):
+        """Start a leader and then `followers` callers for the key; return their outcomes."""
+        outcomes = []
+        
+        def call():
+            try:
+                outcomes.append(self.flight.do(key, fn))
+            except Exception as e:
+                outcomes.append(e)
+        
+        threads = [threading.Thread(target=call)]
+        threads[0].start()
+        while key not in self.flight._calls:
+            time.sleep(0.001)
+        
+        for _ in range(followers):
+            thread = threading.Thread(target=call)
+            thread.start()
+            threads.append(thread)
+        while self.flight._calls[key].waiters < followers:
+            time.sleep(0.001)
+        
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+        return outcomes
+    
+    def test_concurrent_calls_share_one_computation(self):
+        outcomes = self._start('q', self._blocking({'sources': [1, 2]}), followers=3)
+        
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len(outcomes), 4)
+        self.assertEqual(sorted(shared for _, shared in outcomes), [False, True, True, True])
+        for result, _ in outcomes:
+            self.assertEqual(result, {'sources': [1, 2]})
+        
+        # Every caller gets its own copy
+        self.assertEqual(len({id(result) for result, _ in outcomes}), 4)
+    
+    def test_leader_error_reaches_every_caller(self):
+        error = RuntimeError('search failed')
+        outcomes = self._start('q', self._blocking(error=error), followers=2)
+        
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(outcomes, [error] * 3)
+        
+        # A failed call is not remembered
+        self.assertNotIn('q', self.flight._calls)
+        self.assertEqual(self.flight.do('q', lambda: 'retried'), ('retried', False))
+    
+    def test_finished_results_are_not_cached(self):
+        self.assertEqual(self.flight.do('q', lambda: 1), (1, False))
+        self.assertEqual(self.flight.do('q', lambda: 2), (2, False))
+    
+    def test_different_keys_run_separately(self):
+        self.release.set()
+        self.assertEqual(self.flight.do('a', self._blocking('a')), ('a', False))
+        self.assertEqual(self.flight.do('b', self._blocking('b')), ('b', False))
+        self.assertEqual(self.calls, 2)
+
+class CoalescedResearchTest(unittest.TestCase):
+    def setUp(self):
+        isolate_config(
+            self,
+            PAGE_CACHE_ENABLED=False,
+            SEARCH_CACHE_ENABLED=False,
+            REPORT_CACHE_ENABLED=False,
+            SEARCH_RESULT_COUNT=4
+        )
+        self.pages = start_page_server(self)
+        self.search = start_search_server(self, page_results([self.pages]))
+        self.search.latency = 0.3
+        self.tool = InformationSynthesisTool()
+    
+    def test_identical_concurrent_research_runs_once(self):
+        reports = []
+        
+        def research():
+            reports.append(self.tool.generate_research_report('Solar  Energy'))
+        
+        threads = [threading.Thread(target=research) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+        
+        self.assertEqual(len(reports), 3)
+        self.assertEqual(self.search.requests, 1)
+        self.assertEqual(self.pages.requests, 4)
+        sources = [report['report']['sources'] for report in reports]
+        self.assertTrue(sources[0])
+        self.assertEqual(sources[1:], sources[:1] * 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import sys
+import unittest
+
+# Add the backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.url_canonical import canonicalize_url, dedupe_urls
+
+# (URL, canonical form)
+CANONICAL_CASES = [
+    # Scheme, host case, www. and amp. prefixes, default ports
+    ('http://Example.com/Page', 'https://example.com/Page'),
+    ('https://www.example.com/page', 'https://example.com/page'),
+    ('https://amp.example.com/page', 'https://example.com/page'),
+    ('https://example.com:443/page', 'https://example.com/page'),
+    ('http://example.com:80/page', 'https://example.com/page'),
+    ('https://example.com:8443/page', 'https://example.com:8443/page'),
+    ('http://example.com:443/page', 'http://example.com:443/page'),
+    ('http://example.com:8080/page', 'http://example.com:8080/page'),
+    # Trailing slashes and empty paths
+    ('https://example.com', 'https://example.com/'),
+    ('https://example.com/', 'https://example.com/'),
+    ('https://example.com/a/b/', 'https://example.com/a/b'),
+    # Fragments, tracking parameters and parameter order
+    ('https://example.com/a#section', 'https://example.com/a'),
+    ('https://example.com/a?utm_source=x&utm_medium=y', 'https://example.com/a'),
+    ('https://example.com/a?UTM_Campaign=x&id=3', 'https://example.com/a?id=3'),
+    ('https://example.com/a?gclid=1&fbclid=2&pk_kwd=3&mtm_source=4', 'https://example.com/a'),
+    ('https://example.com/a?b=2&a=1', 'https://example.com/a?a=1&b=2'),
+    ('https://example.com/a?q=', 'https://example.com/a?q='),
+    ('https://example.com/a?utmost=1', 'https://example.com/a?utmost=1'),
+    # AMP variants
+    ('https://example.com/news/story/amp', 'https://example.com/news/story'),
+    ('https://example.com/news/story/amp/', 'https://example.com/news/story'),
+    ('https://example.com/amp/news/story', 'https://example.com/news/story'),
+    ('https://example.com/news/story.amp.html', 'https://example.com/news/story.html'),
+    ('https://example.com/news/story?amp=1', 'https://example.com/news/story'),
+    ('https://example.com/news/story?outputType=amp', 'https://example.com/news/story'),
+    ('https://example.com/news/camp', 'https://example.com/news/camp'),
+    ('https://example.com/news/amplifier', 'https://example.com/news/amplifier'),
+    ('https://example.com/news/story?amp=other', 'https://example.com/news/story?amp=other'),
+    # AMP viewers wrapping another page
+    ('https://www.google.com/amp/s/www.example.com/news/story/amp', 'https://example.com/news/story'),
+    ('https://example-com.cdn.ampproject.org/c/s/example.com/news/story', 'https://example.com/news/story'),
+    ('https://example-com.cdn.ampproject.org/v/s/Example.com/news/story?amp=1', 'https://example.com/news/story'),
+    ('https://www.google.com/search?q=amp', 'https://google.com/search?q=amp'),
+    # Anything else is left alone
+    ('ftp://example.com/file', 'ftp://example.com/file'),
+    ('mailto:someone@example.com', 'mailto:someone@example.com'),
+    ('https://example.com:notaport/', 'https://example.com:notaport/'),
+    ('not a url', 'not a url'),
+]
+
+# Pairs of URLs of different documents
+DISTINCT_CASES = [
+    ('https://example.com/a', 'https://example.com/b'),
+    ('https://example.com/Page', 'https://example.com/page'),
+    ('https://example.com/a?id=1', 'https://example.com/a?id=2'),
+    ('https://example.com/a', 'https://example.org/a'),
+    ('https://example.com/a', 'https://example.com:8080/a'),
+    ('http://example.com:443/a', 'https://example.com/a'),
+    ('https://blog.example.com/a', 'https://example.com/a'),
+]
+
+class CanonicalizeUrlTest(unittest.TestCase):
+    def test_canonical_forms(self):
+        for url, expected in CANONICAL_CASES:
+            with self.subTest(url=url):
+                self.assertEqual(canonicalize_url(url), expected)
+    
+    def test_canonical_form_is_stable(self):
+        for url, expected in CANONICAL_CASES:
+            with self.subTest(url=url):
+                self.assertEqual(canonicalize_url(expected), expected)
+    
+    def test_different_documents_stay_apart(self):
+        for first, second in DISTINCT_CASES:
+            with self.subTest(first=first, second=second):
+                self.assertNotEqual(canonicalize_url(first), canonicalize_url(second))
+
+class DedupeUrlsTest(unittest.TestCase):
+    def test_repeats_point_to_first_occurrence(self):
+        urls = [
+            'https://example.com/a',
+            'https://example.com/b',
+            'http://www.example.com/a/?utm_source=feed',
+            'https://www.google.com/amp/s/example.com/b/amp',
+            'https://example.com/c',
+        ]
+        
+        unique, repeats = dedupe_urls(urls)
+        
+        self.assertEqual(unique, [0, 1, 4])
+        self.assertEqual(repeats, [(2, 0), (3, 1)])
+    
+    def test_empty_list(self):
+        self.assertEqual(dedupe_urls([]), ([], []))
+
+if __name__ == '__main__':
+    unittest.main()
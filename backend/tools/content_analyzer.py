@@ -1,12 +1,104 @@
 import sys
 import os
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Tuple
 import re
-import json
+import math
+import multiprocessing
+import threading
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor
 
 # Add the parent directory to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import Config
+from tools.metrics import metrics
+from tools.records import ScrapedPage, PageContent, Analysis, AnalyzedPage
+
+# Word tokens and sentence boundaries used by the shared tokenization pass
+_WORD_PATTERN = re.compile(r'\w+')
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+_POSITIVE_WORDS = ['good', 'great', 'excellent', 'positive', 'beneficial',
+                   'advantage', 'success', 'improve', 'better', 'best']
+
+_NEGATIVE_WORDS = ['bad', 'poor', 'negative', 'problem', 'issue', 'concern',
+                   'risk', 'fail', 'worse', 'worst']
+
+# Process pool for large analysis batches, created on first use in each process
+_process_pool = None
+_process_pool_pid = None
+_process_pool_lock = threading.Lock()
+
+# Analyzer instance used inside pool worker processes
+_worker_analyzer = None
+
+def _get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Return the analysis process pool of the current process.
+    
+    Workers are started with forkserver (or spawn where that is missing)
+    rather than fork: the server process runs many threads, and a child
+    forked while one of them holds a lock (such as the metrics lock) would
+    deadlock on its first use of it. The forkserver preloads only this
+    module, not the server's __main__, so workers fork from a process that
+    has the analyzer imported but none of the application set up.
+    
+    Args:
+        workers: Number of worker processes
+        
+    Returns:
+        The shared ProcessPoolExecutor
+    """
+    global _process_pool, _process_pool_pid
+    
+    pid = os.getpid()
+    with _process_pool_lock:
+        if _process_pool is None or _process_pool_pid != pid:
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            context = multiprocessing.get_context(method)
+            if method == 'forkserver':
+                context.set_forkserver_preload(['tools.content_analyzer'])
+            _process_pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            _process_pool_pid = pid
+    
+    return _process_pool
+
+def _slim_content(content: ScrapedPage) -> ScrapedPage:
+    """
+    Reduce scraped content to the fields needed for analysis.
+    
+    Args:
+        content: The scraped page
+        
+    Returns:
+        ScrapedPage with success, url, main_text and metadata only
+    """
+    if not content or not content.success:
+        return content
+    
+    return ScrapedPage(
+        content.url,
+        content=PageContent(main_text_override=content.main_text),
+        metadata=content.metadata
+    )
+
+def _analyze_in_worker(payload: Tuple[ScrapedPage, str]) -> Analysis:
+    """
+    Analyze one content item inside a pool worker process.
+    
+    Args:
+        payload: Tuple of (slim content, query)
+        
+    Returns:
+        Analysis results
+    """
+    global _worker_analyzer
+    
+    if _worker_analyzer is None:
+        _worker_analyzer = ContentAnalyzerTool()
+    
+    content, query = payload
+    return _worker_analyzer.analyze_content(content, query)
 
 class ContentAnalyzerTool:
     """
@@ -17,87 +109,109 @@ class ContentAnalyzerTool:
     def __init__(self):
         self.openai_api_key = Config.OPENAI_API_KEY
         
-    def analyze_content(self, content: Dict[str, Any], query: str) -> Dict[str, Any]:
+    def analyze_content(self, content: ScrapedPage, query: str) -> Analysis:
         """
         Analyze the content extracted from a web page.
         
         Args:
-            content: Dictionary containing the scraped content
+            content: The scraped page
             query: The original search query
             
         Returns:
-            Dictionary containing analysis results
+            Analysis results
         """
-        if not content or not content.get('success', False):
-            return {
-                'success': False,
-                'error': 'No valid content to analyze',
-                'relevance_score': 0,
-                'key_points': []
-            }
+        if not content or not content.success:
+            return Analysis.failure('No valid content to analyze')
         
         # Extract the main text content
-        main_text = content.get('content', {}).get('main_text', '')
+        main_text = content.main_text
         if not main_text:
-            return {
-                'success': False,
-                'error': 'No text content to analyze',
-                'relevance_score': 0,
-                'key_points': []
-            }
+            return Analysis.failure('No text content to analyze')
+        
+        with metrics.timer('analysis_seconds'):
+            return self._analyze_text(content, main_text, query)
+    
+    def _analyze_text(self, content: ScrapedPage, main_text: str, query: str) -> Analysis:
+        """
+        Run every analysis step on the main text of a page.
+        
+        Args:
+            content: The scraped page
+            main_text: The main text of the page
+            query: The original search query
+            
+        Returns:
+            Analysis results
+        """
+        # Tokenize once and share the result with every analysis step
+        document = self._tokenize(main_text)
+        query_terms = query.lower().split()
         
         # Calculate relevance score
-        relevance_score = self._calculate_relevance(main_text, query)
+        relevance_score = self._calculate_relevance(document, query_terms)
         
         # Extract key points
-        key_points = self._extract_key_points(main_text, query)
+        key_points = self._extract_key_points(document, query_terms)
         
         # Assess reliability
         reliability_score = self._assess_reliability(content)
         
         # Identify sentiment
-        sentiment = self._analyze_sentiment(main_text)
+        sentiment = self._analyze_sentiment(document)
         
         # Extract entities
         entities = self._extract_entities(main_text)
         
+        return Analysis(
+            success=True,
+            relevance_score=relevance_score,
+            reliability_score=reliability_score,
+            key_points=key_points,
+            sentiment=sentiment,
+            entities=entities,
+            length=len(document['tokens']),
+            term_counts={term: self._count_term(document, term) for term in query_terms}
+        )
+    
+    def _tokenize(self, text: str) -> Dict[str, Any]:
+        """
+        Tokenize and sentence-segment a document in a single pass.
+        
+        Args:
+            text: The text content to analyze
+            
+        Returns:
+            Dictionary with the lower-cased text, word tokens, a term-frequency
+            table, and the sentences in original and lower case
+        """
+        text_lower = text.lower()
+        tokens = _WORD_PATTERN.findall(text_lower)
+        sentences = _SENTENCE_BOUNDARY.split(text)
+        
         return {
-            'success': True,
-            'relevance_score': relevance_score,
-            'reliability_score': reliability_score,
-            'key_points': key_points,
-            'sentiment': sentiment,
-            'entities': entities
+            'text_lower': text_lower,
+            'tokens': tokens,
+            'term_freq': Counter(tokens),
+            'sentences': sentences,
+            'sentences_lower': [sentence.lower() for sentence in sentences]
         }
     
-    def _calculate_relevance(self, text: str, query: str) -> float:
+    def _calculate_relevance(self, document: Dict[str, Any], query_terms: List[str]) -> float:
         """
         Calculate the relevance score of the content to the query.
         
         Args:
-            text: The text content to analyze
-            query: The original search query
+            document: Tokenized document from _tokenize
+            query_terms: Lower-cased query terms
             
         Returns:
             Relevance score between 0 and 1
         """
         # Simple relevance calculation based on term frequency
-        query_terms = query.lower().split()
-        text_lower = text.lower()
-        
-        # Count occurrences of query terms
-        term_counts = {}
-        for term in query_terms:
-            # Use word boundaries to match whole words
-            pattern = r'\b' + re.escape(term) + r'\b'
-            count = len(re.findall(pattern, text_lower))
-            term_counts[term] = count
-        
-        # Calculate average occurrence per term
         if not query_terms:
             return 0
         
-        total_occurrences = sum(term_counts.values())
+        total_occurrences = sum(self._count_term(document, term) for term in query_terms)
         avg_occurrence = total_occurrences / len(query_terms)
         
         # Normalize to a score between 0 and 1
@@ -106,13 +220,32 @@ class ContentAnalyzerTool:
         
         return relevance_score
     
-    def _extract_key_points(self, text: str, query: str) -> List[str]:
+    def _count_term(self, document: Dict[str, Any], term: str) -> int:
+        """
+        Count whole-word occurrences of a query term in a document.
+        
+        Args:
+            document: Tokenized document from _tokenize
+            term: Lower-cased query term
+            
+        Returns:
+            Number of occurrences
+        """
+        # Plain words are looked up in the term-frequency table
+        if _WORD_PATTERN.fullmatch(term):
+            return document['term_freq'][term]
+        
+        # Terms with punctuation (e.g. "c++") fall back to a word-boundary search
+        pattern = r'\b' + re.escape(term) + r'\b'
+        return len(re.findall(pattern, document['text_lower']))
+    
+    def _extract_key_points(self, document: Dict[str, Any], query_terms: List[str]) -> List[str]:
         """
         Extract key points from the text that are relevant to the query.
         
         Args:
-            text: The text content to analyze
-            query: The original search query
+            document: Tokenized document from _tokenize
+            query_terms: Lower-cased query terms
             
         Returns:
             List of key points extracted from the text
@@ -120,19 +253,16 @@ class ContentAnalyzerTool:
         # In a real implementation, this would use NLP or AI to extract key points
         # For this mock implementation, we'll use a simple approach
         
-        # Split text into sentences
-        sentences = re.split(r'(?<=[.!?])\s+', text)
+        sentences = document['sentences']
         
         # Score sentences based on query term occurrence
-        query_terms = query.lower().split()
         scored_sentences = []
         
-        for sentence in sentences:
+        for sentence, sentence_lower in zip(sentences, document['sentences_lower']):
             if len(sentence) < 10:  # Skip very short sentences
                 continue
                 
             score = 0
-            sentence_lower = sentence.lower()
             
             for term in query_terms:
                 if term in sentence_lower:
@@ -164,12 +294,12 @@ class ContentAnalyzerTool:
         
         return top_sentences
     
-    def _assess_reliability(self, content: Dict[str, Any]) -> float:
+    def _assess_reliability(self, content: ScrapedPage) -> float:
         """
         Assess the reliability of the content source.
         
         Args:
-            content: Dictionary containing the scraped content and metadata
+            content: The scraped page
             
         Returns:
             Reliability score between 0 and 1
@@ -180,7 +310,7 @@ class ContentAnalyzerTool:
         reliability_score = 0.5  # Default neutral score
         
         # Check if metadata exists
-        metadata = content.get('metadata', {})
+        metadata = content.metadata
         if not metadata:
             return reliability_score
         
@@ -212,12 +342,12 @@ class ContentAnalyzerTool:
         
         return reliability_score
     
-    def _analyze_sentiment(self, text: str) -> str:
+    def _analyze_sentiment(self, document: Dict[str, Any]) -> str:
         """
         Analyze the sentiment of the text.
         
         Args:
-            text: The text content to analyze
+            document: Tokenized document from _tokenize
             
         Returns:
             Sentiment classification (positive, negative, or neutral)
@@ -225,16 +355,10 @@ class ContentAnalyzerTool:
         # In a real implementation, this would use NLP or AI for sentiment analysis
         # For this mock implementation, we'll use a simple keyword approach
         
-        positive_words = ['good', 'great', 'excellent', 'positive', 'beneficial', 
-                         'advantage', 'success', 'improve', 'better', 'best']
+        term_freq = document['term_freq']
         
-        negative_words = ['bad', 'poor', 'negative', 'problem', 'issue', 'concern',
-                         'risk', 'fail', 'worse', 'worst']
-        
-        text_lower = text.lower()
-        
-        positive_count = sum(text_lower.count(' ' + word + ' ') for word in positive_words)
-        negative_count = sum(text_lower.count(' ' + word + ' ') for word in negative_words)
+        positive_count = sum(term_freq[word] for word in _POSITIVE_WORDS)
+        negative_count = sum(term_freq[word] for word in _NEGATIVE_WORDS)
         
         if positive_count > negative_count * 1.5:
             return 'positive'
@@ -264,27 +388,135 @@ class ContentAnalyzerTool:
             {'text': 'New York', 'type': 'LOCATION'}
         ]
     
-    def analyze_multiple_contents(self, contents: List[Dict[str, Any]], query: str) -> List[Dict[str, Any]]:
+    def uses_process_pool(self, count: int) -> bool:
+        """
+        Check whether a batch of analyses is large enough for the process pool.
+        
+        Args:
+            count: Number of (page, query) pairs to analyze
+            
+        Returns:
+            True if the batch should be analyzed in worker processes
+        """
+        return Config.ANALYSIS_PROCESS_WORKERS > 1 and count >= Config.ANALYSIS_PROCESS_THRESHOLD
+    
+    def submit_analysis(self, content: ScrapedPage, query: str) -> Future:
+        """
+        Analyze a page in the shared process pool without waiting for it.
+        
+        Args:
+            content: The scraped page
+            query: The original search query
+            
+        Returns:
+            Future of the analysis results
+        """
+        pool = _get_process_pool(Config.ANALYSIS_PROCESS_WORKERS)
+        return pool.submit(_analyze_in_worker, (_slim_content(content), query))
+    
+    def analyze_multiple_contents(self, contents: List[ScrapedPage], query: str) -> List[AnalyzedPage]:
         """
         Analyze multiple content items and return analysis results.
         
         Args:
-            contents: List of dictionaries containing scraped content
+            contents: List of scraped pages
             query: The original search query
             
         Returns:
-            List of dictionaries containing analysis results
+            List of analyzed pages, most relevant first
         """
-        results = []
+        # Large batches are CPU-bound, so spread them over worker processes
+        if self.uses_process_pool(len(contents)):
+            analyses = self._analyze_in_processes(contents, query, Config.ANALYSIS_PROCESS_WORKERS)
+        else:
+            analyses = [self.analyze_content(content, query) for content in contents]
         
-        for content in contents:
-            analysis = self.analyze_content(content, query)
-            results.append({
-                'content': content,
-                'analysis': analysis
-            })
+        results = [AnalyzedPage(content, analysis) for content, analysis in zip(contents, analyses)]
+        
+        return self.rank_results(results, query)
+    
+    def _analyze_in_processes(self, contents: List[ScrapedPage], query: str, workers: int) -> List[Analysis]:
+        """
+        Analyze content items in the shared process pool.
+        
+        Only the fields analyze_content reads are sent to the workers, not the
+        links, images and other extracted data.
+        
+        Args:
+            contents: List of scraped pages
+            query: The original search query
+            workers: Number of worker processes
+            
+        Returns:
+            Analysis results in the same order as `contents`
+        """
+        payloads = [(_slim_content(content), query) for content in contents]
+        chunksize = max(1, len(payloads) // (workers * 4))
+        
+        return list(_get_process_pool(workers).map(_analyze_in_worker, payloads, chunksize=chunksize))
+    
+    def rank_results(self, results: List[AnalyzedPage], query: str) -> List[AnalyzedPage]:
+        """
+        Order analyzed content items for synthesis.
+        
+        Args:
+            results: List of analyzed pages
+            query: The original search query
+            
+        Returns:
+            The same items sorted by relevance score, most relevant first
+        """
+        # Re-score the whole batch so term rarity across documents counts
+        if Config.RELEVANCE_SCORING == 'bm25':
+            self._score_batch_bm25([item.analysis for item in results], query)
         
         # Sort results by relevance score
-        results.sort(key=lambda x: x['analysis'].get('relevance_score', 0), reverse=True)
+        results.sort(key=lambda x: x.analysis.relevance_score, reverse=True)
         
         return results
+    
+    def _score_batch_bm25(self, analyses: List[Analysis], query: str) -> None:
+        """
+        Replace per-document relevance scores with BM25 scores over the batch.
+        
+        The document-term matrix only needs the query-term columns, so it is
+        built from the term counts each analysis already carries and scored
+        column by column. Scores are divided by the largest score a document
+        could reach with the terms found in the batch, which keeps them
+        between 0 and 1.
+        
+        Args:
+            analyses: Analyses of the batch, updated in place
+            query: The original search query
+        """
+        scored = [analysis for analysis in analyses if analysis.term_counts is not None]
+        query_terms = list(dict.fromkeys(query.lower().split()))
+        if not scored or not query_terms:
+            return
+        
+        k1 = Config.BM25_K1
+        b = Config.BM25_B
+        num_docs = len(scored)
+        lengths = [analysis.length for analysis in scored]
+        avg_length = (sum(lengths) / num_docs) or 1
+        
+        # Length normalization factor of each document
+        norms = [k1 * (1 - b + b * length / avg_length) for length in lengths]
+        scores = [0.0] * num_docs
+        max_score = 0.0
+        
+        for term in query_terms:
+            column = [analysis.term_counts.get(term, 0) for analysis in scored]
+            doc_freq = sum(1 for tf in column if tf)
+            if not doc_freq:
+                # A term no page contains cannot separate the pages
+                continue
+            idf = math.log(1 + (num_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+            max_score += idf * (k1 + 1)
+            
+            for i, tf in enumerate(column):
+                if tf:
+                    scores[i] += idf * tf * (k1 + 1) / (tf + norms[i])
+        
+        for analysis, score in zip(scored, scores):
+            analysis.relevance_score = score / max_score if max_score else 0
@@ -0,0 +1,74 @@
+import sys
+import os
+import threading
+from collections import deque
+from typing import Optional
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import Config
+
+class LatencyWindow:
+    """Rolling window of recent latencies, for percentile-based hedging delays."""
+    
+    def __init__(self, size: int = None):
+        self._samples = deque(maxlen=size or Config.HEDGE_WINDOW)
+        self._lock = threading.Lock()
+    
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+    
+    def percentile(self, pct: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Return a percentile of the recent latencies (nearest rank).
+        
+        Args:
+            pct: Percentile between 0 and 100
+            min_samples: Samples needed for a meaningful answer
+        
+        Returns:
+            The percentile in seconds, or None if there are too few samples
+        """
+        with self._lock:
+            if len(self._samples) < max(min_samples, 1):
+                return None
+            ordered = sorted(self._samples)
+        
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+        return ordered[index]
+
+class RequestBudget:
+    """
+    Token bucket limiting extra requests (hedges and retries) to a share of
+    the regular ones.
+    
+    Every regular request deposits `ratio` tokens, up to `burst`; every
+    extra request needs a whole token. Over time at most `ratio` extra
+    requests are sent per regular request, so a failing or slow upstream
+    cannot be flooded with duplicates.
+    """
+    
+    def __init__(self, ratio: float = None, burst: float = None):
+        self.ratio = ratio if ratio is not None else Config.EXTRA_REQUEST_BUDGET
+        self.burst = burst if burst is not None else Config.EXTRA_REQUEST_BURST
+        self._tokens = self.burst
+        self._lock = threading.Lock()
+    
+    def deposit(self) -> None:
+        """Account for one regular request."""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+    
+    def withdraw(self) -> bool:
+        """
+        Take a token for one extra request.
+        
+        Returns:
+            True if the extra request may be sent
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
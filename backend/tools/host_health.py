@@ -0,0 +1,212 @@
+import sys
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import Config
+from tools.sqlite_store import SQLiteStore
+from tools.metrics import metrics
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hosts (
+    host TEXT PRIMARY KEY,
+    latency REAL NOT NULL,
+    deviation REAL NOT NULL,
+    failure_rate REAL NOT NULL,
+    requests INTEGER NOT NULL,
+    open_until REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS failures (
+    key TEXT PRIMARY KEY,
+    error TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS failures_expires_at ON failures (expires_at);
+"""
+
+# Moving averages of response time, its deviation and the failure rate
+_RECORD_SQL = """
+INSERT INTO hosts (host, latency, deviation, failure_rate, requests, open_until, updated_at)
+VALUES (:host, :latency, :latency / 2, :failed, 1, 0, :now)
+ON CONFLICT (host) DO UPDATE SET
+    deviation = (1 - :alpha) * deviation + :alpha * ABS(:latency - latency),
+    latency = (1 - :alpha) * latency + :alpha * :latency,
+    failure_rate = (1 - :alpha) * failure_rate + :alpha * :failed,
+    requests = requests + 1,
+    updated_at = :now
+"""
+
+class HostHealth:
+    """
+    Per-host health shared by all worker processes through an SQLite file.
+    
+    For every host it keeps moving averages of the response time and of
+    the failure rate. The response time sets an adaptive request timeout
+    (average plus four deviations, as TCP does for retransmissions); the
+    failure rate drives a circuit breaker that skips the host for a
+    cooldown once too many of its requests fail. After the cooldown a
+    single trial request is let through: success closes the circuit,
+    failure keeps it open for another cooldown.
+    
+    Separately, URLs that answered with an error status and hosts whose
+    name did not resolve are remembered for a while (a negative cache),
+    so they are not requested again on every report.
+    """
+    
+    def __init__(self, path: str = None):
+        self.path = path or Config.HOST_HEALTH_PATH
+        self.store = SQLiteStore(self.path, _SCHEMA)
+        
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'circuit_opened': 0,
+            'circuit_skips': 0,
+            'negative_hits': 0
+        }
+    
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+    
+    def admit(self, host: str) -> Optional[float]:
+        """
+        Decide whether a host may be requested, and with which timeout.
+        
+        Args:
+            host: Host name (with port, if any)
+        
+        Returns:
+            The request timeout in seconds, or None if the host's circuit is open
+        """
+        conn = self.store.connection()
+        row = conn.execute(
+            'SELECT latency, deviation, requests, open_until FROM hosts WHERE host = ?',
+            (host,)
+        ).fetchone()
+        
+        if row is None:
+            return Config.REQUEST_TIMEOUT
+        
+        latency, deviation, requests, open_until = row
+        now = time.time()
+        
+        if open_until:
+            if now < open_until:
+                self._count('circuit_skips')
+                metrics.increment('host_skips_total', {'reason': 'circuit_open'})
+                return None
+            
+            # Cooldown over: only the worker that claims the trial request proceeds
+            claimed = conn.execute(
+                'UPDATE hosts SET open_until = ? WHERE host = ? AND open_until = ?',
+                (now + Config.CIRCUIT_COOLDOWN, host, open_until)
+            ).rowcount
+            if not claimed:
+                self._count('circuit_skips')
+                metrics.increment('host_skips_total', {'reason': 'circuit_open'})
+                return None
+        
+        if requests < Config.ADAPTIVE_TIMEOUT_MIN_SAMPLES:
+            return Config.REQUEST_TIMEOUT
+        
+        return min(Config.REQUEST_TIMEOUT, max(Config.ADAPTIVE_TIMEOUT_MIN, latency + 4 * deviation))
+    
+    def record(self, host: str, latency: float, failed: bool) -> None:
+        """
+        Record the outcome of a request to a host.
+        
+        Args:
+            host: Host name (with port, if any)
+            latency: Seconds until the response headers arrived, or until the request failed
+            failed: Whether the host failed (timeout, connection error, 5xx or 429)
+        """
+        now = time.time()
+        conn = self.store.connection()
+        conn.execute(_RECORD_SQL, {
+            'host': host,
+            'latency': latency,
+            'failed': 1.0 if failed else 0.0,
+            'alpha': Config.HOST_HEALTH_ALPHA,
+            'now': now
+        })
+        
+        if not failed:
+            conn.execute(
+                'UPDATE hosts SET open_until = 0, failure_rate = 0 WHERE host = ? AND open_until != 0',
+                (host,)
+            )
+            return
+        
+        opened = conn.execute(
+            'UPDATE hosts SET open_until = ? '
+            'WHERE host = ? AND open_until = 0 AND requests >= ? AND failure_rate >= ?',
+            (now + Config.CIRCUIT_COOLDOWN, host, Config.CIRCUIT_MIN_REQUESTS, Config.CIRCUIT_FAILURE_RATE)
+        ).rowcount
+        if opened:
+            self._count('circuit_opened')
+            metrics.increment('circuit_opens_total')
+    
+    def recent_failure(self, *keys: str) -> Optional[str]:
+        """
+        Look up the negative cache.
+        
+        Args:
+            keys: Keys the failure may be stored under (a URL, or 'dns:' plus a host)
+        
+        Returns:
+            The error message of an unexpired failure, or None
+        """
+        placeholders = ', '.join('?' for _ in keys)
+        row = self.store.connection().execute(
+            f'SELECT error FROM failures WHERE key IN ({placeholders}) AND expires_at > ? LIMIT 1',
+            (*keys, time.time())
+        ).fetchone()
+        
+        if row is None:
+            return None
+        
+        self._count('negative_hits')
+        metrics.increment('host_skips_total', {'reason': 'negative_cache'})
+        return row[0]
+    
+    def remember_failure(self, key: str, error: str, ttl: float) -> None:
+        """
+        Store a failure in the negative cache and drop expired entries.
+        
+        Args:
+            key: A URL, or 'dns:' plus a host
+            error: The error message to report while the entry is valid
+            ttl: Seconds the entry is valid
+        """
+        now = time.time()
+        conn = self.store.connection()
+        conn.execute(
+            'INSERT OR REPLACE INTO failures (key, error, expires_at) VALUES (?, ?, ?)',
+            (key, error, now + ttl)
+        )
+        conn.execute('DELETE FROM failures WHERE expires_at <= ?', (now,))
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return this process's counters and the shared number of open circuits.
+        
+        Returns:
+            Dictionary of counters
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        
+        now = time.time()
+        conn = self.store.connection()
+        stats['hosts'] = conn.execute('SELECT COUNT(*) FROM hosts').fetchone()[0]
+        stats['open_circuits'] = conn.execute(
+            'SELECT COUNT(*) FROM hosts WHERE open_until > ?', (now,)
+        ).fetchone()[0]
+        stats['negative_entries'] = conn.execute(
+            'SELECT COUNT(*) FROM failures WHERE expires_at > ?', (now,)
+        ).fetchone()[0]
+        return stats
@@ -0,0 +1,59 @@
+import requests
+from requests.adapters import HTTPAdapter
+import sys
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import Config
+
+# Process-wide session state. The session is rebuilt after a fork so that
+# gunicorn workers never share sockets with the master process.
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+def _build_session() -> requests.Session:
+    """
+    Build a requests session backed by keep-alive connection pools.
+    
+    The session rejects all cookies: it is shared by every request of the
+    process, and cookies set by one site (consent, paywall or session
+    cookies) must not carry over to other users' requests.
+    
+    Returns:
+        A configured requests.Session
+    """
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(
+        pool_connections=Config.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=Config.HTTP_POOL_MAXSIZE,
+        pool_block=Config.HTTP_POOL_BLOCK
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def get_session() -> requests.Session:
+    """
+    Return the shared HTTP session for the current process.
+    
+    All tools share this session so repeat requests to the same host
+    (e.g. serpapi.com or wikipedia.org) reuse open TCP/TLS connections.
+    
+    Returns:
+        The process-wide requests.Session
+    """
+    global _session, _session_pid
+    
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+    
+    return _session
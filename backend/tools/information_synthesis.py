@@ -1,7 +1,9 @@
 import sys
 import os
-from typing import Dict, Any, List, Optional
-import json
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import replace
 
 # Add the parent directory to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -9,6 +11,182 @@ from config import Config
 from tools.web_search import WebSearchTool
 from tools.web_scraper import WebScraperTool
 from tools.content_analyzer import ContentAnalyzerTool
+from tools.metrics import metrics
+from tools.search_cache import normalize_query
+from tools.single_flight import SingleFlight
+from tools.report_cache import ReportCache
+from tools.records import SearchResult, ScrapedPage, Analysis, AnalyzedPage, KeyPoint
+from tools.simhash import simhash, SimHashIndex
+from tools.url_canonical import canonicalize_url, dedupe_urls
+
+class _ResearchRun:
+    """
+    Per-query state of a research run while its pages are scraped.
+    
+    Collects the analyzed pages of one query, skips repeated URLs and
+    near-duplicate pages, tracks the early-stop target and finally turns
+    the results into the report. Used by both the single-query pipeline
+    and batches, where one fetched page may feed several runs.
+    """
+    
+    def __init__(self, tool: 'InformationSynthesisTool', query: str, search_results: List[SearchResult], started: float):
+        self.tool = tool
+        self.query = query
+        self.search_results = search_results
+        self.started = started
+        self.urls = [result.url for result in search_results]
+        
+        # Results repeating an earlier result's document under another address
+        # (tracking parameters, AMP variants, ...) are not fetched at all
+        if Config.URL_CANONICALIZATION_ENABLED:
+            self.fetch_indexes, self.repeated = dedupe_urls(self.urls)
+        else:
+            self.fetch_indexes, self.repeated = list(range(len(self.urls))), []
+        if self.repeated:
+            metrics.increment('duplicates_total', {'kind': 'url'}, len(self.repeated))
+        
+        self.duplicate_sources = [
+            {
+                'title': search_results[index].title,
+                'url': self.urls[index],
+                'duplicate_of': self.urls[original],
+                'reason': 'same_url'
+            }
+            for index, original in self.repeated
+        ]
+        
+        # Indexes of the search results that need no further work
+        self.finished = {index for index, _ in self.repeated}
+        
+        # Syndicated copies of a page are recognized by their fingerprint and not analyzed
+        self.seen_pages = SimHashIndex(Config.SIMHASH_PAGE_DISTANCE) if Config.DEDUP_ENABLED else None
+        
+        self.analyzed_contents = []
+        self.strong_sources = 0
+        self.stopped_early = False
+        self.transient_failures = 0
+        
+        # Indexes of received pages whose analysis has not been added yet
+        self.pending = set()
+    
+    @property
+    def enough_sources(self) -> bool:
+        """Whether the early-stop target has been reached."""
+        return bool(Config.EARLY_STOP_SOURCES) and self.strong_sources >= Config.EARLY_STOP_SOURCES
+    
+    @property
+    def done(self) -> bool:
+        """Whether no further page or analysis is needed."""
+        return self.enough_sources or (len(self.finished) == len(self.urls) and not self.pending)
+    
+    def add_page(self, index: int, content: ScrapedPage) -> Dict[str, Any]:
+        """
+        Analyze a scraped page for this query.
+        
+        Args:
+            index: Position of the page in the search results
+            content: The scraped page
+            
+        Returns:
+            The 'source' event payload for the page
+        """
+        payload = self.receive_page(index, content)
+        if payload is not None:
+            return payload
+        
+        return self.add_analysis(index, content, self.tool.analyzer_tool.analyze_content(content, self.query))
+    
+    def receive_page(self, index: int, content: ScrapedPage) -> Optional[Dict[str, Any]]:
+        """
+        Record a scraped page, before it is analyzed.
+        
+        Args:
+            index: Position of the page in the search results
+            content: The scraped page
+            
+        Returns:
+            The 'source' event payload if the page is a near-duplicate and
+            needs no analysis, else None; the page must then be passed to
+            add_analysis() with its analysis
+        """
+        self.finished.add(index)
+        if not content.success and content.transient:
+            self.transient_failures += 1
+        
+        original = self.tool._find_duplicate(self.seen_pages, content)
+        if original is not None:
+            metrics.increment('duplicates_total', {'kind': 'page'})
+            self.duplicate_sources.append({
+                'title': content.title,
+                'url': content.url,
+                'duplicate_of': original,
+                'reason': 'same_content'
+            })
+            return self.tool._summarize_duplicate(index, content, original)
+        
+        self.pending.add(index)
+        return None
+    
+    def add_analysis(self, index: int, content: ScrapedPage, analysis: Analysis) -> Dict[str, Any]:
+        """
+        Record the analysis of a page passed to receive_page().
+        
+        Args:
+            index: Position of the page in the search results
+            content: The scraped page
+            analysis: Its analysis for this query
+            
+        Returns:
+            The 'source' event payload for the page
+        """
+        self.pending.discard(index)
+        # Synthesis only needs the metadata, so the page text is released here
+        self.analyzed_contents.append(AnalyzedPage(content.without_content(), analysis))
+        
+        if self.tool._is_strong_source(analysis):
+            self.strong_sources += 1
+            if self.enough_sources:
+                self.stopped_early = len(self.finished) < len(self.urls)
+        
+        return self.tool._summarize_source(index, content, analysis)
+    
+    def finish(self) -> Dict[str, Any]:
+        """
+        Rank the analyzed pages and synthesize the report.
+        
+        Returns:
+            The synthesis result, with the report's bookkeeping fields filled in
+        """
+        analyzed_contents = self.tool.analyzer_tool.rank_results(self.analyzed_contents, self.query)
+        
+        with metrics.timer('synthesis_seconds'):
+            synthesis_result = self.tool.synthesize_information(analyzed_contents, self.query)
+        
+        # Sources that were never analyzed, because of the deadline or an early stop
+        skip_reason = 'early_stop' if self.stopped_early else 'deadline'
+        skipped_sources = [
+            {
+                'title': result.title,
+                'url': result.url,
+                'reason': skip_reason
+            }
+            for index, result in enumerate(self.search_results)
+            if index not in self.finished
+        ]
+        
+        report = synthesis_result['report']
+        if synthesis_result['success'] and report:
+            report['search_results'] = [result.to_dict() for result in self.search_results]
+            report['stopped_early'] = self.stopped_early
+            report['partial'] = bool(skipped_sources) and not self.stopped_early
+            report['mock_results'] = any(result.mock for result in self.search_results)
+            report['transient_failures'] = self.transient_failures
+            report['skipped_sources'] = skipped_sources
+            report['duplicate_sources'] = self.duplicate_sources
+            report['fetches_saved'] = len(self.repeated)
+            report['elapsed'] = round(time.monotonic() - self.started, 3)
+        
+        return synthesis_result
 
 class InformationSynthesisTool:
     """
@@ -19,12 +197,26 @@ class InformationSynthesisTool:
     def __init__(self):
         self.openai_api_key = Config.OPENAI_API_KEY
         
-    def synthesize_information(self, analyzed_contents: List[Dict[str, Any]], query: str) -> Dict[str, Any]:
+        # Tools are created once and reused across reports so that their
+        # HTTP connection pools and per-host state persist between requests
+        self.search_tool = WebSearchTool()
+        self.scraper_tool = WebScraperTool()
+        self.analyzer_tool = ContentAnalyzerTool()
+        
+        # Concurrent requests for the same query share one research run
+        self._inflight = SingleFlight('research')
+        
+        # Complete reports, served stale while being refreshed (None when disabled)
+        self.report_cache = ReportCache() if Config.REPORT_CACHE_ENABLED else None
+        self._refresh_executor = None
+        self._refresh_executor_pid = None
+        
+    def synthesize_information(self, analyzed_contents: List[AnalyzedPage], query: str) -> Dict[str, Any]:
         """
         Synthesize information from multiple analyzed content sources.
         
         Args:
-            analyzed_contents: List of dictionaries containing content and analysis results
+            analyzed_contents: Analyzed pages, most relevant first
             query: The original search query
             
         Returns:
@@ -41,38 +233,42 @@ class InformationSynthesisTool:
         sources = []
         key_points = []
         
+        # Sources are most relevant first, so the first copy of a repeated point is kept
+        seen_points = SimHashIndex(Config.SIMHASH_SENTENCE_DISTANCE) if Config.DEDUP_ENABLED else None
+        
         for item in analyzed_contents:
-            content = item.get('content', {})
-            analysis = item.get('analysis', {})
+            content = item.page
+            analysis = item.analysis
             
-            if not content or not analysis:
+            if not content.success or not analysis.success:
                 continue
                 
             # Skip low-relevance content
-            if analysis.get('relevance_score', 0) < 0.2:
+            if analysis.relevance_score < 0.2:
                 continue
                 
             # Extract metadata
-            metadata = content.get('metadata', {})
-            url = content.get('url', '')
+            metadata = content.metadata or {}
+            url = content.url
             title = metadata.get('title', 'Untitled')
             
             # Add source information
             sources.append({
                 'title': title,
                 'url': url,
-                'relevance': analysis.get('relevance_score', 0),
-                'reliability': analysis.get('reliability_score', 0)
+                'relevance': analysis.relevance_score,
+                'reliability': analysis.reliability_score
             })
             
             # Add key points
-            points = analysis.get('key_points', [])
-            for point in points:
-                key_points.append({
-                    'text': point,
-                    'source': title,
-                    'url': url
-                })
+            for point in analysis.key_points:
+                if seen_points is not None:
+                    fingerprint = simhash(point, Config.SIMHASH_SENTENCE_SHINGLE)
+                    if seen_points.find(fingerprint) is not None:
+                        metrics.increment('duplicates_total', {'kind': 'key_point'})
+                        continue
+                    seen_points.add(fingerprint, point)
+                key_points.append(KeyPoint(point, title, url))
         
         # Organize information by topic
         topics = self._organize_by_topic(key_points, query)
@@ -97,7 +293,7 @@ class InformationSynthesisTool:
             'report': report
         }
     
-    def _organize_by_topic(self, key_points: List[Dict[str, Any]], query: str) -> List[Dict[str, Any]]:
+    def _organize_by_topic(self, key_points: List[KeyPoint], query: str) -> List[Dict[str, Any]]:
         """
         Organize key points by topic.
         
@@ -123,7 +319,7 @@ class InformationSynthesisTool:
         topics = {}
         
         for point in key_points:
-            point_text = point['text'].lower()
+            point_text = point.text.lower()
             assigned = False
             
             # Try to assign to a specific topic
@@ -146,12 +342,12 @@ class InformationSynthesisTool:
         for topic, points in topics.items():
             result.append({
                 'name': topic.capitalize(),
-                'points': points
+                'points': [point.to_dict() for point in points]
             })
         
         return result
     
-    def _generate_summary(self, key_points: List[Dict[str, Any]], query: str) -> str:
+    def _generate_summary(self, key_points: List[KeyPoint], query: str) -> str:
         """
         Generate a summary of the information.
         
@@ -170,14 +366,14 @@ class InformationSynthesisTool:
         
         # Use the first few key points to create a summary
         summary_points = key_points[:3]
-        summary_text = " ".join([point['text'] for point in summary_points])
+        summary_text = " ".join([point.text for point in summary_points])
         
         # Add an introduction
         introduction = f"Based on research about '{query}', the following information was found. "
         
         return introduction + summary_text
     
-    def _generate_conclusions(self, key_points: List[Dict[str, Any]], query: str) -> List[str]:
+    def _generate_conclusions(self, key_points: List[KeyPoint], query: str) -> List[str]:
         """
         Generate conclusions based on the information.
         
@@ -203,58 +399,439 @@ class InformationSynthesisTool:
         
         return conclusions
     
-    def generate_research_report(self, query: str) -> Dict[str, Any]:
+    def generate_research_report(self, query: str, deadline: Optional[float] = None) -> Dict[str, Any]:
         """
         Generate a complete research report for the given query.
         This method orchestrates the entire research process.
         
+        Complete reports are cached per normalized query. A stale report is
+        returned immediately while one caller refreshes it in the background.
+        On a miss, concurrent calls with the same normalized query and time
+        budget are coalesced: only the first runs the pipeline, the others
+        wait for it and receive a copy of its report.
+        
         Args:
             query: The research query
+            deadline: Time budget in seconds (defaults to Config.RESEARCH_DEADLINE)
             
         Returns:
-            Dictionary containing the research report
+            Dictionary containing the research report, with `cached`, `stale`
+            and `age` (seconds since the report was generated) fields
+        """
+        budget = deadline if deadline is not None else Config.RESEARCH_DEADLINE
+        
+        result = self._cached_report(query)
+        if result is not None:
+            return result
+        
+        result, shared = self._inflight.do((normalize_query(query), budget), lambda: self._compute_report(query, budget))
+        result.update({'cached': False, 'stale': False, 'age': 0})
+        
+        if shared and result.get('report'):
+            # Echo the caller's own spelling of the query
+            result['report']['query'] = query
+        
+        return result
+    
+    def _cached_report(self, query: str) -> Optional[Dict[str, Any]]:
+        """Return the cached report for a query, scheduling a refresh if it is stale."""
+        cached = self.report_cache.get(query) if self.report_cache else None
+        if not cached:
+            return None
+        
+        if not cached['fresh']:
+            self._schedule_refresh(query)
+        
+        result = cached['result']
+        result.update({'cached': True, 'stale': not cached['fresh'], 'age': round(cached['age'], 3)})
+        if result.get('report'):
+            # Echo the caller's own spelling of the query
+            result['report']['query'] = query
+        
+        return result
+    
+    def _compute_report(self, query: str, deadline: Optional[float]) -> Dict[str, Any]:
+        """Run the research pipeline and cache complete, successful reports."""
+        result = self._run_research(query, deadline)
+        self._store_report(query, result)
+        return result
+    
+    def _store_report(self, query: str, result: Dict[str, Any]) -> None:
+        """
+        Cache a research result if it is a complete, successful report.
+        
+        Reports built on mock search results, or missing sources that failed
+        for a reason that may soon go away (timeouts, server errors, open
+        circuits), are not cached: the next request may well do better.
+        """
+        report = result.get('report')
+        if not (self.report_cache and result.get('success') and report):
+            return
+        if report.get('partial') or report.get('mock_results') or report.get('transient_failures'):
+            return
+        self.report_cache.put(query, result)
+    
+    def _schedule_refresh(self, query: str) -> None:
+        """Refresh a stale cached report in the background, unless another caller already is."""
+        budget = Config.RESEARCH_DEADLINE or Config.RESEARCH_MAX_DEADLINE
+        if not self.report_cache.claim_refresh(query, budget + Config.RESEARCH_SYNTHESIS_RESERVE):
+            return
+        
+        pid = os.getpid()
+        if self._refresh_executor is None or self._refresh_executor_pid != pid:
+            self._refresh_executor = ThreadPoolExecutor(
+                max_workers=Config.REPORT_REFRESH_WORKERS, thread_name_prefix='report-refresh'
+            )
+            self._refresh_executor_pid = pid
+        
+        self._refresh_executor.submit(self._refresh_report, query)
+    
+    def _refresh_report(self, query: str) -> None:
+        """Recompute a cached report with the default time budget."""
+        budget = Config.RESEARCH_DEADLINE
+        try:
+            self._inflight.do((normalize_query(query), budget), lambda: self._compute_report(query, budget))
+        except Exception as e:
+            print(f"Error refreshing report for '{query}': {e}")
+    
+    def _run_research(self, query: str, deadline: Optional[float]) -> Dict[str, Any]:
+        """Run the research pipeline and return its final report (see generate_research_report)."""
+        # Run the pipelined research process and keep only its final result
+        for event, payload in self.iter_research_events(query, deadline):
+            if event in ('report', 'error'):
+                return payload
+        
+        return {
+            'success': False,
+            'error': 'Research ended without a report',
+            'report': None
+        }
+    
+    def iter_research_events(self, query: str, deadline: Optional[float] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
         """
-        # Initialize tools
-        search_tool = WebSearchTool()
-        scraper_tool = WebScraperTool()
-        analyzer_tool = ContentAnalyzerTool()
+        Run the research process and yield progress events as work finishes.
+        
+        Events are yielded in this order: one 'search' event with the search
+        results, one 'source' event per scraped and analyzed page (in
+        completion order), then a final 'report' event. An 'error' event
+        replaces the remaining events if the process cannot continue.
+        
+        Pages that are near-duplicates of a page already seen (such as
+        syndicated copies of one story) are not analyzed; their 'source'
+        event names the page they duplicate in `duplicate_of`, and the report
+        lists them in `duplicate_sources`. Search results whose URL only
+        differs from an earlier one's in its canonical form are not fetched;
+        they are listed there too, and counted in `fetches_saved`.
+        
+        The time budget is spread across the stages: the search gets a share
+        of it, scraping and analysis run until a reserve for synthesis is
+        left, and whatever has finished by then is synthesized. Such a report
+        is flagged `partial` and lists the sources it had to skip.
+        
+        Args:
+            query: The research query
+            deadline: Time budget in seconds (defaults to Config.RESEARCH_DEADLINE;
+                None or 0 in both places means no limit)
+            
+        Yields:
+            Tuples of (event name, event data)
+        """
+        budget = deadline if deadline is not None else Config.RESEARCH_DEADLINE
+        started = time.monotonic()
+        search_timeout = None
+        scrape_deadline = None
+        
+        if budget:
+            search_timeout = min(Config.REQUEST_TIMEOUT, budget * Config.RESEARCH_SEARCH_SHARE)
+            scrape_deadline = started + max(budget - Config.RESEARCH_SYNTHESIS_RESERVE, 0)
         
         # Step 1: Perform web search
-        search_results = search_tool.search(query, num_results=Config.SEARCH_RESULT_COUNT)
+        search_results = self.search_tool.search(
+            query,
+            num_results=Config.SEARCH_RESULT_COUNT,
+            timeout=search_timeout
+        )
         
         if not search_results:
-            return {
+            yield 'error', {
                 'success': False,
                 'error': 'No search results found',
                 'report': None
             }
+            return
         
-        # Step 2: Scrape content from search results
-        urls = [result['url'] for result in search_results]
-        scraped_contents = scraper_tool.scrape_multiple_urls(urls)
+        yield 'search', {'results': [result.to_dict() for result in search_results]}
         
-        if not scraped_contents:
-            return {
-                'success': False,
-                'error': 'Failed to scrape content from search results',
-                'report': None
-            }
-        
-        # Step 3: Analyze content
-        analyzed_contents = analyzer_tool.analyze_multiple_contents(scraped_contents, query)
+        # Steps 2 and 3: Scrape and analyze each page as soon as it arrives,
+        # so analysis overlaps the fetches that are still outstanding
+        run = _ResearchRun(self, query, search_results, started)
         
-        if not analyzed_contents:
-            return {
-                'success': False,
-                'error': 'Failed to analyze content',
-                'report': None
-            }
+        scraped = self.scraper_tool.iter_scraped_urls([run.urls[index] for index in run.fetch_indexes], deadline=scrape_deadline)
+        try:
+            for position, content in scraped:
+                yield 'source', run.add_page(run.fetch_indexes[position], content)
+                
+                # Stop once enough relevant, reliable sources have been gathered
+                if run.enough_sources:
+                    break
+        finally:
+            scraped.close()
         
         # Step 4: Synthesize information
-        synthesis_result = self.synthesize_information(analyzed_contents, query)
+        synthesis_result = run.finish()
         
-        # Add search results to the report
-        if synthesis_result['success'] and synthesis_result['report']:
-            synthesis_result['report']['search_results'] = search_results
+        metrics.observe('research_report_seconds', time.monotonic() - started)
+        yield 'report', synthesis_result
+    
+    def iter_batch_reports(self, queries: List[str], deadline: Optional[float] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Research several queries together and yield each report as soon as it is complete.
+        
+        Cached reports are yielded first. The other queries are searched
+        concurrently and the URLs of all their results are merged: a page
+        found by several queries (under any address of the document) is
+        fetched and parsed once, then analyzed against each of them. A
+        query's report is synthesized as soon as all its pages are in or
+        its early-stop target is reached; reports still open when the
+        scraping deadline passes are synthesized from what has arrived and
+        flagged `partial`. When the batch has at least
+        Config.ANALYSIS_PROCESS_THRESHOLD (page, query) pairs, pages are
+        analyzed in the analyzer's process pool while fetching goes on.
         
-        return synthesis_result
+        Args:
+            queries: The research queries
+            deadline: Time budget in seconds for the whole batch (defaults to
+                Config.BATCH_RESEARCH_DEADLINE; None or 0 in both places means no limit)
+            
+        Yields:
+            Tuples of (position of the query in `queries`, research result)
+        """
+        budget = deadline if deadline is not None else Config.BATCH_RESEARCH_DEADLINE
+        started = time.monotonic()
+        search_timeout = None
+        scrape_deadline = None
+        
+        if budget:
+            search_timeout = min(Config.REQUEST_TIMEOUT, budget * Config.RESEARCH_SEARCH_SHARE)
+            scrape_deadline = started + max(budget - Config.RESEARCH_SYNTHESIS_RESERVE, 0)
+        
+        pending = []
+        for index, query in enumerate(queries):
+            result = self._cached_report(query)
+            if result is not None:
+                yield index, result
+            else:
+                pending.append(index)
+        
+        if not pending:
+            return
+        
+        # Step 1: Search for all remaining queries concurrently
+        runs = {}
+        with ThreadPoolExecutor(max_workers=min(len(pending), Config.BATCH_SEARCH_WORKERS)) as executor:
+            searches = executor.map(
+                lambda index: self.search_tool.search(
+                    queries[index],
+                    num_results=Config.SEARCH_RESULT_COUNT,
+                    timeout=search_timeout
+                ),
+                pending
+            )
+            for index, search_results in zip(pending, searches):
+                if search_results:
+                    runs[index] = _ResearchRun(self, queries[index], search_results, started)
+                else:
+                    yield index, {
+                        'success': False,
+                        'error': 'No search results found',
+                        'report': None,
+                        'cached': False,
+                        'stale': False,
+                        'age': 0
+                    }
+        
+        # Step 2: Merge the pages of all queries, best-ranked first, so that
+        # each document is fetched once however many queries need it
+        waiting = {}
+        fetches = []
+        for rank in range(max((len(run.fetch_indexes) for run in runs.values()), default=0)):
+            for index, run in runs.items():
+                if rank >= len(run.fetch_indexes):
+                    continue
+                result_index = run.fetch_indexes[rank]
+                url = run.urls[result_index]
+                key = canonicalize_url(url) if Config.URL_CANONICALIZATION_ENABLED else url
+                if key not in waiting:
+                    waiting[key] = []
+                    fetches.append((key, url))
+                waiting[key].append((index, result_index))
+        
+        shared_fetches = sum(len(needed_by) for needed_by in waiting.values()) - len(waiting)
+        if shared_fetches:
+            metrics.increment('coalesced_requests_total', {'scope': 'batch'}, shared_fetches)
+        
+        # Step 3: Analyze each page for every query that needs it, and
+        # synthesize a query's report once it has all its pages. Large
+        # batches are analyzed in worker processes while fetching goes on.
+        use_pool = self.analyzer_tool.uses_process_pool(sum(len(run.fetch_indexes) for run in runs.values()))
+        analyses = {}
+        
+        scraped = self.scraper_tool.iter_scraped_urls([url for _, url in fetches], deadline=scrape_deadline)
+        try:
+            for position, content in scraped:
+                for index, result_index in waiting[fetches[position][0]]:
+                    run = runs.get(index)
+                    if run is None:
+                        continue
+                    
+                    url = run.urls[result_index]
+                    page = content if content.url == url else replace(content, url=url)
+                    if not (use_pool and page.success):
+                        run.add_page(result_index, page)
+                    elif run.receive_page(result_index, page) is None:
+                        analyses[self.analyzer_tool.submit_analysis(page, run.query)] = (index, result_index, page)
+                    
+                    if run.done:
+                        yield index, self._finish_batch_run(runs.pop(index))
+                
+                yield from self._collect_analyses(runs, analyses, wait=False)
+                if not runs:
+                    break
+            
+            yield from self._collect_analyses(runs, analyses, wait=True)
+        finally:
+            scraped.close()
+            for future in analyses:
+                future.cancel()
+        
+        # Step 4: Reports still open at the deadline use the pages that arrived
+        for index, run in runs.items():
+            yield index, self._finish_batch_run(run)
+    
+    def _collect_analyses(self, runs: Dict[int, '_ResearchRun'], analyses: Dict[Future, Tuple[int, int, ScrapedPage]],
+                          wait: bool) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Add analyses finished in the process pool to their runs.
+        
+        Args:
+            runs: Open runs by position of their query
+            analyses: Pending analyses, mapped to (query position, result index,
+                page); finished ones are removed
+            wait: Wait for all pending analyses instead of taking only the finished ones
+            
+        Yields:
+            Tuples of (query position, research result) for runs that became complete
+        """
+        ready = as_completed(list(analyses)) if wait else [future for future in list(analyses) if future.done()]
+        for future in ready:
+            index, result_index, page = analyses.pop(future)
+            run = runs.get(index)
+            if run is None:
+                continue
+            
+            try:
+                analysis = future.result()
+            except Exception as e:
+                analysis = Analysis.failure(f"Analysis failed: {e}")
+            
+            run.add_analysis(result_index, page, analysis)
+            if run.done:
+                yield index, self._finish_batch_run(runs.pop(index))
+    
+    def _finish_batch_run(self, run: '_ResearchRun') -> Dict[str, Any]:
+        """Synthesize and cache the report of one query of a batch."""
+        result = run.finish()
+        self._store_report(run.query, result)
+        
+        metrics.observe('research_report_seconds', time.monotonic() - run.started)
+        result.update({'cached': False, 'stale': False, 'age': 0})
+        return result
+    
+    def _find_duplicate(self, seen_pages: Optional[SimHashIndex], content: ScrapedPage) -> Optional[str]:
+        """
+        Check a scraped page against the pages already seen in this report.
+        
+        Pages that are not duplicates are added to the index.
+        
+        Args:
+            seen_pages: Fingerprint index of the report's pages, or None when disabled
+            content: The scraped page
+            
+        Returns:
+            URL of the page this one duplicates, or None
+        """
+        if seen_pages is None or not content.success or not content.main_text:
+            return None
+        
+        # Pages cached before fingerprinting was enabled have none stored
+        fingerprint = content.simhash if content.simhash is not None else simhash(content.main_text)
+        
+        original = seen_pages.find(fingerprint)
+        if original is None:
+            seen_pages.add(fingerprint, content.url)
+        return original
+    
+    def _is_strong_source(self, analysis: Analysis) -> bool:
+        """
+        Check whether an analyzed source counts towards the early-stop target.
+        
+        Args:
+            analysis: Analysis results of the source
+            
+        Returns:
+            True if the source is both relevant and reliable enough
+        """
+        return (
+            analysis.success
+            and analysis.relevance_score >= Config.EARLY_STOP_MIN_RELEVANCE
+            and analysis.reliability_score >= Config.EARLY_STOP_MIN_RELIABILITY
+        )
+    
+    def _summarize_source(self, index: int, content: ScrapedPage, analysis: Analysis) -> Dict[str, Any]:
+        """
+        Build the compact progress payload for one analyzed source.
+        
+        Args:
+            index: Position of the source in the search results
+            content: Scraped content of the source
+            analysis: Analysis results of the source
+            
+        Returns:
+            Dictionary describing the source without its full page content
+        """
+        return {
+            'index': index,
+            'url': content.url,
+            'title': content.title,
+            'success': content.success,
+            'error': content.error,
+            'relevance': analysis.relevance_score,
+            'reliability': analysis.reliability_score,
+            'sentiment': analysis.sentiment,
+            'key_points': analysis.key_points
+        }
+    
+    def _summarize_duplicate(self, index: int, content: ScrapedPage, original: str) -> Dict[str, Any]:
+        """
+        Build the progress payload for a source skipped as a near-duplicate.
+        
+        Args:
+            index: Position of the source in the search results
+            content: Scraped content of the source
+            original: URL of the source it duplicates
+            
+        Returns:
+            Dictionary with the same keys as _summarize_source, plus duplicate_of
+        """
+        return {
+            'index': index,
+            'url': content.url,
+            'title': content.title,
+            'success': content.success,
+            'error': content.error,
+            'relevance': None,
+            'reliability': None,
+            'sentiment': None,
+            'key_points': [],
+            'duplicate_of': original
+        }
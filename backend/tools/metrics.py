@@ -0,0 +1,282 @@
+import json
+import sys
+import os
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Tuple
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import Config
+
+# Latency histogram buckets, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Metric name -> (type, help text)
+METRICS = {
+    'serpapi_request_seconds': ('histogram', 'Latency of SerpAPI requests'),
+    'page_fetch_seconds': ('histogram', 'Page fetch latency by phase (ttfb includes DNS and connect, body, total)'),
+    'html_parse_seconds': ('histogram', 'Time spent parsing and extracting a page'),
+    'analysis_seconds': ('histogram', 'Time spent analyzing a page'),
+    'synthesis_seconds': ('histogram', 'Time spent synthesizing a report'),
+    'research_report_seconds': ('histogram', 'End-to-end research report latency'),
+    'cache_requests_total': ('counter', 'Cache lookups by cache and result'),
+    'http_responses_total': ('counter', 'HTTP responses by target and status code'),
+    'request_timeouts_total': ('counter', 'Timed out HTTP requests by target'),
+    'request_errors_total': ('counter', 'Failed HTTP requests (other than timeouts) by target'),
+    'search_mock_fallbacks_total': ('counter', 'Searches answered with mock results, by reason'),
+    'coalesced_requests_total': ('counter', 'Calls that waited for an identical call already in flight, by scope'),
+    'host_skips_total': ('counter', 'Page fetches skipped by reason (circuit_open, negative_cache)'),
+    'circuit_opens_total': ('counter', 'Times a host circuit breaker opened'),
+    'hedged_requests_total': ('counter', 'Hedged page fetches by the request that answered first (primary, hedge)'),
+    'retries_total': ('counter', 'Retried page fetches by reason (status code or connection_error)'),
+    'extra_requests_denied_total': ('counter', 'Hedges and retries not sent because the extra-request budget was spent, by kind'),
+    'duplicates_total': ('counter', 'Repeated URLs, near-duplicate pages and key points collapsed, by kind'),
+}
+
+class MetricsRegistry:
+    """
+    In-process store of counters and latency histograms.
+    
+    Every process periodically writes its values to a JSON file in
+    Config.METRICS_DIR; render() sums the files of all processes, so any
+    gunicorn worker can serve the metrics of the whole server.
+    
+    Files of exited processes are kept so that counters never go down. As
+    in Prometheus multiprocess mode, the directory must be wiped when the
+    server starts (clear() does this; call it from gunicorn's on_starting
+    hook), not while workers are running.
+    """
+    
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._values = {}
+        self._pid = os.getpid()
+        self._filename = _process_filename()
+        self._last_flush = 0.0
+        
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    
+    def increment(self, name: str, labels: Optional[Dict[str, Any]] = None, amount: float = 1) -> None:
+        """
+        Increase a counter.
+        
+        Args:
+            name: Metric name, as declared in METRICS
+            labels: Optional label values
+            amount: Amount to add
+        """
+        key = _series_key(name, labels)
+        with self._lock:
+            self._reset_after_fork()
+            self._values[key] = self._values.get(key, 0) + amount
+        self._maybe_flush()
+    
+    def observe(self, name: str, seconds: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Record one latency sample in a histogram.
+        
+        Args:
+            name: Metric name, as declared in METRICS
+            seconds: Observed duration
+            labels: Optional label values
+        """
+        key = _series_key(name, labels)
+        with self._lock:
+            self._reset_after_fork()
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = {'buckets': [0] * len(BUCKETS), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    series['buckets'][i] += 1
+            series['sum'] += seconds
+            series['count'] += 1
+        self._maybe_flush()
+    
+    def _reset_after_fork(self) -> None:
+        """Drop values inherited from a parent process. Caller must hold the lock."""
+        pid = os.getpid()
+        if pid != self._pid:
+            self._values = {}
+            self._pid = pid
+            self._filename = _process_filename()
+            self._last_flush = 0.0
+    
+    @contextmanager
+    def timer(self, name: str, labels: Optional[Dict[str, Any]] = None):
+        """
+        Time the enclosed block into a histogram.
+        
+        Args:
+            name: Metric name, as declared in METRICS
+            labels: Optional label values
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, labels)
+    
+    def _maybe_flush(self) -> None:
+        """Write this process's values to disk if the flush interval has passed."""
+        if not self.directory:
+            return
+        
+        # Check and claim the interval together so only one thread flushes
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_flush < Config.METRICS_FLUSH_INTERVAL:
+                return
+            self._last_flush = now
+        
+        # Recording a sample must never fail because of the metrics file
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Error writing metrics: {e}")
+    
+    def flush(self) -> None:
+        """Write this process's values to its file in the metrics directory."""
+        if not self.directory:
+            return
+        
+        with self._flush_lock:
+            with self._lock:
+                self._reset_after_fork()
+                self._last_flush = time.monotonic()
+                snapshot = json.dumps(self._values)
+                filename = self._filename
+            
+            fd, temp_path = tempfile.mkstemp(prefix=filename + '.', suffix='.tmp', dir=self.directory)
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    f.write(snapshot)
+                os.replace(temp_path, os.path.join(self.directory, filename))
+            except BaseException:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+                raise
+    
+    def clear(self) -> None:
+        """
+        Delete the metrics files of all processes and this process's values.
+        
+        Call once when the server starts, before any worker records samples.
+        """
+        with self._lock:
+            self._values = {}
+        
+        if not self.directory:
+            return
+        
+        for filename in os.listdir(self.directory):
+            if filename.startswith('metrics-'):
+                try:
+                    os.remove(os.path.join(self.directory, filename))
+                except OSError:
+                    pass
+    
+    def _collect(self) -> Dict[str, Any]:
+        """
+        Sum the values of every process that has written a metrics file.
+        
+        Returns:
+            Dictionary mapping series keys to counter values or histograms
+        """
+        if not self.directory:
+            with self._lock:
+                return json.loads(json.dumps(self._values))
+        
+        try:
+            self.flush()
+        except OSError as e:
+            print(f"Error writing metrics: {e}")
+        totals = {}
+        
+        for filename in os.listdir(self.directory):
+            if not (filename.startswith('metrics-') and filename.endswith('.json')):
+                continue
+            try:
+                with open(os.path.join(self.directory, filename)) as f:
+                    values = json.load(f)
+            except (OSError, ValueError):
+                continue
+            
+            for key, value in values.items():
+                if isinstance(value, dict):
+                    total = totals.setdefault(key, {'buckets': [0] * len(BUCKETS), 'sum': 0.0, 'count': 0})
+                    total['buckets'] = [a + b for a, b in zip(total['buckets'], value['buckets'])]
+                    total['sum'] += value['sum']
+                    total['count'] += value['count']
+                else:
+                    totals[key] = totals.get(key, 0) + value
+        
+        return totals
+    
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+        
+        Returns:
+            The metrics page
+        """
+        series = {}
+        for key, value in self._collect().items():
+            name, labels = _parse_series_key(key)
+            series.setdefault(name, []).append((labels, value))
+        
+        lines = []
+        for name in sorted(series):
+            metric_type, help_text = METRICS.get(name, ('untyped', ''))
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            
+            for labels, value in sorted(series[name], key=lambda item: item[0]):
+                if isinstance(value, dict):
+                    for bound, count in zip(BUCKETS, value['buckets']):
+                        lines.append(f'{name}_bucket{_format_labels(labels + (("le", str(bound)),))} {count}')
+                    lines.append(f'{name}_bucket{_format_labels(labels + (("le", "+Inf"),))} {value["count"]}')
+                    lines.append(f'{name}_sum{_format_labels(labels)} {value["sum"]}')
+                    lines.append(f'{name}_count{_format_labels(labels)} {value["count"]}')
+                else:
+                    lines.append(f'{name}{_format_labels(labels)} {value}')
+        
+        return '\n'.join(lines) + '\n'
+
+def _process_filename() -> str:
+    """Name of the metrics file of the current process, unique even if its pid is reused."""
+    return f'metrics-{os.getpid()}-{uuid.uuid4().hex[:8]}.json'
+
+def _series_key(name: str, labels: Optional[Dict[str, Any]]) -> str:
+    """Build the storage key of a metric series."""
+    if not labels:
+        return name
+    return name + '|' + json.dumps(sorted((k, str(v)) for k, v in labels.items()))
+
+def _parse_series_key(key: str) -> Tuple[str, tuple]:
+    """Split a storage key into the metric name and its label pairs."""
+    name, _, labels = key.partition('|')
+    return name, tuple(tuple(pair) for pair in json.loads(labels)) if labels else ()
+
+def _format_labels(labels: tuple) -> str:
+    """Format label pairs as a Prometheus label set."""
+    if not labels:
+        return ''
+    pairs = (f'{k}="{_escape_label(v)}"' for k, v in labels)
+    return '{' + ','.join(pairs) + '}'
+
+def _escape_label(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+# Process-wide registry used by all tools
+metrics = MetricsRegistry(Config.METRICS_DIR)
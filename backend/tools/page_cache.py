@@ -0,0 +1,240 @@
+import json
+import sqlite3
+import sys
+import os
+import threading
+import time
+import zlib
+from typing import Dict, Any, Optional
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import Config
+from tools.sqlite_store import SQLiteStore
+from tools.metrics import metrics
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    extractor TEXT,
+    extracted BLOB,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access);
+"""
+
+# Puts between exact size checks of the whole table
+_SIZE_CHECK_INTERVAL = 100
+
+def extractor_version() -> str:
+    """
+    Identify the code and settings that produce extracted page data.
+    
+    Returns:
+        Version string stored with each page; entries with another version are misses
+    """
+    return f'{Config.PAGE_EXTRACTOR_VERSION}:{Config.HTML_PARSER}:{Config.MAX_CONTENT_LENGTH}'
+
+class PageCache:
+    """
+    Persistent, size-bounded LRU cache of scraped pages.
+    
+    Stores the already extracted content together with the ETag and
+    Last-Modified validators of the page, so fresh hits and 304
+    revalidations skip both the download and the HTML parsing. The raw
+    body is not kept. Instead each entry records the extractor version it
+    was produced by, and an entry from another version is a miss, so a
+    changed extractor never serves old extraction (not even after a 304).
+    """
+    
+    def __init__(self, path: str = None, max_bytes: int = None, ttl: int = None):
+        self.path = path or Config.PAGE_CACHE_PATH
+        self.max_bytes = max_bytes or Config.PAGE_CACHE_MAX_BYTES
+        self.ttl = ttl if ttl is not None else Config.PAGE_CACHE_TTL
+        self.store = SQLiteStore(self.path, _SCHEMA)
+        self._add_extractor_column()
+        
+        # Estimated total size, so that not every put has to sum the table
+        self._size_lock = threading.Lock()
+        self._estimated_size = None
+        self._puts_since_check = 0
+        
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'stale': 0,
+            'misses': 0,
+            'revalidated': 0,
+            'stores': 0,
+            'evictions': 0
+        }
+    
+    def _add_extractor_column(self) -> None:
+        """Add the extractor column to cache files created before it existed."""
+        conn = self.store.connection()
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(pages)')}
+        if 'extractor' not in columns:
+            try:
+                conn.execute('ALTER TABLE pages ADD COLUMN extractor TEXT')
+            except sqlite3.OperationalError:
+                # Another process added it first
+                pass
+    
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[name] += amount
+        if name in ('hits', 'stale', 'misses', 'revalidated'):
+            metrics.increment('cache_requests_total', {'cache': 'pages', 'result': name})
+    
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached page.
+        
+        Args:
+            url: The page URL
+            
+        Returns:
+            Dictionary with etag, last_modified, extracted, fetched_at and a
+            `fresh` flag, or None if the page is not cached (or was cached
+            by another extractor version)
+        """
+        conn = self.store.connection()
+        row = conn.execute(
+            'SELECT etag, last_modified, extractor, extracted, fetched_at FROM pages WHERE url = ?',
+            (url,)
+        ).fetchone()
+        
+        # Without the body, extraction by other code can only be redone by downloading again
+        if row is None or row[2] != extractor_version():
+            self._count('misses')
+            return None
+        
+        now = time.time()
+        conn.execute('UPDATE pages SET last_access = ? WHERE url = ?', (now, url))
+        
+        etag, last_modified, _, extracted, fetched_at = row
+        fresh = now - fetched_at < self.ttl
+        self._count('hits' if fresh else 'stale')
+        
+        return {
+            'etag': etag,
+            'last_modified': last_modified,
+            'extracted': json.loads(zlib.decompress(extracted)),
+            'fetched_at': fetched_at,
+            'fresh': fresh
+        }
+    
+    def conditional_headers(self, entry: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Build revalidation headers for a stale cache entry.
+        
+        Args:
+            entry: Entry returned by get()
+            
+        Returns:
+            Dictionary of If-None-Match / If-Modified-Since headers
+        """
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def mark_revalidated(self, url: str) -> None:
+        """
+        Record a 304 Not Modified response, making the entry fresh again.
+        
+        Args:
+            url: The page URL
+        """
+        now = time.time()
+        self.store.connection().execute(
+            'UPDATE pages SET fetched_at = ?, last_access = ? WHERE url = ?',
+            (now, now, url)
+        )
+        self._count('revalidated')
+    
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], extracted: Dict[str, Any]) -> None:
+        """
+        Store a freshly downloaded page and evict old entries if needed.
+        
+        Args:
+            url: The page URL
+            etag: ETag response header, if any
+            last_modified: Last-Modified response header, if any
+            extracted: The extracted content/metadata/structured_data
+        """
+        extracted_blob = zlib.compress(json.dumps(extracted).encode('utf-8'))
+        size = len(extracted_blob)
+        now = time.time()
+        
+        conn = self.store.connection()
+        conn.execute(
+            'INSERT OR REPLACE INTO pages '
+            '(url, etag, last_modified, extractor, extracted, size, fetched_at, last_access) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (url, etag, last_modified, extractor_version(), extracted_blob, size, now, now)
+        )
+        self._count('stores')
+        
+        # The table is only summed when this process's estimate passes the
+        # limit, or every _SIZE_CHECK_INTERVAL puts to catch other processes' growth
+        with self._size_lock:
+            self._puts_since_check += 1
+            if self._estimated_size is not None:
+                self._estimated_size += size
+            check = (
+                self._estimated_size is None
+                or self._estimated_size > self.max_bytes
+                or self._puts_since_check >= _SIZE_CHECK_INTERVAL
+            )
+            if check:
+                self._puts_since_check = 0
+        
+        if check:
+            total = self._evict(conn)
+            with self._size_lock:
+                self._estimated_size = total
+    
+    def _evict(self, conn) -> int:
+        """
+        Delete least recently used entries until the cache fits in max_bytes.
+        
+        Args:
+            conn: Open database connection
+            
+        Returns:
+            Total size of the remaining entries
+        """
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+        
+        while total > self.max_bytes:
+            row = conn.execute(
+                'SELECT url, size FROM pages ORDER BY last_access LIMIT 1'
+            ).fetchone()
+            if row is None:
+                break
+            conn.execute('DELETE FROM pages WHERE url = ?', (row[0],))
+            total -= row[1]
+            self._count('evictions')
+        
+        return total
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters for this process.
+        
+        Returns:
+            Dictionary of counters
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        
+        lookups = stats['hits'] + stats['stale'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['revalidated']) / lookups if lookups else 0
+        return stats
@@ -0,0 +1,203 @@
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import Dict, Any, List, Optional, Tuple
+
+# Compact record types passed between the pipeline stages. They are converted
+# to the JSON shapes of the API (and of the page cache) only at those
+# boundaries, via to_dict() / from_dict().
+
+_PARAGRAPH_SEPARATOR = '\n\n'
+_TRUNCATION_MARKER = '...'
+
+@dataclass(slots=True)
+class SearchResult:
+    """A single organic search result."""
+    
+    title: str
+    url: str
+    snippet: str
+    mock: bool = False  # Made up because SerpAPI failed or returned too few results
+    
+    def to_dict(self) -> Dict[str, str]:
+        return {
+            'title': self.title,
+            'url': self.url,
+            'snippet': self.snippet
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SearchResult':
+        return cls(data.get('title', ''), data.get('url', ''), data.get('snippet', ''))
+
+@dataclass(slots=True)
+class PageContent:
+    """
+    Text, headings, links and images extracted from a page.
+    
+    The paragraphs are stored once, joined into `text` with their end
+    offsets. The main text is usually that same string (possibly cut at
+    Config.MAX_CONTENT_LENGTH), so it is only stored separately when it
+    comes from somewhere else, such as a longer <article> element.
+    """
+    
+    text: str = ''
+    paragraph_ends: Tuple[int, ...] = ()
+    main_text_override: Optional[str] = None
+    main_text_cut: Optional[int] = None
+    headings: Tuple[Tuple[int, str], ...] = ()
+    links: Tuple[Tuple[str, str], ...] = ()
+    images: Tuple[Tuple[str, str], ...] = ()
+    
+    @classmethod
+    def build(cls, paragraphs: List[str], main_text: str, headings=(), links=(), images=()) -> 'PageContent':
+        """
+        Build the compact form of extracted page content.
+        
+        Args:
+            paragraphs: Paragraph texts in document order
+            main_text: The main text of the page
+            headings: (level, text) pairs
+            links: (text, href) pairs
+            images: (src, alt) pairs
+        
+        Returns:
+            A PageContent sharing one string for paragraphs and main text where possible
+        """
+        text = _PARAGRAPH_SEPARATOR.join(paragraphs)
+        separator = len(_PARAGRAPH_SEPARATOR)
+        ends = tuple(end + i * separator for i, end in enumerate(accumulate(len(p) for p in paragraphs)))
+        
+        override = None
+        cut = None
+        if main_text != text:
+            prefix = main_text[:-len(_TRUNCATION_MARKER)]
+            if main_text.endswith(_TRUNCATION_MARKER) and text.startswith(prefix):
+                cut = len(prefix)
+            else:
+                override = main_text
+        
+        return cls(text, ends, override, cut, tuple(headings), tuple(links), tuple(images))
+    
+    @property
+    def main_text(self) -> str:
+        if self.main_text_override is not None:
+            return self.main_text_override
+        if self.main_text_cut is not None:
+            return self.text[:self.main_text_cut] + _TRUNCATION_MARKER
+        return self.text
+    
+    @property
+    def paragraphs(self) -> List[str]:
+        separator = len(_PARAGRAPH_SEPARATOR)
+        starts = [0] + [end + separator for end in self.paragraph_ends[:-1]]
+        return [self.text[start:end] for start, end in zip(starts, self.paragraph_ends)]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'main_text': self.main_text,
+            'headings': [{'level': level, 'text': text} for level, text in self.headings],
+            'paragraphs': self.paragraphs,
+            'links': [{'text': text, 'href': href} for text, href in self.links],
+            'images': [{'src': src, 'alt': alt} for src, alt in self.images]
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PageContent':
+        return cls.build(
+            data.get('paragraphs', []),
+            data.get('main_text', ''),
+            [(h['level'], h['text']) for h in data.get('headings', [])],
+            [(link['text'], link['href']) for link in data.get('links', [])],
+            [(image['src'], image['alt']) for image in data.get('images', [])]
+        )
+
+@dataclass(slots=True)
+class ScrapedPage:
+    """The outcome of scraping one URL."""
+    
+    url: str
+    success: bool = True
+    error: Optional[str] = None
+    content: Optional[PageContent] = None
+    metadata: Optional[Dict[str, Any]] = None
+    structured_data: List[Dict[str, Any]] = field(default_factory=list)
+    from_cache: bool = False
+    simhash: Optional[int] = None  # Fingerprint of the main text, for near-duplicate detection
+    transient: bool = False  # Failed for a reason that may soon go away (timeout, server error, open circuit)
+    
+    @classmethod
+    def failure(cls, url: str, error: str, transient: bool = False) -> 'ScrapedPage':
+        return cls(url, success=False, error=error, transient=transient)
+    
+    @property
+    def main_text(self) -> str:
+        return self.content.main_text if self.content else ''
+    
+    @property
+    def title(self) -> str:
+        return (self.metadata or {}).get('title') or 'Untitled'
+    
+    def without_content(self) -> 'ScrapedPage':
+        """Return a copy without the page text, links and images (kept after analysis)."""
+        return ScrapedPage(self.url, self.success, self.error, None, self.metadata, [], self.from_cache, self.simhash, self.transient)
+    
+    def extracted(self) -> Dict[str, Any]:
+        """Return the extracted data in the format stored by the page cache."""
+        return {
+            'content': self.content.to_dict() if self.content else None,
+            'metadata': self.metadata,
+            'structured_data': self.structured_data,
+            'simhash': self.simhash
+        }
+    
+    @classmethod
+    def from_extracted(cls, url: str, extracted: Dict[str, Any], from_cache: bool = False) -> 'ScrapedPage':
+        content = extracted.get('content')
+        return cls(
+            url,
+            content=PageContent.from_dict(content) if content else None,
+            metadata=extracted.get('metadata'),
+            structured_data=extracted.get('structured_data', []),
+            from_cache=from_cache,
+            simhash=extracted.get('simhash')
+        )
+
+@dataclass(slots=True)
+class Analysis:
+    """Analysis results for one scraped page."""
+    
+    success: bool
+    error: Optional[str] = None
+    relevance_score: float = 0
+    reliability_score: float = 0
+    key_points: List[str] = field(default_factory=list)
+    sentiment: Optional[str] = None
+    entities: List[Dict[str, str]] = field(default_factory=list)
+    length: int = 0  # Number of word tokens, for batch scoring
+    term_counts: Optional[Dict[str, int]] = None  # Occurrences of each query term
+    
+    @classmethod
+    def failure(cls, error: str) -> 'Analysis':
+        return cls(False, error)
+
+@dataclass(slots=True)
+class AnalyzedPage:
+    """A scraped page together with its analysis."""
+    
+    page: ScrapedPage
+    analysis: Analysis
+
+@dataclass(slots=True)
+class KeyPoint:
+    """A key point of the report and the source it was taken from."""
+    
+    text: str
+    source: str
+    url: str
+    
+    def to_dict(self) -> Dict[str, str]:
+        return {
+            'text': self.text,
+            'source': self.source,
+            'url': self.url
+        }
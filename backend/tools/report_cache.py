@@ -0,0 +1,247 @@
+import hashlib
+import json
+import sys
+import os
+import threading
+import time
+import uuid
+import zlib
+from typing import Dict, Any, Optional
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import Config
+from tools.sqlite_store import SQLiteStore
+from tools.search_cache import normalize_query
+from tools.metrics import metrics
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    key TEXT PRIMARY KEY,
+    result BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    refresh_until REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS reports_last_access ON reports (last_access);
+CREATE TABLE IF NOT EXISTS held_reports (
+    id TEXT PRIMARY KEY,
+    result BLOB NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+# Settings that change the content of a report; changing any of them
+# (or bumping REPORT_CACHE_VERSION) invalidates all cached reports
+_VERSIONED_SETTINGS = (
+    'REPORT_CACHE_VERSION', 'PAGE_EXTRACTOR_VERSION', 'SEARCH_RESULT_COUNT', 'MAX_CONTENT_LENGTH', 'RELEVANCE_SCORING',
+    'BM25_K1', 'BM25_B', 'EARLY_STOP_SOURCES', 'EARLY_STOP_MIN_RELEVANCE', 'EARLY_STOP_MIN_RELIABILITY',
+    'DEDUP_ENABLED', 'URL_CANONICALIZATION_ENABLED', 'SIMHASH_PAGE_DISTANCE', 'SIMHASH_SENTENCE_DISTANCE', 'SIMHASH_SENTENCE_SHINGLE'
+)
+
+def config_version() -> str:
+    """
+    Fingerprint the settings that affect report content.
+    
+    Returns:
+        Short hash of the versioned settings
+    """
+    values = [getattr(Config, name) for name in _VERSIONED_SETTINGS]
+    return hashlib.sha1(json.dumps(values).encode('utf-8')).hexdigest()[:12]
+
+class ReportCache:
+    """
+    Persistent, size-bounded LRU cache of complete research reports.
+    
+    Reports are fresh for `ttl` seconds and may then be served stale for a
+    further `grace` seconds while one caller refreshes them in the background.
+    The cache lives in an SQLite file, so entries, refresh claims and purges
+    are shared by all worker processes.
+    """
+    
+    def __init__(self, path: str = None, max_bytes: int = None, ttl: int = None, grace: int = None):
+        self.path = path or Config.REPORT_CACHE_PATH
+        self.max_bytes = max_bytes or Config.REPORT_CACHE_MAX_BYTES
+        self.ttl = ttl if ttl is not None else Config.REPORT_CACHE_TTL
+        self.grace = grace if grace is not None else Config.REPORT_CACHE_GRACE
+        self.store = SQLiteStore(self.path, _SCHEMA)
+        
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'stale': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'purged': 0}
+    
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[name] += amount
+        if name in ('hits', 'stale', 'misses'):
+            metrics.increment('cache_requests_total', {'cache': 'reports', 'result': name})
+    
+    def _key(self, query: str) -> str:
+        return json.dumps([normalize_query(query), config_version()])
+    
+    def get(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached report.
+        
+        Args:
+            query: The research query
+        
+        Returns:
+            Dictionary with the cached `result`, its `age` in seconds and a
+            `fresh` flag, or None if there is no report within ttl + grace
+        """
+        key = self._key(query)
+        conn = self.store.connection()
+        row = conn.execute('SELECT result, created_at FROM reports WHERE key = ?', (key,)).fetchone()
+        
+        now = time.time()
+        age = now - row[1] if row else None
+        
+        if row is None or age >= self.ttl + self.grace:
+            self._count('misses')
+            return None
+        
+        conn.execute('UPDATE reports SET last_access = ? WHERE key = ?', (now, key))
+        
+        fresh = age < self.ttl
+        self._count('hits' if fresh else 'stale')
+        
+        return {
+            'result': json.loads(zlib.decompress(row[0])),
+            'age': age,
+            'fresh': fresh
+        }
+    
+    def claim_refresh(self, query: str, lease: float) -> bool:
+        """
+        Claim the background refresh of a stale report.
+        
+        Only one caller across all processes wins the claim until the lease
+        runs out, so a popular stale report is recomputed once.
+        
+        Args:
+            query: The research query
+            lease: Seconds the claim is held
+        
+        Returns:
+            True if the caller should refresh the report
+        """
+        now = time.time()
+        cursor = self.store.connection().execute(
+            'UPDATE reports SET refresh_until = ? WHERE key = ? AND refresh_until < ?',
+            (now + lease, self._key(query), now)
+        )
+        return cursor.rowcount == 1
+    
+    def put(self, query: str, result: Dict[str, Any]) -> None:
+        """
+        Store a report and evict old entries if needed.
+        
+        Args:
+            query: The research query
+            result: The result of generate_research_report
+        """
+        blob = zlib.compress(json.dumps(result).encode('utf-8'))
+        now = time.time()
+        
+        conn = self.store.connection()
+        conn.execute(
+            'INSERT OR REPLACE INTO reports (key, result, size, created_at, last_access, refresh_until) '
+            'VALUES (?, ?, ?, ?, ?, 0)',
+            (self._key(query), blob, len(blob), now, now)
+        )
+        self._count('stores')
+        self._evict(conn)
+    
+    def hold(self, result: Dict[str, Any]) -> str:
+        """
+        Keep a full research result retrievable for Config.REPORT_HOLD_TTL seconds.
+        
+        Used when a response only carries some report fields, so that the
+        client can fetch the rest without running the research again, even
+        for reports that are not cached (partial ones, for example).
+        
+        Args:
+            result: The full research result
+        
+        Returns:
+            Id to pass to held()
+        """
+        report_id = uuid.uuid4().hex
+        blob = zlib.compress(json.dumps(result).encode('utf-8'))
+        now = time.time()
+        
+        conn = self.store.connection()
+        conn.execute('DELETE FROM held_reports WHERE expires_at <= ?', (now,))
+        conn.execute(
+            'INSERT INTO held_reports (id, result, expires_at) VALUES (?, ?, ?)',
+            (report_id, blob, now + Config.REPORT_HOLD_TTL)
+        )
+        return report_id
+    
+    def held(self, report_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a result stored with hold(), or None if it is unknown or expired.
+        
+        Args:
+            report_id: Id returned by hold()
+        """
+        row = self.store.connection().execute(
+            'SELECT result FROM held_reports WHERE id = ? AND expires_at > ?', (report_id, time.time())
+        ).fetchone()
+        return json.loads(zlib.decompress(row[0])) if row else None
+    
+    def purge(self, query: Optional[str] = None) -> int:
+        """
+        Delete cached reports.
+        
+        Args:
+            query: Only delete the report for this query (all reports if None)
+        
+        Returns:
+            Number of deleted reports
+        """
+        conn = self.store.connection()
+        
+        if query is None:
+            cursor = conn.execute('DELETE FROM reports')
+        else:
+            # Match the query under any config version
+            prefix = json.dumps([normalize_query(query)])[:-1] + ','
+            cursor = conn.execute('DELETE FROM reports WHERE substr(key, 1, ?) = ?', (len(prefix), prefix))
+        
+        self._count('purged', cursor.rowcount)
+        return cursor.rowcount
+    
+    def _evict(self, conn) -> None:
+        """
+        Delete least recently used entries until the cache fits in max_bytes.
+        
+        Args:
+            conn: Open database connection
+        """
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM reports').fetchone()[0]
+        
+        while total > self.max_bytes:
+            row = conn.execute(
+                'SELECT key, size FROM reports ORDER BY last_access LIMIT 1'
+            ).fetchone()
+            if row is None:
+                break
+            conn.execute('DELETE FROM reports WHERE key = ?', (row[0],))
+            total -= row[1]
+            self._count('evictions')
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters for this process.
+        
+        Returns:
+            Dictionary of counters
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        
+        lookups = stats['hits'] + stats['stale'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['stale']) / lookups if lookups else 0
+        return stats
@@ -0,0 +1,152 @@
+import json
+import sys
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import Config
+from tools.sqlite_store import SQLiteStore
+from tools.metrics import metrics
+from tools.records import SearchResult
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS searches (
+    key TEXT PRIMARY KEY,
+    num_results INTEGER NOT NULL,
+    results TEXT NOT NULL,
+    stored_at REAL NOT NULL
+);
+"""
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query so that trivially different spellings share cache entries.
+    
+    Args:
+        query: The raw query string
+        
+    Returns:
+        The query with case folded and whitespace collapsed
+    """
+    return ' '.join(query.casefold().split())
+
+class SearchCache:
+    """
+    TTL + LRU cache of search results, optionally backed by an SQLite file
+    shared by all worker processes.
+    
+    Entries are keyed on the normalized query, country and language. An
+    entry stored for a larger `num_results` also answers smaller requests.
+    """
+    
+    def __init__(self, ttl: int = None, max_entries: int = None, shared_path: str = None):
+        self.ttl = ttl if ttl is not None else Config.SEARCH_CACHE_TTL
+        self.max_entries = max_entries or Config.SEARCH_CACHE_MAX_ENTRIES
+        shared_path = shared_path or Config.SEARCH_CACHE_SHARED_PATH
+        self.shared_store = SQLiteStore(shared_path, _SCHEMA) if shared_path else None
+        
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._stats = {'hits': 0, 'shared_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+    
+    def _key(self, query: str, gl: str, hl: str) -> str:
+        return json.dumps([normalize_query(query), gl, hl])
+    
+    def get(self, query: str, num_results: int, gl: str, hl: str) -> Optional[List[SearchResult]]:
+        """
+        Look up cached results.
+        
+        Args:
+            query: The search query string
+            num_results: Number of results requested
+            gl: Country code of the search
+            hl: Language code of the search
+            
+        Returns:
+            Up to `num_results` cached results, or None on a miss
+        """
+        key = self._key(query, gl, hl)
+        now = time.time()
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[0] < self.ttl and entry[1] >= num_results:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                metrics.increment('cache_requests_total', {'cache': 'searches', 'result': 'hit'})
+                return entry[2][:num_results]
+        
+        if self.shared_store:
+            row = self.shared_store.connection().execute(
+                'SELECT stored_at, num_results, results FROM searches WHERE key = ?', (key,)
+            ).fetchone()
+            if row and now - row[0] < self.ttl and row[1] >= num_results:
+                results = [SearchResult.from_dict(result) for result in json.loads(row[2])]
+                with self._lock:
+                    self._stats['shared_hits'] += 1
+                    self._remember(key, (row[0], row[1], results))
+                metrics.increment('cache_requests_total', {'cache': 'searches', 'result': 'shared_hit'})
+                return results[:num_results]
+        
+        with self._lock:
+            self._stats['misses'] += 1
+        metrics.increment('cache_requests_total', {'cache': 'searches', 'result': 'miss'})
+        return None
+    
+    def put(self, query: str, num_results: int, gl: str, hl: str, results: List[SearchResult]) -> None:
+        """
+        Store the results of a search.
+        
+        Args:
+            query: The search query string
+            num_results: Number of results that were requested
+            gl: Country code of the search
+            hl: Language code of the search
+            results: The results returned by the search engine
+        """
+        key = self._key(query, gl, hl)
+        now = time.time()
+        
+        with self._lock:
+            existing = self._entries.get(key)
+            # Keep a fresh entry that can already answer larger requests
+            if existing and now - existing[0] < self.ttl and existing[1] > num_results:
+                return
+            self._remember(key, (now, num_results, results))
+            self._stats['stores'] += 1
+        
+        if self.shared_store:
+            self.shared_store.connection().execute(
+                'INSERT OR REPLACE INTO searches (key, num_results, results, stored_at) VALUES (?, ?, ?, ?)',
+                (key, num_results, json.dumps([result.to_dict() for result in results]), now)
+            )
+    
+    def _remember(self, key: str, entry: tuple) -> None:
+        """
+        Insert an entry into the in-memory LRU. Caller must hold the lock.
+        
+        Args:
+            key: Cache key
+            entry: Tuple of (stored_at, num_results, results)
+        """
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters for this process.
+        
+        Returns:
+            Dictionary of counters
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        return stats
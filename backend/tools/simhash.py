@@ -0,0 +1,130 @@
+import hashlib
+import re
+from typing import Dict, Any, List, Optional, Set
+
+# Fingerprint width in bits
+FINGERPRINT_BITS = 64
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+def _feature_hash(feature: str) -> int:
+    # A stable hash: fingerprints are stored in the page cache and compared across processes
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    Compute the 64-bit SimHash fingerprint of a text.
+    
+    Texts that share most of their word shingles get fingerprints that
+    differ in only a few bits, so near-duplicates can be found by Hamming
+    distance.
+    
+    Args:
+        text: The text to fingerprint
+        shingle_size: Number of consecutive words per feature
+    
+    Returns:
+        The fingerprint as an unsigned integer
+    """
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < shingle_size:
+        features = [' '.join(words)] if words else []
+    else:
+        features = [' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+    
+    # Each distinct feature votes once per bit; repeated boilerplate does not dominate.
+    # Bits are counted column-wise over the binary strings, which is much faster
+    # than shifting every hash 64 times in Python.
+    hashes = [format(_feature_hash(feature), '064b') for feature in set(features)]
+    
+    fingerprint = 0
+    for position, column in enumerate(zip(*hashes)):
+        if column.count('1') * 2 > len(hashes):
+            fingerprint |= 1 << (FINGERPRINT_BITS - 1 - position)
+    return fingerprint
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return (a ^ b).bit_count()
+
+class SimHashIndex:
+    """
+    Index of fingerprints for near-duplicate lookups.
+    
+    Fingerprints are split into max_distance + 1 bands. Two fingerprints
+    within max_distance bits of each other agree exactly on at least one
+    band, so a lookup only compares the candidates sharing a band instead
+    of every stored fingerprint. This keeps lookups fast for many thousands
+    of documents.
+    """
+    
+    def __init__(self, max_distance: int = 3):
+        """
+        Initialize the index.
+        
+        Args:
+            max_distance: Largest Hamming distance still counted as a duplicate
+        """
+        self.max_distance = max_distance
+        bands = min(max_distance + 1, FINGERPRINT_BITS)
+        
+        # Split the 64 bits as evenly as possible: every band gets the floor or
+        # the ceiling of 64 / bands bits, and none is empty
+        self._band_masks = []
+        shift = 0
+        for i in range(bands):
+            width = FINGERPRINT_BITS // bands + (1 if i < FINGERPRINT_BITS % bands else 0)
+            self._band_masks.append((shift, (1 << width) - 1))
+            shift += width
+        
+        self._tables: List[Dict[int, Set[int]]] = [{} for _ in range(bands)]
+        self._items: Dict[int, Any] = {}
+    
+    def _band_keys(self, fingerprint: int) -> List[int]:
+        return [fingerprint >> shift & mask for shift, mask in self._band_masks]
+    
+    def _candidates(self, fingerprint: int) -> Set[int]:
+        """Stored fingerprints that share at least one band with the given one."""
+        candidates = set()
+        for table, key in zip(self._tables, self._band_keys(fingerprint)):
+            candidates.update(table.get(key, ()))
+        return candidates
+    
+    def find(self, fingerprint: int) -> Optional[Any]:
+        """
+        Look up a stored near-duplicate.
+        
+        Args:
+            fingerprint: The fingerprint to look up
+        
+        Returns:
+            The item stored with the closest matching fingerprint, or None
+        """
+        if fingerprint in self._items:
+            return self._items[fingerprint]
+        
+        best = None
+        best_distance = self.max_distance + 1
+        for candidate in self._candidates(fingerprint):
+            distance = hamming_distance(fingerprint, candidate)
+            if distance < best_distance:
+                best, best_distance = candidate, distance
+        
+        return self._items[best] if best is not None else None
+    
+    def add(self, fingerprint: int, item: Any) -> None:
+        """
+        Store a fingerprint.
+        
+        Args:
+            fingerprint: The fingerprint
+            item: Value returned by find() for this fingerprint and its near-duplicates
+        """
+        if fingerprint in self._items:
+            return
+        self._items[fingerprint] = item
+        for table, key in zip(self._tables, self._band_keys(fingerprint)):
+            table.setdefault(key, set()).add(fingerprint)
+    
+    def __len__(self) -> int:
+        return len(self._items)
@@ -0,0 +1,96 @@
+import copy
+import sys
+import os
+import threading
+from typing import Any, Callable, Hashable, Tuple
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.metrics import metrics
+
+class _Call:
+    """A computation in progress and the callers waiting for it."""
+    
+    __slots__ = ('done', 'result', 'error', 'waiters')
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one computation.
+    
+    The first caller for a key runs the function; callers arriving while it
+    is still running wait for it and receive a deep copy of its result (or
+    its exception), so that they can modify the result independently.
+    Nothing is cached once the computation has finished.
+    """
+    
+    def __init__(self, name: str):
+        """
+        Initialize the group.
+        
+        Args:
+            name: Label used for the coalescing metrics
+        """
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._pid = os.getpid()
+    
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn, or wait for the call already running for the same key.
+        
+        Args:
+            key: Identity of the computation
+            fn: Function computing the result
+        
+        Returns:
+            Tuple of (result, shared); shared is True if the result was
+            computed for another caller
+        """
+        with self._lock:
+            # Calls in flight in the parent process never finish in a forked child
+            if self._pid != os.getpid():
+                self._calls = {}
+                self._pid = os.getpid()
+            
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+        
+        if not leader:
+            metrics.increment('coalesced_requests_total', {'scope': self.name})
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result), True
+        
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            self._forget(key, call)
+            call.done.set()
+            raise
+        
+        try:
+            waiters = self._forget(key, call)
+            # Waiters copy the stored result, so the leader must not hand out the same object
+            return (copy.deepcopy(call.result) if waiters else call.result), False
+        finally:
+            call.done.set()
+    
+    def _forget(self, key: Hashable, call: _Call) -> int:
+        """Stop new callers from joining a finished call and return its number of waiters."""
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+            return call.waiters
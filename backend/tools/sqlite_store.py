@@ -0,0 +1,51 @@
+import sqlite3
+import sys
+import os
+import threading
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import Config
+
+class SQLiteStore:
+    """
+    Small wrapper around an SQLite database file shared by threads and
+    worker processes. Each thread (and each forked process) gets its own
+    connection; the database runs in WAL mode so readers do not block writers.
+    """
+    
+    def __init__(self, path: str, schema: str):
+        """
+        Open (and if needed create) the database.
+        
+        Args:
+            path: Path of the SQLite database file
+            schema: SQL script creating the tables, run once per process
+        """
+        self.path = path
+        self.schema = schema
+        self._local = threading.local()
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        
+        self.connection().executescript(schema)
+    
+    def connection(self) -> sqlite3.Connection:
+        """
+        Return the connection for the current thread and process.
+        
+        Returns:
+            An open sqlite3.Connection in autocommit mode
+        """
+        pid = os.getpid()
+        conn = getattr(self._local, 'conn', None)
+        
+        if conn is None or self._local.pid != pid:
+            conn = sqlite3.connect(self.path, timeout=Config.SQLITE_BUSY_TIMEOUT, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = pid
+        
+        return conn
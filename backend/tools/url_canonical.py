@@ -0,0 +1,116 @@
+import sys
+import os
+from typing import List, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import Config
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# AMP viewers that wrap another page: (host suffix, path prefix before the wrapped host)
+_AMP_VIEWERS = (
+    ('www.google.com', '/amp/s/'),
+    ('.cdn.ampproject.org', '/c/s/'),
+    ('.cdn.ampproject.org', '/v/s/'),
+)
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in Config.URL_TRACKING_PARAMS or name.startswith(Config.URL_TRACKING_PREFIXES)
+
+def _unwrap_amp_viewer(host: str, path: str) -> Tuple[str, str]:
+    for suffix, prefix in _AMP_VIEWERS:
+        if host.endswith(suffix) and path.startswith(prefix):
+            wrapped = path[len(prefix):]
+            wrapped_host, _, wrapped_path = wrapped.partition('/')
+            return wrapped_host.lower(), '/' + wrapped_path
+    return host, path
+
+def _strip_amp_path(path: str) -> str:
+    if path.startswith('/amp/'):
+        path = path[len('/amp'):]
+    if path.endswith('/amp') or path.endswith('/amp/'):
+        path = path[:path.rindex('/amp')] or '/'
+    if '.amp.' in path.rsplit('/', 1)[-1]:
+        head, _, tail = path.rpartition('/')
+        path = head + '/' + tail.replace('.amp.', '.', 1)
+    return path
+
+def canonicalize_url(url: str) -> str:
+    """
+    Reduce a URL to a canonical form, so that addresses of the same document match.
+    
+    The scheme is unified to https (unless the URL names a non-default
+    port), the host is lower-cased and loses its "www." or "amp." prefix
+    and default port, AMP variants and AMP viewer
+    URLs are mapped to the regular page, tracking parameters and the
+    fragment are dropped, the remaining parameters are sorted and a
+    trailing slash is removed.
+    
+    The result is used as a key only; pages are still fetched from the URL
+    the search engine returned.
+    
+    Args:
+        url: An absolute http(s) URL
+    
+    Returns:
+        The canonical URL, or the URL unchanged if it is not http(s)
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url
+    
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS or not parts.hostname:
+        return url
+    
+    host, path = _unwrap_amp_viewer(parts.hostname, parts.path or '/')
+    for prefix in ('www.', 'amp.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    if port and port != _DEFAULT_PORTS[scheme]:
+        # With an explicit port the scheme matters, so it is kept
+        host = f'{host}:{port}'
+    else:
+        scheme = 'https'
+    
+    path = _strip_amp_path(path)
+    if len(path) > 1:
+        path = path.rstrip('/') or '/'
+    
+    params = [
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+        and not (name.lower() in ('amp', 'outputtype') and value.lower() in ('', '1', 'true', 'amp'))
+    ]
+    
+    return urlunsplit((scheme, host, path, urlencode(sorted(params)), ''))
+
+def dedupe_urls(urls: List[str]) -> Tuple[List[int], List[Tuple[int, int]]]:
+    """
+    Find the URLs of a list that point to the same document as an earlier one.
+    
+    Args:
+        urls: URLs in priority order
+    
+    Returns:
+        Tuple of (indexes of the first URL of each document, (index, index of
+        the earlier URL) pairs for the repeats)
+    """
+    first_seen = {}
+    unique = []
+    repeats = []
+    
+    for index, url in enumerate(urls):
+        key = canonicalize_url(url)
+        if key in first_seen:
+            repeats.append((index, first_seen[key]))
+        else:
+            first_seen[key] = index
+            unique.append(index)
+    
+    return unique, repeats
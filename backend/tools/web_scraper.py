@@ -1,14 +1,109 @@
 import requests
 from bs4 import BeautifulSoup
-from typing import Dict, Any, Optional, List
+from bs4.builder import builder_registry
+from typing import Dict, Any, Optional, List, Tuple
 import sys
 import os
-import re
+import json
+import random
+import socket
 import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from urllib.parse import urlparse
 
 # Add the parent directory to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import Config
+from tools.http_client import get_session
+from tools.page_cache import PageCache
+from tools.metrics import metrics
+from tools.single_flight import SingleFlight
+from tools.records import ScrapedPage, PageContent
+from tools.simhash import simhash
+from tools.url_canonical import canonicalize_url
+from tools.host_health import HostHealth
+from tools.hedging import LatencyWindow, RequestBudget
+from profiling import current_profiler
+
+# Heading tag names mapped to their level
+_HEADING_LEVELS = {f'h{i}': i for i in range(1, 7)}
+
+def _resolve_parser(name: str) -> str:
+    """
+    Return the configured BeautifulSoup parser if installed, else 'html.parser'.
+    
+    Args:
+        name: Parser name such as 'html.parser', 'lxml' or 'html5lib'
+        
+    Returns:
+        A parser name BeautifulSoup can use
+    """
+    if builder_registry.lookup(name) is None:
+        print(f"HTML parser '{name}' is not installed, falling back to html.parser")
+        return 'html.parser'
+    return name
+
+def _is_dns_failure(error: Exception) -> bool:
+    """
+    Check whether a request failed because the host name did not resolve.
+    
+    Args:
+        error: Exception raised by requests
+        
+    Returns:
+        True if a socket.gaierror is among the causes of the error
+    """
+    pending = [error]
+    seen = set()
+    while pending:
+        current = pending.pop()
+        if current is None or id(current) in seen:
+            continue
+        seen.add(id(current))
+        if isinstance(current, socket.gaierror):
+            return True
+        # requests wraps urllib3's MaxRetryError, whose `reason` holds the connection error
+        pending.extend([current.__cause__, current.__context__, getattr(current, 'reason', None)])
+        pending.extend(arg for arg in getattr(current, 'args', ()) if isinstance(arg, BaseException))
+    return False
+
+def _start_request(*args, **kwargs) -> Future:
+    """
+    Send a streamed GET request on a new thread.
+    
+    A thread per request, rather than a shared pool, means a hedged fetch
+    never waits in a queue behind other fetches.
+    
+    Returns:
+        Future of the response
+    """
+    future = Future()
+    
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(get_session().get(*args, stream=True, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+    
+    threading.Thread(target=run, name='hedged-fetch', daemon=True).start()
+    return future
+
+def _is_transient_status(status: int) -> bool:
+    """Whether an HTTP error status may go away on its own (server errors and rate limits)."""
+    return status >= 500 or status == 429
+
+def _is_transient_failure(error: str) -> bool:
+    """Whether a negatively cached failure ("HTTP <status>") may go away on its own."""
+    status = error[len('HTTP '):] if error.startswith('HTTP ') else ''
+    return status.isdigit() and _is_transient_status(int(status))
+
+def _close_response(future) -> None:
+    """Close the response of a hedged request that lost the race."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
 
 class WebScraperTool:
     """
@@ -20,71 +115,467 @@ class WebScraperTool:
         self.user_agent = Config.USER_AGENT
         self.timeout = Config.REQUEST_TIMEOUT
         self.headers = {'User-Agent': self.user_agent}
+        self.parser = _resolve_parser(Config.HTML_PARSER)
+        self.max_workers = Config.SCRAPE_MAX_WORKERS
+        self.host_delay = Config.SCRAPE_HOST_DELAY
+        
+        # Per-host politeness state, shared by all worker threads
+        self._host_lock = threading.Lock()
+        self._host_next_request = {}
         
-    def scrape_url(self, url: str) -> Dict[str, Any]:
+        # Persistent page cache (None when disabled)
+        self.page_cache = PageCache() if Config.PAGE_CACHE_ENABLED else None
+        
+        # Shared per-host latency, circuit breaker and negative cache (None when disabled)
+        self.host_health = HostHealth() if Config.HOST_HEALTH_ENABLED else None
+        
+        # Recent time-to-headers for hedging, and the budget shared by hedges and retries
+        self._latencies = LatencyWindow()
+        self._extra_requests = RequestBudget()
+        
+        # Concurrent scrapes of the same URL share a single fetch
+        self._inflight = SingleFlight('scrape')
+        
+    def scrape_url(self, url: str, deadline: Optional[float] = None) -> ScrapedPage:
         """
         Scrape content from the specified URL.
         
+        If the URL, or another address of the same document, is already
+        being scraped (e.g. by another research request), waits for that fetch
+        instead of starting a second one.
+        
         Args:
             url: The URL to scrape
+            deadline: Optional time.monotonic() value by which the fetch must
+                finish; the request timeout is shortened to fit
             
         Returns:
-            Dictionary containing the scraped content and metadata
+            ScrapedPage with the extracted content and metadata
+        """
+        key = self._page_key(url)
+        result, shared = self._inflight.do(key, lambda: self._scrape_url(url, key, deadline))
+        if shared:
+            # The fetch may have been started under another address of the document
+            result.url = url
+        return result
+    
+    def _page_key(self, url: str) -> str:
         """
+        Return the key under which a URL's page is cached and coalesced.
+        
+        Args:
+            url: The URL to scrape
+            
+        Returns:
+            The canonical URL, or the URL itself when canonicalization is disabled
+        """
+        return canonicalize_url(url) if Config.URL_CANONICALIZATION_ENABLED else url
+    
+    def _scrape_url(self, url: str, key: str, deadline: Optional[float]) -> ScrapedPage:
+        """Fetch, parse and cache a single URL (see scrape_url); `key` is its page key."""
+        host = urlparse(url).netloc.lower()
+        fetch_started = None
+        
         try:
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
-            
-            if response.status_code != 200:
-                return {
-                    'success': False,
-                    'error': f"Failed to retrieve content: HTTP {response.status_code}",
-                    'url': url,
-                    'content': None,
-                    'metadata': None
-                }
-            
-            # Parse the HTML content
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract metadata
-            metadata = self._extract_metadata(soup, url)
-            
-            # Extract main content
-            content = self._extract_content(soup)
-            
-            # Extract structured data if available
-            structured_data = self._extract_structured_data(soup)
-            
-            return {
-                'success': True,
-                'url': url,
-                'content': content,
-                'metadata': metadata,
-                'structured_data': structured_data
-            }
+            cached = self.page_cache.get(key) if self.page_cache else None
+            
+            # Fresh cache hits skip both the network and the HTML parsing
+            if cached and cached['fresh']:
+                return ScrapedPage.from_extracted(url, cached['extracted'], from_cache=True)
+            
+            # URLs and hosts that failed recently are not requested again
+            timeout = self.timeout
+            if self.host_health:
+                error = self.host_health.recent_failure(key, f'dns:{host}')
+                if error:
+                    return ScrapedPage.failure(url, f"Skipped after a recent failure: {error}", _is_transient_failure(error))
+                
+                timeout = self.host_health.admit(host)
+                if timeout is None:
+                    # A stale copy is better than nothing while the host is failing
+                    if cached:
+                        return ScrapedPage.from_extracted(url, cached['extracted'], from_cache=True)
+                    return ScrapedPage.failure(url, f"Skipped: {host} is failing (circuit open)", transient=True)
+            
+            headers = dict(self.headers)
+            if cached:
+                headers.update(self.page_cache.conditional_headers(cached))
+            
+            self._wait_for_host(url)
+            
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.monotonic())
+                if timeout <= 0:
+                    return ScrapedPage.failure(url, 'Deadline exceeded before the request was sent', transient=True)
+            
+            # Stream the body so oversized or non-HTML responses are never fully downloaded
+            fetch_started = time.perf_counter()
+            response, ttfb = self._get(url, host, headers, timeout, deadline)
+            with response:
+                metrics.observe('page_fetch_seconds', time.perf_counter() - fetch_started, {'phase': 'ttfb'})
+                metrics.increment('http_responses_total', {'target': 'page', 'status': response.status_code})
+                if self.host_health:
+                    self._record_response(host, key, ttfb, response.status_code)
+                
+                if response.status_code == 304 and cached:
+                    self.page_cache.mark_revalidated(key)
+                    return ScrapedPage.from_extracted(url, cached['extracted'], from_cache=True)
+                
+                if response.status_code != 200:
+                    return ScrapedPage.failure(
+                        url,
+                        f"Failed to retrieve content: HTTP {response.status_code}",
+                        _is_transient_status(response.status_code)
+                    )
+                
+                content_type = response.headers.get('Content-Type', '')
+                if not self._is_html(content_type):
+                    return ScrapedPage.failure(url, f"Unsupported content type: {content_type}")
+                
+                body_started = time.perf_counter()
+                html, bytes_downloaded, truncated = self._read_body(response)
+                metrics.observe('page_fetch_seconds', time.perf_counter() - body_started, {'phase': 'body'})
+                metrics.observe('page_fetch_seconds', time.perf_counter() - fetch_started, {'phase': 'total'})
+            
+            # Parse the HTML content and extract everything in a single pass
+            with metrics.timer('html_parse_seconds'):
+                page = self._parse_and_extract(html, url)
+            page.metadata['bytes_downloaded'] = bytes_downloaded
+            page.metadata['truncated'] = truncated
+            
+            # Fingerprinted here, in the fetch thread, so it is stored with the page
+            if Config.DEDUP_ENABLED:
+                page.simhash = simhash(page.main_text)
+            
+            if self.page_cache:
+                self.page_cache.put(
+                    key,
+                    response.headers.get('ETag'),
+                    response.headers.get('Last-Modified'),
+                    page.extracted()
+                )
+            
+            return page
             
         except Exception as e:
-            return {
-                'success': False,
-                'error': str(e),
-                'url': url,
-                'content': None,
-                'metadata': None
-            }
+            if isinstance(e, requests.Timeout):
+                metrics.increment('request_timeouts_total', {'target': 'page'})
+            elif isinstance(e, requests.RequestException):
+                metrics.increment('request_errors_total', {'target': 'page'})
+            
+            if self.host_health and fetch_started is not None and isinstance(e, requests.RequestException):
+                self.host_health.record(host, time.perf_counter() - fetch_started, failed=True)
+                if _is_dns_failure(e):
+                    self.host_health.remember_failure(f'dns:{host}', 'host name did not resolve', Config.NEGATIVE_CACHE_TTL)
+            
+            # Timeouts and connection errors may go away on their own; parsing errors will not
+            return ScrapedPage.failure(url, str(e), isinstance(e, requests.RequestException))
     
-    def _extract_metadata(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
+    def _get(self, url: str, host: str, headers: Dict[str, str], timeout: float,
+             deadline: Optional[float]) -> Tuple[requests.Response, float]:
         """
-        Extract metadata from the web page.
+        Request a page, retrying transient failures.
+        
+        Connection errors and Config.RETRY_STATUSES responses are retried up
+        to Config.RETRY_ATTEMPTS times after a jittered, exponentially growing
+        backoff, as long as the extra-request budget and the deadline allow.
+        Retries keep to the per-host spacing of first requests. Timeouts are
+        not retried; hedging covers slow responses.
+        
+        Args:
+            url: The URL to request
+            host: Host of the URL
+            headers: Request headers
+            timeout: Request timeout in seconds
+            deadline: Optional time.monotonic() value by which the fetch must finish
+            
+        Returns:
+            Tuple of (streamed response with its headers read, seconds the
+            answering attempt took to return them)
+        """
+        self._extra_requests.deposit()
+        attempt = 0
+        
+        while True:
+            error = None
+            response = None
+            started = time.perf_counter()
+            try:
+                response = self._hedged_get(url, host, headers, timeout)
+            except requests.ConnectionError as e:
+                if isinstance(e, (requests.Timeout, requests.exceptions.SSLError)) or _is_dns_failure(e):
+                    raise
+                error = e
+            latency = time.perf_counter() - started
+            
+            if response is not None:
+                if response.status_code not in Config.RETRY_STATUSES:
+                    self._latencies.add(latency)
+                    return response, latency
+                reason = str(response.status_code)
+            else:
+                reason = 'connection_error'
+            
+            backoff = random.uniform(0, Config.RETRY_BACKOFF * 2 ** attempt)
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.monotonic() - backoff)
+            
+            if attempt >= Config.RETRY_ATTEMPTS or timeout <= 0:
+                if error:
+                    raise error
+                return response, latency
+            if not self._extra_requests.withdraw():
+                metrics.increment('extra_requests_denied_total', {'kind': 'retry'})
+                if error:
+                    raise error
+                return response, latency
+            
+            # The failed attempt still counts against the host
+            if response is not None:
+                response.close()
+            if self.host_health:
+                self.host_health.record(host, latency, failed=True)
+            
+            metrics.increment('retries_total', {'reason': reason})
+            time.sleep(backoff)
+            self._wait_for_host(url)
+            
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.monotonic())
+                if timeout <= 0:
+                    raise requests.Timeout('Deadline exceeded before the retry was sent')
+            attempt += 1
+    
+    def _hedged_get(self, url: str, host: str, headers: Dict[str, str], timeout: float) -> requests.Response:
+        """
+        Send a GET request, and a second one if the first is unusually slow.
+        
+        Once the first request has waited longer than Config.HEDGE_PERCENTILE
+        of recent fetches, an identical request is sent (if the extra-request
+        budget allows) and whichever returns its headers first is used. The
+        hedge also waits for the host's next politeness slot, so hedging never
+        sends requests to a host more often than Config.SCRAPE_HOST_DELAY.
+        
+        Args:
+            url: The URL to request
+            host: Host of the URL
+            headers: Request headers
+            timeout: Request timeout in seconds
+            
+        Returns:
+            The streamed response
+        """
+        delay = None
+        if Config.HEDGE_ENABLED:
+            delay = self._latencies.percentile(Config.HEDGE_PERCENTILE, Config.HEDGE_MIN_SAMPLES)
+        
+        if delay is None or max(delay, Config.HEDGE_MIN_DELAY) >= timeout:
+            return get_session().get(url, headers=headers, timeout=timeout, stream=True)
+        delay = max(delay, Config.HEDGE_MIN_DELAY)
+        
+        expires = time.monotonic() + timeout
+        primary = _start_request(url, headers=headers, timeout=timeout)
+        names = {primary: 'primary'}
+        
+        try:
+            try:
+                return primary.result(timeout=delay)
+            except FuturesTimeoutError:
+                pass
+            
+            # Wait for the host's next request slot before hedging
+            while True:
+                wait = self._claim_host(host)
+                if not wait:
+                    break
+                if time.monotonic() + wait >= expires:
+                    return primary.result(timeout=max(expires - time.monotonic(), 0))
+                try:
+                    return primary.result(timeout=wait)
+                except FuturesTimeoutError:
+                    pass
+            
+            if not self._extra_requests.withdraw():
+                metrics.increment('extra_requests_denied_total', {'kind': 'hedge'})
+                return primary.result(timeout=max(expires - time.monotonic(), 0))
+            
+            # The hedge gets the rest of the original timeout, not a fresh one
+            hedge = _start_request(url, headers=headers, timeout=max(expires - time.monotonic(), 0.001))
+            names[hedge] = 'hedge'
+            
+            error = None
+            for future in as_completed(names, timeout=max(expires - time.monotonic(), 0)):
+                try:
+                    response = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                
+                metrics.increment('hedged_requests_total', {'winner': names[future]})
+                for other in names:
+                    if other is not future:
+                        other.add_done_callback(_close_response)
+                return response
+            
+            raise error
+        
+        except FuturesTimeoutError:
+            # requests' timeout applies per socket operation, so bound the whole wait here
+            for future in names:
+                future.add_done_callback(_close_response)
+            raise requests.Timeout(f'No response from {host} within {timeout:.1f}s')
+    
+    def _record_response(self, host: str, key: str, latency: float, status: int) -> None:
+        """
+        Update the host's health with a response, and negatively cache error statuses.
+        
+        Server errors and 429 count against the host; other client errors
+        only concern the URL.
+        
+        Args:
+            host: Host of the URL
+            key: Page key of the URL
+            latency: Seconds until the response headers arrived
+            status: HTTP status code
+        """
+        self.host_health.record(host, latency, failed=_is_transient_status(status))
+        
+        if status >= 500:
+            self.host_health.remember_failure(key, f"HTTP {status}", Config.NEGATIVE_CACHE_SERVER_ERROR_TTL)
+        elif status >= 400 and status != 429:
+            self.host_health.remember_failure(key, f"HTTP {status}", Config.NEGATIVE_CACHE_TTL)
+    
+    def _is_html(self, content_type: str) -> bool:
+        """
+        Check whether a Content-Type header denotes an HTML document.
+        
+        Args:
+            content_type: Value of the Content-Type response header
+            
+        Returns:
+            True for HTML types, or when the server sent no Content-Type
+        """
+        mime_type = content_type.split(';', 1)[0].strip().lower()
+        return not mime_type or mime_type in Config.SCRAPE_HTML_CONTENT_TYPES
+    
+    def _read_body(self, response) -> Tuple[str, int, bool]:
+        """
+        Read a streamed response body, stopping at Config.MAX_DOWNLOAD_BYTES.
+        
+        Args:
+            response: A requests.Response opened with stream=True
+            
+        Returns:
+            Tuple of (decoded body, bytes downloaded, whether the body was truncated)
+        """
+        max_bytes = Config.MAX_DOWNLOAD_BYTES
+        chunks = []
+        received = 0
+        truncated = False
+        
+        for chunk in response.iter_content(chunk_size=Config.DOWNLOAD_CHUNK_SIZE):
+            chunks.append(chunk)
+            received += len(chunk)
+            if received > max_bytes:
+                truncated = True
+                break
+        
+        body = b''.join(chunks)[:max_bytes]
+        return body.decode(response.encoding or 'utf-8', errors='replace'), len(body), truncated
+    
+    def _parse_and_extract(self, html: str, url: str) -> ScrapedPage:
+        """
+        Parse an HTML document and extract its content, metadata and structured data.
+        
+        Args:
+            html: The raw HTML of the page
+            url: The URL of the page
+            
+        Returns:
+            ScrapedPage with content, metadata and structured_data
+        """
+        soup = BeautifulSoup(html, self.parser)
+        
+        # Walk the parse tree once, then extract from the collected elements
+        elements = self._collect_elements(soup)
+        
+        return ScrapedPage(
+            url,
+            metadata=self._extract_metadata(elements, url),
+            structured_data=self._extract_structured_data(elements),
+            content=self._extract_content(soup, elements)
+        )
+    
+    def _collect_elements(self, soup: BeautifulSoup) -> Dict[str, Any]:
+        """
+        Collect every element needed for extraction in one walk of the parse tree.
+        
+        Script and style elements are removed after the walk, once JSON-LD
+        blocks have been read from them.
         
         Args:
             soup: BeautifulSoup object of the page
+            
+        Returns:
+            Dictionary of collected elements grouped by purpose
+        """
+        elements = {
+            'title': None,
+            'meta': [],
+            'headings': [],
+            'paragraphs': [],
+            'links': [],
+            'images': [],
+            'article': None,
+            'json_ld': []
+        }
+        removable = []
+        
+        for tag in soup.find_all(True):
+            name = tag.name
+            
+            if name == 'p':
+                elements['paragraphs'].append(tag)
+            elif name == 'a':
+                if tag.get('href') is not None:
+                    elements['links'].append(tag)
+            elif name in _HEADING_LEVELS:
+                elements['headings'].append(tag)
+            elif name == 'img':
+                if tag.get('alt') is not None and tag.get('src'):
+                    elements['images'].append(tag)
+            elif name == 'meta':
+                elements['meta'].append(tag)
+            elif name == 'script' or name == 'style':
+                if name == 'script' and tag.get('type') == 'application/ld+json':
+                    elements['json_ld'].append(tag.string)
+                removable.append(tag)
+            elif name == 'title':
+                if elements['title'] is None:
+                    elements['title'] = tag.text.strip()
+            elif name == 'article':
+                if elements['article'] is None:
+                    elements['article'] = tag
+        
+        # Remove script and style elements
+        for tag in removable:
+            tag.extract()
+        
+        return elements
+    
+    def _extract_metadata(self, elements: Dict[str, Any], url: str) -> Dict[str, Any]:
+        """
+        Extract metadata from the web page.
+        
+        Args:
+            elements: Elements collected by _collect_elements
             url: The URL of the page
             
         Returns:
             Dictionary containing metadata
         """
         metadata = {
-            'title': None,
+            'title': elements['title'],
             'description': None,
             'keywords': None,
             'author': None,
@@ -93,165 +584,208 @@ class WebScraperTool:
             'url': url
         }
         
-        # Extract title
-        title_tag = soup.find('title')
-        if title_tag:
-            metadata['title'] = title_tag.text.strip()
-        
         # Extract meta tags
-        meta_tags = soup.find_all('meta')
-        for tag in meta_tags:
+        for tag in elements['meta']:
+            name = tag.get('name')
+            prop = tag.get('property')
+            
             # Description
-            if tag.get('name') == 'description' or tag.get('property') == 'og:description':
+            if name == 'description' or prop == 'og:description':
                 metadata['description'] = tag.get('content')
             
             # Keywords
-            elif tag.get('name') == 'keywords':
+            elif name == 'keywords':
                 metadata['keywords'] = tag.get('content')
             
             # Author
-            elif tag.get('name') == 'author':
+            elif name == 'author':
                 metadata['author'] = tag.get('content')
             
             # Published date
-            elif tag.get('name') == 'article:published_time' or tag.get('property') == 'article:published_time':
+            elif name == 'article:published_time' or prop == 'article:published_time':
                 metadata['published_date'] = tag.get('content')
             
             # Site name
-            elif tag.get('property') == 'og:site_name':
+            elif prop == 'og:site_name':
                 metadata['site_name'] = tag.get('content')
         
         # If site_name is not found, extract from URL
         if not metadata['site_name']:
-            try:
-                from urllib.parse import urlparse
-                domain = urlparse(url).netloc
-                metadata['site_name'] = domain
-            except:
-                pass
+            metadata['site_name'] = urlparse(url).netloc
         
         return metadata
     
-    def _extract_content(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    def _extract_content(self, soup: BeautifulSoup, elements: Dict[str, Any]) -> PageContent:
         """
         Extract main content from the web page.
         
         Args:
-            soup: BeautifulSoup object of the page
+            soup: BeautifulSoup object of the page, with scripts and styles removed
+            elements: Elements collected by _collect_elements
             
         Returns:
-            Dictionary containing extracted content
+            PageContent with the text, headings, links and images of the page
         """
-        content = {
-            'main_text': '',
-            'headings': [],
-            'paragraphs': [],
-            'links': [],
-            'images': []
-        }
-        
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.extract()
-        
-        # Extract headings
-        headings = []
-        for i in range(1, 7):
-            for heading in soup.find_all(f'h{i}'):
-                headings.append({
-                    'level': i,
-                    'text': heading.get_text().strip()
-                })
-        content['headings'] = headings
+        # Extract headings, grouped by level as h1 first through h6 last
+        headings = [
+            (_HEADING_LEVELS[heading.name], heading.get_text().strip())
+            for heading in elements['headings']
+        ]
+        headings.sort(key=lambda heading: heading[0])
         
         # Extract paragraphs
         paragraphs = []
-        for p in soup.find_all('p'):
+        for p in elements['paragraphs']:
             text = p.get_text().strip()
             if text:
                 paragraphs.append(text)
-        content['paragraphs'] = paragraphs
         
         # Extract links
         links = []
-        for a in soup.find_all('a', href=True):
+        for a in elements['links']:
             link_text = a.get_text().strip()
             if link_text:
-                links.append({
-                    'text': link_text,
-                    'href': a['href']
-                })
-        content['links'] = links
+                links.append((link_text, a['href']))
         
         # Extract images with alt text
-        images = []
-        for img in soup.find_all('img', alt=True):
-            if img.get('src'):
-                images.append({
-                    'src': img['src'],
-                    'alt': img['alt']
-                })
-        content['images'] = images
+        images = [(img['src'], img['alt']) for img in elements['images']]
         
         # Combine all paragraph text for main_text
-        content['main_text'] = '\n\n'.join(paragraphs)
+        main_text = '\n\n'.join(paragraphs)
         
         # Try to identify and extract the main article content
-        article = soup.find('article')
+        article = elements['article']
         if article:
             article_text = article.get_text().strip()
-            if len(article_text) > len(content['main_text']):
-                content['main_text'] = article_text
+            if len(article_text) > len(main_text):
+                main_text = article_text
         
         # If main_text is still empty, get all text
-        if not content['main_text']:
-            content['main_text'] = soup.get_text().strip()
+        if not main_text:
+            main_text = soup.get_text().strip()
         
         # Limit content length if needed
-        if len(content['main_text']) > Config.MAX_CONTENT_LENGTH:
-            content['main_text'] = content['main_text'][:Config.MAX_CONTENT_LENGTH] + "..."
+        if len(main_text) > Config.MAX_CONTENT_LENGTH:
+            main_text = main_text[:Config.MAX_CONTENT_LENGTH] + "..."
         
-        return content
+        return PageContent.build(paragraphs, main_text, headings, links, images)
     
-    def _extract_structured_data(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    def _extract_structured_data(self, elements: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Extract structured data (JSON-LD) from the web page.
         
         Args:
-            soup: BeautifulSoup object of the page
+            elements: Elements collected by _collect_elements
             
         Returns:
             List of structured data objects
         """
         structured_data = []
         
-        # Look for JSON-LD scripts
-        ld_scripts = soup.find_all('script', type='application/ld+json')
-        for script in ld_scripts:
+        for script_text in elements['json_ld']:
             try:
-                data = json.loads(script.string)
-                structured_data.append(data)
-            except:
+                structured_data.append(json.loads(script_text))
+            except (TypeError, ValueError):
                 continue
         
         return structured_data
     
-    def scrape_multiple_urls(self, urls: List[str]) -> List[Dict[str, Any]]:
+    def _wait_for_host(self, url: str) -> None:
+        """
+        Block until the host of the given URL may be contacted again.
+        
+        Requests to the same host are spaced at least `host_delay` seconds
+        apart, while requests to different hosts do not wait on each other.
+        
+        Args:
+            url: The URL about to be requested
+        """
+        host = urlparse(url).netloc.lower()
+        
+        # Reserve the next slot under the lock, then sleep without holding it
+        with self._host_lock:
+            now = time.monotonic()
+            slot = max(self._host_next_request.get(host, 0), now)
+            self._host_next_request[host] = slot + self.host_delay
+        
+        if slot > now:
+            time.sleep(slot - now)
+    
+    def _claim_host(self, host: str) -> float:
+        """
+        Take the host's next request slot if it is free now, without waiting.
+        
+        Args:
+            host: Host about to be requested
+            
+        Returns:
+            0 if the slot was taken, else the seconds until it becomes free
+        """
+        with self._host_lock:
+            wait = self._host_next_request.get(host, 0) - time.monotonic()
+            if wait > 0:
+                return wait
+            self._host_next_request[host] = time.monotonic() + self.host_delay
+            return 0.0
+    
+    def iter_scraped_urls(self, urls: List[str], deadline: Optional[float] = None):
+        """
+        Scrape multiple URLs concurrently, yielding results as they finish.
+        
+        Args:
+            urls: List of URLs to scrape
+            deadline: Optional time.monotonic() value after which no more
+                results are waited for; unfinished URLs are simply not yielded
+            
+        Yields:
+            Tuples of (index in `urls`, ScrapedPage) in completion order.
+            Closing the generator cancels fetches that have not started.
+        """
+        if not urls:
+            return
+        
+        workers = max(1, min(self.max_workers, len(urls)))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        
+        # Fetching and parsing happen in the worker threads, so a profiled request profiles them there
+        task = self.scrape_url
+        profiler = current_profiler()
+        if profiler is not None:
+            task = profiler.wrap(task)
+        
+        try:
+            futures = {
+                executor.submit(task, url, deadline): index
+                for index, url in enumerate(urls)
+            }
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            for future in as_completed(futures, timeout=timeout):
+                yield futures[future], future.result()
+        
+        except FuturesTimeoutError:
+            return
+        
+        finally:
+            # If the caller stops early, drop queued fetches instead of waiting for them
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def scrape_multiple_urls(self, urls: List[str]) -> List[ScrapedPage]:
         """
         Scrape content from multiple URLs.
         
+        URLs are fetched concurrently (bounded by `Config.SCRAPE_MAX_WORKERS`)
+        with politeness enforced per host, and results are returned in the
+        same order as the input URLs.
+        
         Args:
             urls: List of URLs to scrape
             
         Returns:
-            List of dictionaries containing scraped content
+            List of ScrapedPage results
         """
-        results = []
+        results = [None] * len(urls)
         
-        for url in urls:
-            # Add a small delay between requests to be respectful
-            time.sleep(1)
-            result = self.scrape_url(url)
-            results.append(result)
+        for index, result in self.iter_scraped_urls(urls):
+            results[index] = result
         
         return results
@@ -1,13 +1,16 @@
-import requests
-from bs4 import BeautifulSoup
-import json
-from typing import List, Dict, Any
+from typing import List, Optional
 import sys
 import os
 
 # Add the parent directory to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__) )))
 from config import Config
+from tools.http_client import get_session
+from tools.search_cache import SearchCache, normalize_query
+from tools.single_flight import SingleFlight
+from tools.records import SearchResult
+from tools.metrics import metrics
+import requests
 
 class WebSearchTool:
     """
@@ -16,67 +19,118 @@ class WebSearchTool:
     
     def __init__(self):
         self.api_key = Config.SERPAPI_KEY
-        self.base_url = "https://serpapi.com/search"
+        self.base_url = Config.SERPAPI_URL
+        
+        # Search result cache (None when disabled)
+        self.cache = SearchCache() if Config.SEARCH_CACHE_ENABLED else None
+        
+        # Concurrent identical searches share a single SerpAPI request
+        self._inflight = SingleFlight('search')
         
-    def search(self, query: str, num_results: int = 10)  -> List[Dict[str, Any]]:
+    def search(self, query: str, num_results: int = 10, gl: str = "us", hl: str = "en",
+               timeout: Optional[float] = None)  -> List[SearchResult]:
         """
         Perform a web search for the given query and return a list of search results.
         
         Args:
             query: The search query string
             num_results: Number of results to return
+            gl: Country to search from
+            hl: Language of the results
+            timeout: SerpAPI request timeout in seconds (defaults to Config.REQUEST_TIMEOUT)
             
         Returns:
-            List of dictionaries containing search results with title, url, and snippet
+            List of search results with title, url, and snippet
         """
         try:
-            # Prepare parameters for SerpAPI
-            params = {
-                "q": query,
-                "api_key": self.api_key,
-                "engine": "google",
-                "num": num_results,
-                "gl": "us",  # Country to search from
-                "hl": "en"   # Language
-            }
+            search_results = self.cache.get(query, num_results, gl, hl) if self.cache else None
             
-            # Make the API request
-            response = requests.get(self.base_url, params=params)
-            
-            if response.status_code != 200:
-                print(f"Error from SerpAPI: {response.status_code}")
-                return self._generate_mock_results(query, num_results)
+            if search_results is None:
+                def fetch():
+                    results = self._fetch_results(query, num_results, gl, hl, timeout or Config.REQUEST_TIMEOUT)
+                    if results is not None and self.cache:
+                        self.cache.put(query, num_results, gl, hl, results)
+                    return results
                 
-            # Parse the JSON response
-            data = response.json()
-            
-            # Extract organic search results
-            search_results = []
-            
-            if "organic_results" in data:
-                for result in data["organic_results"][:num_results]:
-                    title = result.get("title", "")
-                    url = result.get("link", "")
-                    snippet = result.get("snippet", "")
-                    
-                    search_results.append({
-                        'title': title,
-                        'url': url,
-                        'snippet': snippet
-                    })
+                key = (normalize_query(query), num_results, gl, hl)
+                search_results, _ = self._inflight.do(key, fetch)
+                
+                if search_results is None:
+                    metrics.increment('search_mock_fallbacks_total', {'reason': 'http_error'})
+                    return self._generate_mock_results(query, num_results)
             
             # If we couldn't extract enough results, supplement with mock results
             if len(search_results) < num_results:
-                search_results.extend(self._generate_mock_results(query, num_results - len(search_results)))
+                metrics.increment('search_mock_fallbacks_total', {'reason': 'incomplete'})
+                search_results = search_results + self._generate_mock_results(query, num_results - len(search_results))
                 
             return search_results[:num_results]
             
         except Exception as e:
             print(f"Error performing search: {e}")
+            metrics.increment('search_mock_fallbacks_total', {'reason': 'exception'})
             # Fall back to mock results if the search fails
             return self._generate_mock_results(query, num_results)
     
-    def _generate_mock_results(self, query: str, num_results: int) -> List[Dict[str, Any]]:
+    def _fetch_results(self, query: str, num_results: int, gl: str, hl: str, timeout: float) -> Optional[List[SearchResult]]:
+        """
+        Fetch organic search results from SerpAPI.
+        
+        Args:
+            query: The search query string
+            num_results: Number of results to request
+            gl: Country to search from
+            hl: Language of the results
+            timeout: Request timeout in seconds
+            
+        Returns:
+            List of organic results (possibly fewer than requested), or None
+            if SerpAPI returned an error status
+        """
+        # Prepare parameters for SerpAPI
+        params = {
+            "q": query,
+            "api_key": self.api_key,
+            "engine": "google",
+            "num": num_results,
+            "gl": gl,
+            "hl": hl
+        }
+        
+        # Make the API request
+        try:
+            with metrics.timer('serpapi_request_seconds'):
+                response = get_session().get(self.base_url, params=params, timeout=timeout)
+        except requests.Timeout:
+            metrics.increment('request_timeouts_total', {'target': 'serpapi'})
+            raise
+        except requests.RequestException:
+            metrics.increment('request_errors_total', {'target': 'serpapi'})
+            raise
+        
+        metrics.increment('http_responses_total', {'target': 'serpapi', 'status': response.status_code})
+        
+        if response.status_code != 200:
+            print(f"Error from SerpAPI: {response.status_code}")
+            return None
+            
+        # Parse the JSON response
+        data = response.json()
+        
+        # Extract organic search results
+        search_results = []
+        
+        if "organic_results" in data:
+            for result in data["organic_results"][:num_results]:
+                title = result.get("title", "")
+                url = result.get("link", "")
+                snippet = result.get("snippet", "")
+                
+                search_results.append(SearchResult(title, url, snippet))
+        
+        return search_results
+    
+    def _generate_mock_results(self, query: str, num_results: int) -> List[SearchResult]:
         """
         Generate mock search results for demonstration purposes.
         
@@ -85,7 +139,7 @@ class WebSearchTool:
             num_results: Number of results to generate
             
         Returns:
-            List of dictionaries containing mock search results
+            List of mock search results
         """
         mock_results = []
         
@@ -108,10 +162,6 @@ class WebSearchTool:
             
             snippet = f"Comprehensive information about {query}. This article provides detailed analysis and insights into {query} with expert opinions and recent developments."
             
-            mock_results.append({
-                'title': title,
-                'url': url,
-                'snippet': snippet
-            }) 
+            mock_results.append(SearchResult(title, url, snippet, mock=True))
         
         return mock_results
@@ -7,16 +7,17 @@ const apiService = {
   /**
    * Perform research based on a query
    * @param {string} query - The research query
+   * @param {string[]} [fields] - Report fields to return (e.g. ['summary', 'sources']); all by default
    * @returns {Promise} - Promise resolving to research results
    */
-  performResearch: async (query) => {
+  performResearch: async (query, fields) => {
     try {
       const response = await fetch(`${API_BASE_URL}/research`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
         },
-        body: JSON.stringify({ query }),
+        body: JSON.stringify({ query, fields }),
       });
       
       if (!response.ok) {
@@ -31,6 +32,95 @@ const apiService = {
     }
   },
   
+  /**
+   * Perform research and receive progress as it happens
+   * @param {string} query - The research query
+   * @param {Object} handlers - Callbacks: onSearch(results), onSource(source), onReport(result), onError(error)
+   * @returns {EventSource} - The open event source; call close() to stop listening
+   */
+  streamResearch: (query, { onSearch, onSource, onReport, onError } = {}) => {
+    const eventSource = new EventSource(
+      `${API_BASE_URL}/research/stream?query=${encodeURIComponent(query)}`
+    );
+    
+    eventSource.addEventListener('search', (event) => {
+      onSearch && onSearch(JSON.parse(event.data).results);
+    });
+    
+    eventSource.addEventListener('source', (event) => {
+      onSource && onSource(JSON.parse(event.data));
+    });
+    
+    eventSource.addEventListener('report', (event) => {
+      eventSource.close();
+      onReport && onReport(JSON.parse(event.data));
+    });
+    
+    eventSource.addEventListener('error', (event) => {
+      eventSource.close();
+      const message = event.data ? JSON.parse(event.data).error : 'Research stream failed';
+      console.error('API Stream Error:', message);
+      onError && onError(new Error(message));
+    });
+    
+    return eventSource;
+  },
+  
+  /**
+   * Research several queries at once, receiving each report as soon as it is ready
+   * @param {string[]} queries - The research queries
+   * @param {Object} handlers - Callbacks: onReport({ index, query, result }), onDone(summary), onError(error)
+   * @param {string[]} [fields] - Report fields to return; all by default
+   * @returns {Promise} - Promise resolving once the batch has finished
+   */
+  batchResearch: async (queries, { onReport, onDone, onError } = {}, fields) => {
+    try {
+      const response = await fetch(`${API_BASE_URL}/research/batch`, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ queries, fields }),
+      });
+      
+      if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.error || 'Failed to perform batch research');
+      }
+      
+      // EventSource cannot send a POST body, so the event stream is parsed here
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      
+      for (;;) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        
+        buffer += decoder.decode(value, { stream: true });
+        const messages = buffer.split('\n\n');
+        buffer = messages.pop();
+        
+        for (const message of messages) {
+          const event = (message.match(/^event: (.*)$/m) || [])[1];
+          const data = JSON.parse((message.match(/^data: (.*)$/m) || [])[1] || '{}');
+          
+          if (event === 'report') {
+            onReport && onReport(data);
+          } else if (event === 'done') {
+            onDone && onDone(data);
+          } else if (event === 'error') {
+            throw new Error(data.error || 'Batch research failed');
+          }
+        }
+      }
+    } catch (error) {
+      console.error('API Service Error:', error);
+      onError && onError(error);
+      throw error;
+    }
+  },
+  
   /**
    * Perform a web search
    * @param {string} query - The search query